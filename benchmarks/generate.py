@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+#
+#  generate.py
+"""
+Generate synthetic package trees for benchmarking ``importcheck``.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import random
+from typing import List
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = ("generate_package", )
+
+# Standard library modules imported by the synthetic modules, so the shared dependencies are non-trivial.
+_STDLIB = ["collections", "dataclasses", "enum", "functools", "json", "re", "typing"]
+
+_BODY = '''
+
+CONSTANT_{index} = {index}
+
+
+class Thing{index}:
+
+	def __init__(self, value: int = CONSTANT_{index}):
+		self.value = value
+
+	def double(self) -> int:
+		return self.value * 2
+
+
+def function_{index}(*args):
+	return sum(args) + CONSTANT_{index}
+'''
+
+
+def generate_package(
+		directory: PathLike,
+		name: str,
+		n_modules: int,
+		*,
+		depth: int = 6,
+		fanout: int = 3,
+		failure_rate: float = 0.05,
+		seed: int = 0,
+		) -> List[str]:
+	"""
+	Generate a package called ``name`` in ``directory`` containing ``n_modules`` modules (including packages).
+
+	Modules are nested in subpackages up to ``depth`` levels deep,
+	and each imports up to ``fanout`` of the modules generated before it,
+	so chains of imports between the modules have varying lengths.
+	A proportion of the modules, given by ``failure_rate``, fail when imported,
+	as do the modules which import them, directly or indirectly.
+
+	The same arguments always generate the same package.
+
+	:returns: The names of the modules, in the order they were generated.
+	"""
+
+	rng = random.Random(seed)
+	root = PathPlus(directory)
+
+	modules = [name]
+	packages = [name]
+	_write_module(root, name, True, f"import {rng.choice(_STDLIB)}\n")
+
+	for index in range(1, n_modules):
+		parent = rng.choice(packages)
+		is_package = parent.count('.') < depth - 1 and rng.random() < 0.1
+		module = f"{parent}.{'pkg' if is_package else 'mod'}{index}"
+
+		lines = [f"import {rng.choice(_STDLIB)}"]
+		n_imports = min(rng.randint(0, fanout), index)
+		lines.extend(f"import {dependency}" for dependency in rng.sample(modules, n_imports))
+
+		if rng.random() < failure_rate:
+			lines.append(f"import bench_missing_{index}")
+
+		_write_module(root, module, is_package, '\n'.join(lines) + _BODY.format(index=index))
+
+		modules.append(module)
+		if is_package:
+			packages.append(module)
+
+	return modules
+
+
+def _write_module(root: PathPlus, module: str, is_package: bool, source: str) -> None:
+	path = root.joinpath(*module.split('.'))
+
+	if is_package:
+		path.maybe_make(parents=True)
+		path = path / "__init__.py"
+	else:
+		path = path.with_suffix(".py")
+
+	path.write_text(source)
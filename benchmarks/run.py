@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+#
+#  run.py
+"""
+Benchmark ``importcheck`` on synthetic package trees, and compare the results between commits.
+
+Run from the root of the repository::
+
+	$ python benchmarks/run.py run --sizes 100,1000
+	$ python benchmarks/run.py compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import contextlib
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+# 3rd party
+import click
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from generate import generate_package
+
+#: The keyword arguments to :class:`importcheck.ImportChecker` for each execution mode.
+MODES: Dict[str, Dict[str, Any]] = {
+		"serial": {},
+		"jobs": {"jobs": 0},
+		"fork": {"isolation": "fork"},
+		"snapshot": {"isolation": "snapshot"},
+		"static": {"static": True},
+		"dependencies": {"dependencies": True},
+		"memory": {"measure_memory": True},
+		"cache": {},
+		}
+
+_RESULTS_DIR = PathPlus(__file__).parent / "results"
+
+# Benchmark the working tree, rather than any installed version.
+sys.path.insert(1, os.fspath(PathPlus(__file__).parent.parent))
+
+
+def _peak_rss() -> Dict[str, Optional[int]]:
+	# The peak resident set size of this process and of its largest child process, in bytes.
+
+	try:
+		# stdlib
+		import resource
+	except ImportError:  # pragma: no cover (!Windows)
+		return {"peak_rss": None, "peak_rss_children": None}
+
+	scale = 1 if sys.platform == "darwin" else 1024
+	return {
+			"peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+			"peak_rss_children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+			}
+
+
+def _git_commit() -> str:
+	try:
+		commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+		dirty = subprocess.call(["git", "diff", "--quiet", "HEAD", "--", "importcheck"])
+	except (OSError, subprocess.CalledProcessError):
+		return "unknown"
+
+	return f"{commit}-dirty" if dirty else commit
+
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+	return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+@click.group()
+def main() -> None:
+	"""
+	Benchmarks for importcheck.
+	"""
+
+
+@main.command()
+@click.option("--directory", type=click.STRING, required=True)
+@click.option("--mode", type=click.Choice(["baseline", *MODES]), required=True)
+def worker(directory: str, mode: str) -> None:
+	"""
+	Check the modules listed in DIRECTORY/modules.txt in a fresh process, and print the measurements as JSON.
+	"""
+
+	# 3rd party
+	# Imported by ImportChecker.check_modules. Import it now, so its one-off cost is not counted in the timings.
+	import consolekit.terminal_colours  # noqa: F401
+
+	# this package
+	from importcheck import ImportChecker
+	from importcheck.cache import ImportCache
+
+	modules = PathPlus(directory, "modules.txt").read_lines()
+	sys.path.insert(0, directory)
+
+	failed = 0
+
+	with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+		if mode == "baseline":
+			# A bare loop of imports, to determine the overhead of importcheck itself.
+			start = time.perf_counter()
+			for module in modules:
+				try:
+					importlib.import_module(module)
+				except Exception:
+					failed += 1
+			seconds = time.perf_counter() - start
+
+		else:
+			kwargs = dict(MODES[mode])
+
+			if mode == "cache":
+				# Measure the second run, when the modules which passed are skipped.
+				with tempfile.TemporaryDirectory() as cache_dir:
+					list(ImportChecker(modules, cache=ImportCache(cache_dir)).check_modules())
+					for module in list(sys.modules):
+						if module.startswith("bench_pkg"):
+							del sys.modules[module]
+
+					checker = ImportChecker(modules, cache=ImportCache(cache_dir))
+					start = time.perf_counter()
+					list(checker.check_modules())
+					seconds = time.perf_counter() - start
+			else:
+				checker = ImportChecker(modules, **kwargs)
+				start = time.perf_counter()
+				list(checker.check_modules())
+				seconds = time.perf_counter() - start
+
+			failed = checker.stats["failed"]
+
+	click.echo(json.dumps({"seconds": seconds, "failed": failed, **_peak_rss()}))
+
+
+def _run_worker(directory: str, mode: str) -> Dict[str, Any]:
+	output = subprocess.check_output(
+			[sys.executable, __file__, "worker", "--directory", directory, "--mode", mode],
+			text=True,
+			)
+	return json.loads(output)
+
+
+def _micro_benchmarks(modules: List[str], directory: str, repeat: int) -> Dict[str, float]:
+	# Benchmarks of the functions which prepare the modules to check, which run in this process.
+
+	# this package
+	from importcheck import discover_modules, evaluate_markers, paths_to_modules
+
+	paths = [f"{module.replace('.', '/')}.py" for module in modules]
+	config = {
+			"always": modules[::2],
+			"only_if": {
+					f"python_version >= '3.{idx % 10}' and sys_platform != 'bench{idx}'": modules[1 + idx::20]
+					for idx in range(20)
+					},
+			}
+
+	sys.path.insert(0, directory)
+	try:
+		return {
+				"paths_to_modules": _best_of(lambda: list(paths_to_modules(*paths)), repeat),
+				"evaluate_markers": _best_of(lambda: evaluate_markers(config), repeat),
+				"discover_modules": _best_of(lambda: list(discover_modules(modules[0])), repeat),
+				}
+	finally:
+		sys.path.remove(directory)
+
+
+@main.command()
+@click.option(
+		"--sizes",
+		type=click.STRING,
+		default="100,1000,20000",
+		help="Comma-separated numbers of modules in the generated packages.",
+		show_default=True,
+		)
+@click.option(
+		"--modes",
+		type=click.STRING,
+		default=','.join(MODES),
+		help="Comma-separated execution modes to benchmark.",
+		show_default=True,
+		)
+@click.option("--depth", type=click.INT, default=6, help="The maximum depth of subpackages.", show_default=True)
+@click.option(
+		"--failure-rate",
+		type=click.FLOAT,
+		default=0.05,
+		help="The proportion of modules which fail to import by themselves.",
+		show_default=True,
+		)
+@click.option(
+		"--repeat",
+		type=click.INT,
+		default=1,
+		help="Run each benchmark this many times and record the fastest.",
+		show_default=True,
+		)
+@click.option(
+		"-o",
+		"--output",
+		type=click.STRING,
+		default=None,
+		help="The file to write the results to. Defaults to benchmarks/results/<commit>.json",
+		)
+def run(
+		sizes: str,
+		modes: str,
+		depth: int,
+		failure_rate: float,
+		repeat: int,
+		output: Optional[str],
+		) -> None:
+	"""
+	Run the benchmarks.
+	"""
+
+	mode_names = [mode for mode in modes.split(',') if mode]
+	for mode in mode_names:
+		if mode not in MODES:
+			raise click.BadParameter(f"Unknown mode {mode!r}", param_hint="--modes")
+
+	if "fork" in mode_names and not hasattr(os, "fork"):  # pragma: no cover (!Windows)
+		mode_names.remove("fork")
+
+	results: List[Dict[str, Any]] = []
+
+	for size in map(int, sizes.split(',')):
+		with tempfile.TemporaryDirectory() as directory:
+			package = f"bench_pkg_{size}"
+			modules = generate_package(directory, package, size, depth=depth, failure_rate=failure_rate)
+			PathPlus(directory, "modules.txt").write_lines(modules)
+
+			for name, seconds in _micro_benchmarks(modules, directory, max(repeat, 3)).items():
+				results.append({"benchmark": name, "modules": size, "seconds": seconds})
+				click.echo(f"{name:<28} {size:>6} modules  {seconds:8.4f}s")
+
+			baseline = min((_run_worker(directory, "baseline") for _ in range(repeat)), key=lambda r: r["seconds"])
+
+			for mode in mode_names:
+				best = min((_run_worker(directory, mode) for _ in range(repeat)), key=lambda r: r["seconds"])
+				peak = max(filter(None, [best["peak_rss"], best["peak_rss_children"]]), default=None)
+
+				results.append({
+						"benchmark": f"check_modules[{mode}]",
+						"modules": size,
+						"failure_rate": failure_rate,
+						"failed": best["failed"],
+						"seconds": best["seconds"],
+						"throughput": size / best["seconds"],
+						"per_module_overhead_ms": (best["seconds"] - baseline["seconds"]) / size * 1000,
+						"peak_rss": best["peak_rss"],
+						"peak_rss_children": best["peak_rss_children"],
+						})
+
+				click.echo(
+						f"{f'check_modules[{mode}]':<28} {size:>6} modules  {best['seconds']:8.4f}s  "
+						f"{size / best['seconds']:9.1f} modules/s  "
+						f"peak RSS {(peak or 0) / 1024 / 1024:7.1f} MiB"
+						)
+
+	commit = _git_commit()
+
+	if output is None:
+		_RESULTS_DIR.maybe_make(parents=True)
+		output = str(_RESULTS_DIR / f"{commit}.json")
+
+	PathPlus(output).dump_json(
+			{
+					"commit": commit,
+					"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+					"python": f"{platform.python_implementation()} {platform.python_version()}",
+					"platform": platform.platform(),
+					"results": results,
+					},
+			indent=2,
+			)
+
+	click.echo(f"Results written to {output}")
+
+
+@main.command()
+@click.argument("baseline", type=click.STRING)
+@click.argument("current", type=click.STRING)
+def compare(baseline: str, current: str) -> None:
+	"""
+	Compare the results in CURRENT with those in BASELINE.
+	"""
+
+	before = PathPlus(baseline).load_json()
+	after = PathPlus(current).load_json()
+
+	before_by_key = {(r["benchmark"], r["modules"]): r for r in before["results"]}
+
+	click.echo(f"{'benchmark':<28} {'modules':>7} {before['commit']:>14} {after['commit']:>14} {'change':>8}")
+
+	for result in after["results"]:
+		key = (result["benchmark"], result["modules"])
+		if key not in before_by_key:
+			continue
+
+		old, new = before_by_key[key]["seconds"], result["seconds"]
+		click.echo(f"{key[0]:<28} {key[1]:>7} {old:13.4f}s {new:13.4f}s {(new - old) / old:+8.1%}")
+
+
+if __name__ == "__main__":
+	sys.exit(main())
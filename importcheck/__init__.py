@@ -27,35 +27,76 @@ A tool to check all modules can be correctly imported.
 #
 
 # stdlib
+import collections
+import contextlib
+import fnmatch
 import functools
 import importlib
 import importlib.machinery
 import importlib.util
+import io
+import operator
+import os
+import pkgutil
+import sys
+import time
 import traceback
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple, Union, cast
-
-# 3rd party
-import click
-import dom_toml
-from click.globals import resolve_color_default
-from consolekit.terminal_colours import Back, Style
-from domdf_python_tools.doctools import prettify_docstrings
-from domdf_python_tools.paths import PathPlus
-from domdf_python_tools.stringlist import StringList
-from domdf_python_tools.typing import PathLike
-from domdf_python_tools.utils import redirect_output
-from domdf_python_tools.words import Plural
-from packaging.markers import Marker
-from typing_extensions import TypedDict
+import tracemalloc
+from typing import (
+		TYPE_CHECKING,
+		Any,
+		Callable,
+		Deque,
+		Dict,
+		Generator,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		NamedTuple,
+		Optional,
+		Set,
+		Tuple,
+		TypeVar,
+		Union,
+		cast
+		)
+
+# this package
+from importcheck.static import check_module_static, find_module_spec
+
+# Third-party packages are imported where they are used, to keep ``importcheck`` quick to start,
+# both on the command line and in worker processes.
+
+if sys.version_info >= (3, 8):  # pragma: no cover (<py38)
+	# stdlib
+	from typing import TypedDict
+else:  # pragma: no cover (py38+)
+	# 3rd party
+	from typing_extensions import TypedDict
+
+if TYPE_CHECKING:
+	# 3rd party
+	from domdf_python_tools.typing import PathLike
+
+	# this package
+	from importcheck.cache import ImportCache
+	from importcheck.profiling import ImportProfile
+	from importcheck.reporters import Reporter
 
 __all__ = (
 		"load_toml",
 		"check_module",
 		"paths_to_modules",
+		"discover_modules",
+		"format_stats",
 		"ConfigDict",
 		"ImportChecker",
 		"OK",
 		"Error",
+		"OverBudget",
+		"Budget",
+		"LazyError",
 		)
 
 __author__: str = "Dominic Davis-Foster"
@@ -64,7 +105,28 @@ __license__: str = "MIT License"
 __version__: str = "0.5.0"
 __email__: str = "dominic@davis-foster.co.uk"
 
-_module = Plural("module", "modules")
+_isolation_modes = {None, "fork", "snapshot"}
+
+_T = TypeVar("_T", bound=type)
+
+
+def _module(n: int) -> str:
+	return "module" if n == 1 else "modules"
+
+
+def _import(n: int) -> str:
+	return "import" if n == 1 else "imports"
+
+
+def _prettify_docstrings(obj: _T) -> _T:
+	# The prettified docstrings are only needed when building the documentation.
+
+	if "sphinx" in sys.modules:
+		# 3rd party
+		from domdf_python_tools.doctools import prettify_docstrings
+		return prettify_docstrings(obj)
+
+	return obj
 
 
 class ConfigDict(TypedDict, total=False):
@@ -81,14 +143,28 @@ class ConfigDict(TypedDict, total=False):
 	#: Configuration for ``importcheck``.
 	config: Dict[str, Any]
 
+	#: List of packages to import along with all of their submodules.
+	#:
+	#: .. versionadded:: 0.6.0
+	recursive: List[str]
 
-def load_toml(filename: PathLike) -> ConfigDict:
+	#: List of glob patterns matching modules (and packages) to skip
+	#: when discovering the submodules of ``recursive``.
+	#:
+	#: .. versionadded:: 0.6.0
+	exclude: List[str]
+
+
+def load_toml(filename: "PathLike") -> ConfigDict:
 	"""
 	Load the ``importcheck`` configuration mapping from the given TOML file.
 
 	:param filename:
 	"""
 
+	# 3rd party
+	import dom_toml
+
 	config = dom_toml.load(filename)
 
 	if "importcheck" in config:
@@ -99,13 +175,21 @@ def load_toml(filename: PathLike) -> ConfigDict:
 		raise KeyError("No such table 'importcheck' or 'tool.importcheck'")
 
 
-def evaluate_markers(config: ConfigDict) -> List[str]:
+def evaluate_markers(config: ConfigDict, environment: Optional[Dict[str, str]] = None) -> List[str]:
 	"""
 	Evaluate the markers in the ``only_if`` key and return a list of all modules to try to import.
 
 	:param config:
+	:param environment: The environment to evaluate the markers in,
+		such as one returned by :func:`importcheck.interpreters.marker_environment`.
+		By default the markers are evaluated for the current interpreter.
+
+	.. versionchanged:: 0.6.0  Added the ``environment`` argument.
 	"""
 
+	# 3rd party
+	from packaging.markers import Marker
+
 	modules_to_check: List[str] = []
 
 	if "always" in config:
@@ -113,13 +197,13 @@ def evaluate_markers(config: ConfigDict) -> List[str]:
 
 	if "only_if" in config:
 		for marker, modules in config["only_if"].items():
-			if Marker(marker).evaluate():
+			if Marker(marker).evaluate(environment):
 				modules_to_check.extend(modules)
 
 	return modules_to_check
 
 
-@prettify_docstrings
+@_prettify_docstrings
 class OK(NamedTuple):
 	"""
 	Returned by :func:`~.check_module` if the module is successfully imported.
@@ -128,6 +212,26 @@ class OK(NamedTuple):
 	#: The name of the module being checked.
 	module: str
 
+	#: The time taken to import the module, in seconds.
+	#:
+	#: .. versionadded:: 0.6.0
+	duration: float = 0.0
+
+	#: The peak memory allocated by Python while importing the module, in bytes, if measured.
+	#:
+	#: .. versionadded:: 0.6.0
+	memory_peak: Optional[int] = None
+
+	#: The change in the resident set size of the process while importing the module, in bytes, if measured.
+	#:
+	#: .. versionadded:: 0.6.0
+	rss_delta: Optional[int] = None
+
+	#: The modules which were added to :py:obj:`sys.modules` while importing the module, if recorded.
+	#:
+	#: .. versionadded:: 0.6.0
+	imported: Optional[Tuple[str, ...]] = None
+
 	@property
 	def stdout(self):  # noqa: D102,MAN002
 		raise NotImplementedError
@@ -144,7 +248,7 @@ class OK(NamedTuple):
 		return False
 
 
-@prettify_docstrings
+@_prettify_docstrings
 class Error(NamedTuple):
 	"""
 	Returned by :func:`~.check_module` if the module could not be successfully imported.
@@ -167,6 +271,27 @@ class Error(NamedTuple):
 	This may also contain standard out if the streams are combined by :func:`~.check_module`.
 	"""
 
+	#: The time taken attempting to import the module, in seconds.
+	#:
+	#: .. versionadded:: 0.6.0
+	duration: float = 0.0
+
+	#: The peak memory allocated by Python while attempting to import the module, in bytes, if measured.
+	#:
+	#: .. versionadded:: 0.6.0
+	memory_peak: Optional[int] = None
+
+	#: The change in the resident set size of the process while attempting to import the module,
+	#: in bytes, if measured.
+	#:
+	#: .. versionadded:: 0.6.0
+	rss_delta: Optional[int] = None
+
+	#: The modules which were added to :py:obj:`sys.modules` while attempting to import the module, if recorded.
+	#:
+	#: .. versionadded:: 0.6.0
+	imported: Optional[Tuple[str, ...]] = None
+
 	def __bool__(self) -> bool:
 		"""
 		:class:`~.Error` objects always evaluate as :py:obj:`True`.
@@ -175,43 +300,408 @@ class Error(NamedTuple):
 		return True
 
 
-def check_module(module: str, combine_output: bool = False) -> Union[OK, Error]:
+@_prettify_docstrings
+class OverBudget(NamedTuple):
+	"""
+	Returned by :meth:`ImportChecker.check_modules() <importcheck.ImportChecker.check_modules>`
+	in place of :class:`~.OK` if the module was imported successfully, but exceeded its :class:`~.Budget`.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	#: The name of the module being checked.
+	module: str
+
+	#: Descriptions of the limits which were exceeded.
+	reasons: Tuple[str, ...]
+
+	#: The time taken to import the module, in seconds.
+	duration: float = 0.0
+
+	#: The peak memory allocated by Python while importing the module, in bytes, if measured.
+	memory_peak: Optional[int] = None
+
+	#: The change in the resident set size of the process while importing the module, in bytes, if measured.
+	rss_delta: Optional[int] = None
+
+	#: The modules which were added to :py:obj:`sys.modules` while importing the module, if recorded.
+	imported: Optional[Tuple[str, ...]] = None
+
+	@property
+	def stdout(self) -> str:
+		"""
+		The reasons the module is over budget, one per line.
+		"""
+
+		return ''.join(f"Over budget: {reason}\n" for reason in self.reasons)
+
+	@property
+	def stderr(self) -> str:
+		"""
+		The reasons the module is over budget, one per line.
+		"""
+
+		return self.stdout
+
+	def __bool__(self) -> bool:
+		"""
+		:class:`~.OverBudget` objects always evaluate as :py:obj:`True`.
+		"""
+
+		return True
+
+
+class Budget(NamedTuple):
+	"""
+	The maximum time and memory a module may use when imported.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	#: The maximum time the import may take, in milliseconds.
+	max_import_ms: Optional[float] = None
+
+	#: The maximum memory the import may allocate, in mebibytes.
+	#: Only enforced if the memory used by the import was measured.
+	max_import_mb: Optional[float] = None
+
+	@classmethod
+	def from_mapping(cls, mapping: Mapping[str, Any]) -> "Budget":
+		"""
+		Construct a :class:`~.Budget` from the ``max_import_ms`` and ``max_import_mb`` keys of ``mapping``.
+
+		:param mapping: For example, the ``config`` table of the configuration file.
+		"""
+
+		return cls(mapping.get("max_import_ms"), mapping.get("max_import_mb"))
+
+	def update(self, other: "Budget") -> "Budget":
+		"""
+		Returns a new :class:`~.Budget`, with the limits set in ``other`` replacing those in this budget.
+
+		:param other:
+		"""
+
+		return Budget(*(theirs if theirs is not None else ours for ours, theirs in zip(self, other)))
+
+	def check(self, result: OK) -> Union[OK, OverBudget]:
+		"""
+		Returns ``result``, or an :class:`~.OverBudget` result if it exceeded this budget.
+
+		:param result:
+		"""
+
+		reasons = []
+
+		if self.max_import_ms is not None and result.duration * 1000 > self.max_import_ms:
+			reasons.append(f"took {result.duration * 1000:.1f} ms (limit {self.max_import_ms:g} ms)")
+
+		if (
+				self.max_import_mb is not None and result.memory_peak is not None
+				and result.memory_peak > self.max_import_mb * 1024 * 1024
+				):
+			reasons.append(
+					f"allocated {_format_bytes(result.memory_peak)} (limit {self.max_import_mb:g} MiB)"
+					)
+
+		if reasons:
+			return OverBudget(result.module, tuple(reasons), *result[1:])
+		else:
+			return result
+
+
+class LazyError:
+	"""
+	Returned by :func:`~.check_module` in place of :class:`~.Error` when ``lazy`` is :py:obj:`True`.
+
+	The traceback is only formatted when :attr:`~.stdout` or :attr:`~.stderr` are accessed,
+	which saves time when checking many modules which fail without showing their output.
+
+	When pickled, for example to return it from a worker process, it becomes an :class:`~.Error`.
+
+	.. versionadded:: 0.6.0
+
+	:param module: The name of the module being checked.
+	:param exception: The exception raised when importing the module.
+	:param stdout: The standard output captured from importing the module.
+	:param stderr: The standard error captured from importing the module.
+	:param combine_output: Whether ``stderr`` was combined with ``stdout``.
+	:param duration: The time taken attempting to import the module, in seconds.
+	:param memory_peak: The peak memory allocated by Python while attempting to import the module, in bytes.
+	:param rss_delta: The change in the resident set size of the process while attempting to import the module.
+	:param imported: The modules which were added to :py:obj:`sys.modules` while attempting to import the module.
+	"""
+
+	def __init__(
+			self,
+			module: str,
+			exception: traceback.TracebackException,
+			stdout: str = '',
+			stderr: str = '',
+			combine_output: bool = False,
+			duration: float = 0.0,
+			memory_peak: Optional[int] = None,
+			rss_delta: Optional[int] = None,
+			imported: Optional[Tuple[str, ...]] = None,
+			):
+
+		#: The name of the module being checked.
+		self.module: str = module
+
+		#: The exception raised when importing the module.
+		self.exception: traceback.TracebackException = exception
+
+		#: The time taken attempting to import the module, in seconds.
+		self.duration: float = duration
+
+		#: The peak memory allocated by Python while attempting to import the module, in bytes, if measured.
+		self.memory_peak: Optional[int] = memory_peak
+
+		#: The change in the resident set size of the process while attempting to import the module,
+		#: in bytes, if measured.
+		self.rss_delta: Optional[int] = rss_delta
+
+		#: The modules which were added to :py:obj:`sys.modules` while attempting to import the module,
+		#: if recorded.
+		self.imported: Optional[Tuple[str, ...]] = imported
+
+		self._stdout = stdout
+		self._stderr = stderr
+		self._combine_output = combine_output
+		self._traceback: Optional[str] = None
+
+	@property
+	def traceback(self) -> str:
+		"""
+		The formatted traceback of :attr:`~.exception`.
+		"""
+
+		if self._traceback is None:
+			frames = list(self.exception.stack)
+
+			if frames and frames[0].filename == __file__:
+				del frames[0]
+
+			buf = ["Traceback (most recent call last):\n"]
+			buf.extend(traceback.format_list(frames))
+
+			while buf[-1] == '\n':  # pragma: no cover
+				del buf[-1]  # pylint: disable=loop-invariant-statement
+
+			buf.extend(self.exception.format_exception_only())
+			buf.append('\n')
+			self._traceback = ''.join(buf)
+
+		return self._traceback
+
+	@property
+	def stdout(self) -> str:
+		"""
+		The standard output from importing the module.
+
+		This also contains standard error and the traceback if the streams were combined.
+		"""
+
+		if self._combine_output:
+			return self._stdout + self.traceback
+		else:
+			return self._stdout
+
+	@property
+	def stderr(self) -> str:
+		"""
+		Standard error generated by importing the module, followed by the traceback.
+		"""
+
+		return self._stderr + self.traceback
+
+	def to_error(self) -> Error:
+		"""
+		Returns an :class:`~.Error` with the formatted output.
+		"""
+
+		return Error(
+				self.module,
+				self.stdout,
+				self.stderr,
+				self.duration,
+				self.memory_peak,
+				self.rss_delta,
+				self.imported,
+				)
+
+	def __reduce__(self) -> Tuple[Callable, Tuple]:
+		return Error, tuple(self.to_error())
+
+	def __repr__(self) -> str:
+		if sys.version_info >= (3, 13):  # pragma: no cover (<py313)
+			# exc_type is deprecated; exc_type_str includes the module, except for builtins.
+			exc_type = self.exception.exc_type_str.rpartition('.')[2]
+		else:  # pragma: no cover (py313+)
+			exc_type = self.exception.exc_type.__name__
+
+		return f"<{type(self).__name__}(module={self.module!r}, exception={exc_type})>"
+
+	def __bool__(self) -> bool:
+		"""
+		:class:`~.LazyError` objects always evaluate as :py:obj:`True`.
+		"""
+
+		return True
+
+
+class _CappedOutput(io.StringIO):
+	# Captures up to ``limit`` characters of output, and counts the remainder.
+
+	def __init__(self, limit: Optional[int] = None):
+		super().__init__()
+		self.limit = limit
+		self.truncated = 0
+
+	def write(self, s: str) -> int:
+		if self.limit is not None:
+			remaining = max(self.limit - self.tell(), 0)
+			if len(s) > remaining:
+				self.truncated += len(s) - remaining
+				super().write(s[:remaining])
+				return len(s)
+
+		return super().write(s)
+
+	def getvalue(self) -> str:
+		value = super().getvalue()
+
+		if self.truncated:
+			value += f"\n[{self.truncated} characters of output truncated]\n"
+
+		return value
+
+
+def _current_rss() -> Optional[int]:
+	# Returns the resident set size of the current process in bytes, or the peak RSS where that isn't available.
+
+	try:
+		with open("/proc/self/statm", "rb") as fp:
+			return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, IndexError, AttributeError):
+		pass
+
+	try:
+		# stdlib
+		import resource
+	except ImportError:  # pragma: no cover (!Windows)
+		return None
+
+	maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class _MemoryMonitor:
+	# Measures the memory used by the code executed within the context manager.
+
+	peak: Optional[int] = None
+	rss_delta: Optional[int] = None
+
+	def __enter__(self) -> "_MemoryMonitor":
+		self._started = not tracemalloc.is_tracing()
+
+		if self._started:
+			tracemalloc.start()
+		elif hasattr(tracemalloc, "reset_peak"):  # pragma: no cover (<py39)
+			tracemalloc.reset_peak()
+
+		self._baseline = tracemalloc.get_traced_memory()[0]
+		self._rss = _current_rss()
+		return self
+
+	def __exit__(self, *args) -> None:
+		peak = tracemalloc.get_traced_memory()[1]
+		rss = _current_rss()
+
+		if self._started:
+			tracemalloc.stop()
+
+		self.peak = max(peak - self._baseline, 0)
+		if rss is not None and self._rss is not None:
+			self.rss_delta = rss - self._rss
+
+
+def check_module(
+		module: str,
+		combine_output: bool = False,
+		measure_memory: bool = False,
+		*,
+		lazy: bool = False,
+		max_output: Optional[int] = None,
+		record_imports: bool = False,
+		) -> Union[OK, Error, LazyError]:
 	"""
 	Try to import ``module``, otherwise handle the resulting error.
 
 	:param module:
 	:param combine_output: If :py:obj:`True` ``stderr`` is combined with ``stdout``.
+	:param measure_memory: If :py:obj:`True` the memory used by the import is measured with :mod:`tracemalloc`,
+		and by the change in the resident set size of the process.
+		This makes the import considerably slower.
+	:param lazy: If :py:obj:`True` a :class:`~.LazyError` is returned if the import fails,
+		which only formats the traceback when it is accessed.
+	:param max_output: The maximum number of characters of output to capture from each of
+		``stdout`` and ``stderr``. Any more is discarded. The traceback is always kept in full.
+	:param record_imports: If :py:obj:`True` the modules added to :py:obj:`sys.modules` by the import
+		(other than ``module`` itself) are recorded in the ``imported`` attribute of the result.
+
+	.. versionchanged:: 0.6.0
+
+		* The time taken to import the module is recorded in the ``duration`` attribute.
+		* Added the ``measure_memory``, ``lazy``, ``max_output`` and ``record_imports`` arguments.
 	"""
 
-	with redirect_output(combine_output) as (stdout, stderr):
+	monitor = _MemoryMonitor()
+	already_imported = set(sys.modules) if record_imports else None
+
+	stdout = _CappedOutput(max_output)
+	stderr = stdout if combine_output else _CappedOutput(max_output)
+
+	with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+		start = time.perf_counter()
 		try:
-			importlib.import_module(module)
-			return OK(module)
+			with monitor if measure_memory else contextlib.nullcontext():
+				importlib.import_module(module)
+			duration = time.perf_counter() - start
+			imported = _new_modules(module, already_imported)
+			return OK(module, duration, monitor.peak, monitor.rss_delta, imported)
 		except Exception as e:
-			traceback_frames = traceback.extract_tb(e.__traceback__)
-			tb_e = traceback.TracebackException(
-					type(e),
-					e,
-					e.__traceback__,
-					)
+			duration = time.perf_counter() - start
+			imported = _new_modules(module, already_imported)
 
-			if traceback_frames[0].filename == __file__:
-				del traceback_frames[0]
+			# The source lines are looked up when the traceback is formatted.
+			exception = traceback.TracebackException(type(e), e, e.__traceback__, lookup_lines=False)
 
-			buf = ['Traceback (most recent call last):\n']
-			buf.extend(traceback.format_list(traceback_frames))
+	error = LazyError(
+			module,
+			exception,
+			stdout.getvalue(),
+			stderr.getvalue(),
+			combine_output,
+			duration,
+			monitor.peak,
+			monitor.rss_delta,
+			imported,
+			)
+
+	return error if lazy else error.to_error()
 
-			while buf[-1] == '\n':  # pragma: no cover
-				del buf[-1]  # pylint: disable=loop-invariant-statement
 
-			buf.extend(tb_e.format_exception_only())
+def _new_modules(module: str, already_imported: Optional[Set[str]]) -> Optional[Tuple[str, ...]]:
+	# The modules added to sys.modules since ``already_imported`` was recorded, if it was.
 
-			click.echo(''.join(buf), file=stderr)
+	if already_imported is None:
+		return None
 
-			return Error(module, stdout.getvalue(), stderr.getvalue())
+	return tuple(sorted(name for name in list(sys.modules) if name not in already_imported and name != module))
 
 
-def paths_to_modules(*paths: PathLike) -> Iterator[str]:
+def paths_to_modules(*paths: "PathLike") -> Iterator[str]:
 	r"""
 	Convert filesystem paths into dotted import names.
 
@@ -222,6 +712,9 @@ def paths_to_modules(*paths: PathLike) -> Iterator[str]:
 	:param \*paths: The paths to convert.
 	"""
 
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
 	for path in paths:
 		path = PathPlus(path)
 
@@ -231,15 +724,263 @@ def paths_to_modules(*paths: PathLike) -> Iterator[str]:
 		yield '.'.join(path.parts)
 
 
+_Result = Union[OK, Error, LazyError]
+
+
+def format_stats(stats: Mapping[str, int]) -> str:
+	"""
+	Format the number of modules with each status,
+	as counted by :attr:`ImportChecker.stats <.ImportChecker.stats>`.
+
+	.. versionadded:: 0.6.0
+
+	:param stats: Mapping of ``'passed'``, ``'failed'`` and (optionally) ``'over_budget'``
+		to the number of modules.
+	"""
+
+	over_budget = stats.get("over_budget", 0)
+
+	if stats["failed"] or over_budget:
+		total_modules = sum(stats.values())
+		message = f"{stats['passed']}/{total_modules} {_module(total_modules)} imported successfully"
+
+		if over_budget:
+			return f"{message}, {over_budget} over budget."
+		else:
+			return f"{message}."
+
+	else:
+		n_passed = stats["passed"]
+
+		if not n_passed:
+			return f"No modules to check."
+		elif n_passed == 1:
+			return f"{stats['passed']} module imported successfully."
+		else:
+			return f"All {stats['passed']} modules imported successfully."
+
+
+def _format_bytes(n_bytes: int) -> str:
+	size = float(n_bytes)
+
+	for unit in ("B", "KiB", "MiB"):
+		if abs(size) < 1024:
+			break
+		size /= 1024
+	else:
+		unit = "GiB"
+
+	return f"{size:.1f} {unit}"
+
+
+def _format_memory(peak: int, rss_delta: Optional[int]) -> str:
+	if rss_delta is None:
+		return f"peak {_format_bytes(peak)}"
+	else:
+		sign = '+' if rss_delta >= 0 else '-'
+		return f"peak {_format_bytes(peak)}, RSS {sign}{_format_bytes(abs(rss_delta))}"
+
+
+def _dependency_error(module: str, dependency: str) -> Error:
+	message = f"Not imported, as it depends on {dependency!r} which could not be imported.\n"
+	return Error(module, message, message)
+
+
+class _RestartingPool:
+	# A process pool which is replaced when a worker process dies, such as when a module calls os._exit().
+	# All the modules in flight in the broken pool fail, so each is checked again in a pool of its own
+	# to find the one responsible.
+
+	def __init__(self, jobs: int):
+		# stdlib
+		from concurrent.futures import ProcessPoolExecutor
+
+		self.jobs = jobs
+		self.executor = ProcessPoolExecutor(max_workers=jobs)
+
+	def submit(self, check: Callable[..., _Result], module_name: str) -> Callable[[], _Result]:
+		# stdlib
+		from concurrent.futures.process import BrokenProcessPool
+
+		executor = self.executor
+
+		try:
+			future = executor.submit(check, module_name, True)
+		except BrokenProcessPool:
+			return functools.partial(self._check_alone, executor, check, module_name)
+
+		def result() -> _Result:
+			try:
+				return future.result()
+			except BrokenProcessPool:
+				return self._check_alone(executor, check, module_name)
+
+		return result
+
+	def _check_alone(self, broken: Any, check: Callable[..., _Result], module_name: str) -> _Result:
+		# stdlib
+		from concurrent.futures import ProcessPoolExecutor
+		from concurrent.futures.process import BrokenProcessPool
+
+		if broken is self.executor:
+			broken.shutdown(wait=False)
+			self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+		with ProcessPoolExecutor(max_workers=1) as executor:
+			try:
+				return executor.submit(check, module_name, True).result()
+			except BrokenProcessPool:
+				message = f"The process importing {module_name!r} exited unexpectedly.\n"
+				return Error(module_name, message, message)
+
+	def shutdown(self) -> None:
+		self.executor.shutdown()
+
+
+def _in_order(
+		modules: Iterable[str],
+		submit: Callable[[str], Callable[[], _Result]],
+		window: int,
+		graph: Optional[Mapping[str, List[str]]] = None,
+		) -> Iterator[Tuple[str, Callable[[], _Result]]]:
+	"""
+	Submit modules for checking, keeping at most ``window`` in flight,
+	and return the callables for obtaining their results in the order the modules were given.
+
+	:param modules:
+	:param submit: Callable which starts checking a module and returns a callable to obtain the result.
+	:param window:
+	:param graph: Mapping of module names to the modules they import.
+		A module is only submitted once the results for the modules it imports have been obtained,
+		as ``submit`` may skip it if one of them failed.
+	"""  # noqa: D400
+
+	pending: Deque[Tuple[str, Callable[[], _Result]]] = collections.deque()
+
+	for module_name in modules:
+		if graph:
+			dependencies = set(graph.get(module_name, ()))
+			while any(name in dependencies for name, _ in pending):
+				yield pending.popleft()
+
+		pending.append((module_name, submit(module_name)))
+
+		if len(pending) >= window:
+			yield pending.popleft()
+
+	while pending:
+		yield pending.popleft()
+
+
+def discover_modules(*packages: str, exclude: Iterable[str] = ()) -> Iterator[str]:
+	r"""
+	Find the names of the given packages and all of their submodules.
+
+	Names are yielded as they are found, with each package before its submodules.
+	The packages are not imported; their submodules are found by querying the import system's finders
+	(see :func:`importcheck.static.find_module_spec`).
+	Each of ``packages`` is always yielded, even if it cannot be found,
+	so the error will be reported when checking it.
+
+	.. versionadded:: 0.6.0
+
+	:param \*packages: The dotted names of the packages.
+	:param exclude: Glob patterns (in the style of :mod:`fnmatch`) for modules to skip.
+		Submodules of an excluded package are also skipped.
+	"""
+
+	exclude = list(exclude)
+
+	def is_excluded(name: str) -> bool:
+		return any(fnmatch.fnmatchcase(name, pattern) for pattern in exclude)
+
+	for package in packages:
+		if is_excluded(package):
+			continue
+
+		yield package
+
+		spec = find_module_spec(package)
+		if spec is None or spec.submodule_search_locations is None:
+			continue
+
+		stack = [(list(spec.submodule_search_locations), package)]
+
+		while stack:
+			search_path, parent = stack.pop()
+			subpackages = []
+
+			for module_info in pkgutil.iter_modules(search_path, prefix=f"{parent}."):
+				if is_excluded(module_info.name):
+					continue
+
+				yield module_info.name
+
+				if module_info.ispkg:
+					child_spec = find_module_spec(module_info.name)
+					if child_spec is not None and child_spec.submodule_search_locations is not None:
+						subpackages.append((list(child_spec.submodule_search_locations), module_info.name))
+
+			stack.extend(reversed(subpackages))
+
+
 class ImportChecker:
 	r"""
 	Class for checking modules can be imported.
 
 	.. versionadded:: 0.3.0
 
-	:param modules: The list of modules to be checked.
+	:param modules: The modules to be checked.
+		If this is not a :class:`list` or :class:`tuple` it is consumed lazily while checking,
+		so modules can be checked as they are discovered.
 	:param show: Whether to show stdout and stderr generated from imports.
 	:param colour: Whether to use coloured output.
+	:param jobs: The number of worker processes to import modules in.
+		If ``1`` the modules are imported in the current process.
+		If less than ``1`` the number of CPUs is used.
+		A module whose import kills its worker process, such as by calling :func:`os._exit`,
+		is reported as failing.
+	:param isolation: How to isolate the imports of each module from one another.
+		If ``'fork'`` each module is imported in a child process forked from the current process
+		(see :class:`importcheck.isolation.WarmTemplate`).
+		If ``'snapshot'`` the modules added to :py:obj:`sys.modules` by each import are removed afterwards
+		(see :class:`importcheck.isolation.ModuleSnapshot`), which is much cheaper but less thorough.
+	:param preload: The modules to import before forking when ``isolation`` is ``'fork'``.
+		If :py:obj:`None` the dependencies shared by the modules are detected automatically.
+	:param cache: If given, modules which passed on a previous run and have not changed since are skipped.
+	:param static: If :py:obj:`True` modules are not imported; instead their imports are checked to be resolvable
+		with :func:`importcheck.static.check_module_static`.
+	:param dependencies: If :py:obj:`True` the modules are checked in the order of the imports between them
+		(see :mod:`importcheck.graph`), and modules which depend on a module which failed are not imported.
+	:param measure_memory: If :py:obj:`True` the memory used by each import is measured and shown.
+	:param reporters: Objects which are notified of the result for each module as it is checked
+		(see :mod:`importcheck.reporters`).
+	:param budget: The maximum time and memory each module may use when imported.
+		Modules which exceed it are reported as being over budget.
+		If the budget limits memory, ``measure_memory`` is implied.
+	:param module_budgets: Mapping of module names, or glob patterns (in the style of :mod:`fnmatch`),
+		to budgets which override ``budget`` for those modules.
+	:param timeout: The maximum time, in seconds, each import may take.
+		Imports which take longer are killed and reported as failing, with the stack of each thread at the time.
+		This requires each module to be imported in a forked child process,
+		so if ``isolation`` is :py:obj:`None` it behaves as ``'fork'`` without preloading any modules.
+	:param max_output: The maximum number of characters of output to keep from importing each module.
+		If ``show`` is :py:obj:`False` and there are no ``reporters`` the output is not kept at all.
+	:param fan_out: If :py:obj:`True` the modules each import adds to :py:obj:`sys.modules` are recorded.
+		Unless ``isolation`` is set, modules already imported by an earlier check are not counted again.
+	:param profile: If given, the time taken by each import, and the imports nested within it, is recorded in the
+		profile (see :mod:`importcheck.profiling`). The modules must be imported in the current process,
+		so ``jobs`` must be ``1``, and ``isolation`` and ``timeout`` cannot be ``'fork'`` or set respectively.
+	:param prioritise: Modules to check before the others, in order, such as those which failed on a previous run
+		(see :class:`importcheck.cache.FailureHistory`). If ``dependencies`` is :py:obj:`True`
+		they are still checked after the modules they import.
+	:param maxfail: If given, stop checking modules once this many have failed to import.
+
+	.. versionchanged:: 0.6.0
+
+		Added the ``jobs``, ``isolation``, ``preload``, ``cache``, ``static``, ``dependencies``,
+		``measure_memory``, ``reporters``, ``budget``, ``module_budgets``, ``timeout``,
+		``max_output``, ``fan_out``, ``profile``, ``prioritise`` and ``maxfail`` keyword arguments.
 
 	.. autosummary-widths:: 5/16
 	"""
@@ -250,13 +991,62 @@ class ImportChecker:
 			*,
 			show: bool = False,
 			colour: bool = False,
+			jobs: int = 1,
+			isolation: Optional[str] = None,
+			preload: Optional[Iterable[str]] = None,
+			cache: Optional["ImportCache"] = None,
+			static: bool = False,
+			dependencies: bool = False,
+			measure_memory: bool = False,
+			reporters: Iterable["Reporter"] = (),
+			budget: Optional[Budget] = None,
+			module_budgets: Optional[Mapping[str, Budget]] = None,
+			timeout: Optional[float] = None,
+			max_output: Optional[int] = None,
+			fan_out: bool = False,
+			profile: Optional["ImportProfile"] = None,
+			prioritise: Iterable[str] = (),
+			maxfail: Optional[int] = None,
 			):
 
+		if isolation not in _isolation_modes:
+			raise ValueError(f"Unknown isolation mode {isolation!r}")
+		if isolation == "fork" and not hasattr(os, "fork"):  # pragma: no cover (!Windows)
+			raise ValueError("Fork-based isolation is not supported on this platform.")
+		if timeout is not None and timeout <= 0:
+			raise ValueError("The timeout must be greater than zero.")
+		if timeout is not None and not hasattr(os, "fork"):  # pragma: no cover (!Windows)
+			raise ValueError("Timeouts are not supported on this platform.")
+		if profile is not None and (jobs != 1 or isolation == "fork" or timeout is not None):
+			raise ValueError("Profiling requires modules to be imported in the current process, with one job.")
+		if maxfail is not None and maxfail < 1:
+			raise ValueError("maxfail must be at least 1.")
+
 		#: The list of modules to be checked.
-		self.modules: List[str] = list(modules)
+		#:
+		#: .. versionchanged:: 0.6.0
+		#:
+		#: 	If the modules were given as a lazy iterable this list is populated as they are checked.
+		self.modules: List[str]
+		self._pending: Optional[Iterator[str]]
+
+		if isinstance(modules, (list, tuple)):
+			self.modules = list(modules)
+			self._pending = None
+		else:
+			self.modules = []
+			self._pending = iter(modules)
 
 		#: Dictionary holding statistics about passing/failing imports.
-		self.stats: Dict[str, int] = {"passed": 0, "failed": 0}
+		#:
+		#: .. versionchanged:: 0.6.0  Added the ``over_budget`` key.
+		self.stats: Dict[str, int] = {"passed": 0, "failed": 0, "over_budget": 0}
+
+		#: Mapping of module names to the time taken to import them, in seconds.
+		#: Modules which were not imported, as a module they depend on failed, are not included.
+		#:
+		#: .. versionadded:: 0.6.0
+		self.durations: Dict[str, float] = {}
 
 		#: Whether to show stdout and stderr generated from imports.
 		self.show: bool = show
@@ -264,61 +1054,508 @@ class ImportChecker:
 		#: Whether to use coloured output.
 		self.colour: bool = colour
 
+		#: The number of worker processes to import modules in.
+		self.jobs: int = jobs if jobs >= 1 else (os.cpu_count() or 1)
+
+		#: How to isolate the imports of each module from one another.
+		self.isolation: Optional[str] = isolation
+
+		#: The modules to import before forking when :attr:`~.isolation` is ``'fork'``.
+		self.preload: Optional[List[str]] = None if preload is None else list(preload)
+
+		#: Cache of modules which passed on a previous run.
+		self.cache: Optional["ImportCache"] = cache
+
+		#: If :py:obj:`True` modules are not imported, but their imports are checked to be resolvable.
+		self.static: bool = static
+
+		#: If :py:obj:`True` the modules are checked in the order of the imports between them,
+		#: and modules which depend on a module which failed are not imported.
+		self.dependencies: bool = dependencies
+
+		#: The graph of imports between the modules, if :attr:`~.dependencies` is :py:obj:`True`.
+		#: Populated when the modules are checked.
+		self.graph: Optional[Dict[str, List[str]]] = None
+
+		#: The maximum time and memory each module may use when imported.
+		self.budget: Budget = budget or Budget()
+
+		#: Mapping of module names, or glob patterns, to budgets which override :attr:`~.budget` for those modules.
+		self.module_budgets: Dict[str, Budget] = dict(module_budgets or {})
+
+		limits_memory = any(b.max_import_mb is not None for b in [self.budget, *self.module_budgets.values()])
+
+		#: If :py:obj:`True` the memory used by each import is measured and shown.
+		self.measure_memory: bool = measure_memory or limits_memory
+
+		#: The maximum time, in seconds, each import may take.
+		self.timeout: Optional[float] = timeout
+
+		#: The maximum number of characters of output to keep from importing each module.
+		self.max_output: Optional[int] = max_output
+
+		#: Mapping of module names to the peak memory allocated while importing them
+		#: and the change in resident set size, in bytes.
+		#:
+		#: .. versionadded:: 0.6.0
+		self.memory_usage: Dict[str, Tuple[int, Optional[int]]] = {}
+
+		#: If :py:obj:`True` the modules each import adds to :py:obj:`sys.modules` are recorded.
+		self.fan_out: bool = fan_out
+
+		#: Mapping of module names to the modules which were added to :py:obj:`sys.modules` while importing them,
+		#: if :attr:`~.fan_out` is :py:obj:`True`.
+		#:
+		#: .. versionadded:: 0.6.0
+		self.imported: Dict[str, Tuple[str, ...]] = {}
+
+		#: The profile the time taken by each import is recorded in, if any.
+		self.profile: Optional["ImportProfile"] = profile
+
+		#: Objects which are notified of the result for each module as it is checked.
+		self.reporters: List["Reporter"] = list(reporters)
+
+		#: Modules to check before the others, in order.
+		self.prioritise: List[str] = list(prioritise)
+
+		#: If given, checking stops once this many modules have failed to import.
+		self.maxfail: Optional[int] = maxfail
+
+		self._from_cache: Set[str] = set()
+
+		# Modules which were not imported, as a module they depend on failed.
+		self._not_imported: Set[str] = set()
+
+		# Mapping of modules which failed to the module whose failure caused it.
+		self._failed: Dict[str, str] = {}
+
+	def budget_for(self, module_name: str) -> Budget:
+		"""
+		Returns the budget for the given module.
+
+		The limits set for the module in :attr:`~.module_budgets` (either by name,
+		or by the first matching pattern) replace those in :attr:`~.budget`.
+
+		.. versionadded:: 0.6.0
+
+		:param module_name:
+		"""
+
+		if module_name in self.module_budgets:
+			return self.budget.update(self.module_budgets[module_name])
+
+		for pattern, override in self.module_budgets.items():
+			if fnmatch.fnmatchcase(module_name, pattern):
+				return self.budget.update(override)
+
+		return self.budget
+
+	def _iter_checks(self) -> Generator[Tuple[str, Callable[[], _Result]], None, None]:
+		"""
+		Returns an iterator of 2-element tuples comprising the name of the module
+		and a callable returning the result of checking it.
+
+		The callables must be called in order, as the serial implementation performs the import when called.
+		"""  # noqa: D400
+
+		if self.prioritise:
+			# The order of the prioritised modules among the others is only known once all the modules are.
+			self._materialise()
+			known = set(self.modules)
+			first = {module: None for module in self.prioritise if module in known}
+			self.modules = [*first, *(module for module in self.modules if module not in first)]
+
+		if self.dependencies:
+			# this package
+			from importcheck.graph import build_import_graph, topological_order
+
+			self._materialise()
+			self.graph = build_import_graph(self.modules)
+			self.modules = topological_order(self.graph)
+
+		with contextlib.ExitStack() as stack:
+			submit: Callable[[str], Callable[[], _Result]]
+			check: Callable[..., _Result]
+
+			if self.static:
+				check = check_module_static
+			else:
+				# Output which will not be shown or reported is discarded,
+				# and tracebacks are only formatted if needed.
+				check = functools.partial(
+						check_module,
+						measure_memory=self.measure_memory,
+						lazy=True,
+						max_output=self.max_output if (self.show or self.reporters) else 0,
+						record_imports=self.fan_out,
+						)
+
+				if self.isolation == "snapshot":
+					# this package
+					from importcheck.isolation import check_in_snapshot
+
+					check = functools.partial(check_in_snapshot, check)
+
+			# In static mode nothing is executed, so there is nothing to isolate.
+			if (self.isolation == "fork" or self.timeout is not None) and not self.static:
+				# this package
+				from importcheck.isolation import WarmTemplate, detect_shared_dependencies
+
+				if self.preload is None and self.isolation == "fork":
+					# Auto-detection needs all the modules up front.
+					self._materialise()
+					self.preload = detect_shared_dependencies(self.modules)
+
+				template = WarmTemplate(self.preload or ())
+				# If checking stops early, e.g. because of maxfail, the children still in flight are killed.
+				stack.callback(template.cancel)
+				submit = lambda name: template.check(name, True, check, self.timeout).result  # noqa: E731
+				window = self.jobs
+
+			elif self.jobs == 1:
+				submit = lambda name: functools.partial(check, name, combine_output=True)  # noqa: E731
+				window = 1
+
+			else:
+				pool = _RestartingPool(self.jobs)
+				stack.callback(pool.shutdown)
+				submit = functools.partial(pool.submit, check)
+				window = self.jobs * 2
+
+			if self.profile is not None and not self.static:
+				stack.enter_context(self.profile.record())
+
+			submit = self._skip_failed_dependencies(self._skip_cached(submit))
+			yield from _in_order(self._iter_modules(), submit, window, self.graph)
+
+	def _materialise(self) -> None:
+		# Consume any lazy iterable given to the constructor, for operations which need all the modules up front.
+
+		if self._pending is not None:
+			self.modules.extend(self._pending)
+			self._pending = None
+
+	def _iter_modules(self) -> Iterator[str]:
+		# Returns an iterator over the modules to be checked, consuming any lazy iterable given to the constructor.
+
+		if self._pending is None:
+			yield from self.modules
+			return
+
+		for module_name in self._pending:
+			self.modules.append(module_name)
+			yield module_name
+
+		self._pending = None
+
+	def _skip_cached(
+			self,
+			submit: Callable[[str], Callable[[], _Result]],
+			) -> Callable[[str], Callable[[], _Result]]:
+		# Wraps ``submit`` to return the cached result for modules which have not changed since they last passed.
+
+		cache = self.cache
+		if cache is None:
+			return submit
+
+		def submit_if_changed(module_name: str) -> Callable[[], _Result]:
+			duration = cache.get(module_name)
+			if duration is None:
+				return submit(module_name)
+
+			self._from_cache.add(module_name)
+			return functools.partial(OK, module_name, duration)
+
+		return submit_if_changed
+
+	def _failed_dependency(self, module_name: str) -> Optional[str]:
+		# Returns the name of the module whose failure means ``module_name`` will fail, if any.
+
+		for dependency in (self.graph or {}).get(module_name, ()):
+			if dependency in self._failed:
+				return self._failed[dependency]
+
+		return None
+
+	def _skip_failed_dependencies(
+			self,
+			submit: Callable[[str], Callable[[], _Result]],
+			) -> Callable[[str], Callable[[], _Result]]:
+		# Wraps ``submit`` to not import modules which depend on a module which already failed.
+
+		if self.graph is None:
+			return submit
+
+		def submit_unless_dependency_failed(module_name: str) -> Callable[[], _Result]:
+			dependency = self._failed_dependency(module_name)
+			if dependency is None:
+				return submit(module_name)
+
+			self._not_imported.add(module_name)
+			return functools.partial(_dependency_error, module_name, dependency)
+
+		return submit_unless_dependency_failed
+
 	def check_modules(self) -> Iterator[Tuple[str, int]]:
 		"""
 		Checks modules can be imported.
 
+		If :attr:`~.jobs` is greater than ``1`` the modules are imported in a pool of worker processes
+		(or that many forked child processes at once if :attr:`~.isolation` is ``'fork'``),
+		but the results are still reported in the order the modules were given.
+
+		If :attr:`~.cache` is set, modules which passed previously and have not changed since
+		are not imported again.
+		If :attr:`~.dependencies` is :py:obj:`True` the modules are reordered
+		so each is checked after those it imports,
+		and modules which import a module which failed are reported as failing without being imported.
+
 		:returns: An iterator of 2-element tuples comprising the name of the module and the import status:
 
 			0. The module was imported successfully.
 			1. The module could not be imported. If :attr:`~.show` is :py:obj:`True` the traceback will be shown.
+			2. The module was imported successfully, but exceeded its budget (see :meth:`~.budget_for`).
+
+		.. versionchanged:: 0.6.0  Added the status ``2``.
 		"""
 
-		longest_name = 15
+		# 3rd party
+		import click
+		from click.globals import resolve_color_default
+		from consolekit.terminal_colours import Back, Style
+		from domdf_python_tools.stringlist import StringList
+
 		echo = functools.partial(click.echo, color=resolve_color_default(self.colour))
 
-		if self.modules:
-			longest_name += max(map(len, self.modules))
+		if self._pending is None:
+			if not self.modules:
+				return
+			longest_name = max(map(len, self.modules))
 		else:
-			return
+			# The names are not known in advance, so widen the column as longer names are seen.
+			longest_name = 0
 
-		for module_name in self.modules:
-			echo(Style.BRIGHT(f"Checking {module_name!r}".ljust(longest_name, '.')), nl=False)
+		checks = self._iter_checks()
 
-			ret = check_module(module_name, combine_output=True)
+		try:
+			for module_name, get_result in checks:
+				longest_name = max(longest_name, len(module_name))
+				echo(Style.BRIGHT(f"Checking {module_name!r}".ljust(longest_name + 15, '.')), nl=False)
 
-			if ret:
-				echo(Back.RED("Failed"))
-				self.stats["failed"] += 1  # pylint: disable=loop-invariant-statement
+				ret: Union[OK, Error, LazyError, OverBudget] = get_result()
+				if module_name not in self._not_imported:
+					self.durations[module_name] = ret.duration
 
-				if self.show:
-					echo(Style.BRIGHT("Captured output:"))
-					stdout = StringList(ret.stdout)
-					stdout.blankline(ensure_single=True)
-					echo(stdout)
+				memory = ''
+				if ret.memory_peak is not None:
+					self.memory_usage[module_name] = (ret.memory_peak, ret.rss_delta)
+					memory = f" ({_format_memory(ret.memory_peak, ret.rss_delta)})"
 
-				yield module_name, 1
+				if ret.imported is not None:
+					self.imported[module_name] = ret.imported
 
-			else:
-				echo(Back.GREEN("Passed"))
-				self.stats["passed"] += 1  # pylint: disable=loop-invariant-statement
-				yield module_name, 0
+				if isinstance(ret, OK) and not self.static:
+					ret = self.budget_for(module_name).check(ret)
+
+				if isinstance(ret, OverBudget):
+					echo(Back.YELLOW("Over budget") + f" ({'; '.join(ret.reasons)})")
+					self.stats["over_budget"] += 1  # pylint: disable=loop-invariant-statement
+
+					# Check it again next time, in case it is back within budget.
+					if self.cache is not None:
+						self.cache.discard(module_name)
+
+					for reporter in self.reporters:
+						reporter.report(ret, cached=module_name in self._from_cache)
+
+					yield module_name, 2
+
+				elif ret:
+					dependency = self._failed_dependency(module_name)
+
+					if dependency is None:
+						echo(Back.RED("Failed") + memory)
+					else:
+						# Replace the traceback, which would duplicate that of the dependency.
+						ret = _dependency_error(module_name, dependency)
+						echo(Back.RED("Failed") + f" (depends on {dependency!r})")
+
+					self._failed[module_name] = dependency or module_name
+					self.stats["failed"] += 1  # pylint: disable=loop-invariant-statement
+
+					if self.cache is not None:
+						self.cache.discard(module_name)
+
+					if self.show:
+						echo(Style.BRIGHT("Captured output:"))
+						stdout = StringList(ret.stdout)
+						stdout.blankline(ensure_single=True)
+						echo(stdout)
+
+					for reporter in self.reporters:
+						reporter.report(ret)
+
+					yield module_name, 1
+
+					if self.maxfail is not None and self.stats["failed"] >= self.maxfail:
+						echo(f"Stopping after {self.maxfail} failed {_import(self.maxfail)}.")
+						break
+
+				else:
+					if module_name in self._from_cache:
+						echo(Back.GREEN("Passed") + " (cached)")
+					else:
+						echo(Back.GREEN("Passed") + memory)
+
+						if self.cache is not None and not self.static:
+							self.cache.set(module_name, ret.duration)
+
+					self.stats["passed"] += 1  # pylint: disable=loop-invariant-statement
+
+					for reporter in self.reporters:
+						reporter.report(ret, cached=module_name in self._from_cache)
+
+					yield module_name, 0
+
+		finally:
+			# If checking stopped early, release the modules still being checked now,
+			# rather than when garbage collected.
+			checks.close()
+
+			if self.cache is not None:
+				self.cache.save()
+
+			for reporter in self.reporters:
+				reporter.finish()
 
 	def format_statistics(self) -> str:
 		"""
 		Returns a string reporting the number of modules imported successfully.
 		"""
 
-		if self.stats["failed"]:
-			total_modules = sum(self.stats.values())
-			return f"{self.stats['passed']}/{total_modules} {_module(total_modules)} imported successfully."
+		return format_stats(self.stats)
 
+	def format_durations(self, n: int = 0) -> str:
+		"""
+		Returns a string listing the modules which took the longest to import.
+
+		.. versionadded:: 0.6.0
+
+		:param n: The number of modules to list. If ``0`` all modules are listed.
+		"""
+
+		# 3rd party
+		from domdf_python_tools.stringlist import StringList
+
+		slowest = sorted(self.durations.items(), key=operator.itemgetter(1), reverse=True)
+		if n > 0:
+			slowest = slowest[:n]
+
+		if not slowest:
+			return "No modules were imported."
+
+		if n > 0:
+			output = StringList([f"Slowest {len(slowest)} {_import(len(slowest))}:"])
 		else:
-			n_passed = self.stats["passed"]
+			output = StringList(["Import durations:"])
 
-			if not n_passed:
-				return f"No modules to check."
-			elif n_passed == 1:
-				return f"{self.stats['passed']} module imported successfully."
-			else:
-				return f"All {self.stats['passed']} modules imported successfully."
+		for module_name, duration in slowest:
+			output.append(f"{duration:.3f}s {module_name}")
+
+		return str(output)
+
+	def format_memory_usage(self, n: int = 0) -> str:
+		"""
+		Returns a string listing the modules which used the most memory when imported.
+
+		.. versionadded:: 0.6.0
+
+		:param n: The number of modules to list. If ``0`` all modules are listed.
+		"""
+
+		# 3rd party
+		from domdf_python_tools.stringlist import StringList
+
+		largest = sorted(self.memory_usage.items(), key=lambda item: item[1][0], reverse=True)
+		if n > 0:
+			largest = largest[:n]
+
+		if not largest:
+			return "No memory usage was measured."
+
+		if n > 0:
+			output = StringList([f"Largest {len(largest)} {_import(len(largest))} by peak memory:"])
+		else:
+			output = StringList(["Import memory usage:"])
+
+		for module_name, (peak, rss_delta) in largest:
+			output.append(f"{_format_memory(peak, rss_delta)} {module_name}")
+
+		return str(output)
+
+	def format_fan_out(self, n: int = 0) -> str:
+		"""
+		Returns a string listing the modules which added the most other modules to :py:obj:`sys.modules`
+		when imported, with the time taken to import them all,
+		and the other top-level packages which were imported most.
+
+		.. versionadded:: 0.6.0
+
+		:param n: The number of modules to list. If ``0`` all modules are listed.
+		"""  # noqa: D400
+
+		# 3rd party
+		from domdf_python_tools.stringlist import StringList
+
+		largest = sorted(self.imported.items(), key=lambda item: len(item[1]), reverse=True)
+		if n > 0:
+			largest = largest[:n]
+
+		if not largest:
+			return "No imported modules were recorded."
+
+		if n > 0:
+			output = StringList([f"Largest {len(largest)} {_import(len(largest))} by fan-out:"])
+		else:
+			output = StringList(["Import fan-out:"])
+
+		width = len(str(len(largest[0][1])))
+
+		for module_name, imported in largest:
+			line = f"{len(imported):>{width}} {_module(len(imported))}, "
+			line += f"{self.durations.get(module_name, 0):.3f}s {module_name}"
+
+			packages = _top_level_packages(module_name, imported)
+			if packages:
+				line += f" ({packages})"
+
+			output.append(line)
+
+		return str(output)
+
+
+def _top_level_packages(module: str, imported: Iterable[str], limit: int = 5) -> str:
+	# Summarises the packages, other than that containing ``module``, with the most modules in ``imported``.
+
+	own_package = module.split('.')[0]
+	counts = collections.Counter(name.split('.')[0] for name in imported)
+	counts.pop(own_package, None)
+
+	packages = sorted(counts, key=lambda name: (-counts[name], name))
+	summary = ", ".join(packages[:limit])
+
+	if len(packages) > limit:
+		summary += f", and {len(packages) - limit} more"
+
+	return summary
+
+
+def __getattr__(name: str) -> Any:
+	# ``redirect_output`` was previously importable from here, so is provided (lazily) for backwards compatibility.
+
+	if name == "redirect_output":
+		# 3rd party
+		from domdf_python_tools.utils import redirect_output
+		return redirect_output
+
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,21 +28,40 @@ A tool to check all modules can be correctly imported.
 
 # stdlib
 import functools
+import glob
+import itertools
+import json
 import operator
+import os
 import platform
-import re
+import subprocess
 import sys
-from typing import Iterable, Optional
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 # 3rd party
 import click
-from consolekit import click_command
-from consolekit.options import auto_default_option, colour_option, flag_option, verbose_option, version_option
-from consolekit.terminal_colours import ColourTrilean, resolve_color_default
-from domdf_python_tools.typing import PathLike
 
 # this package
-from importcheck import ImportChecker, __version__, evaluate_markers, load_toml, paths_to_modules
+from importcheck import (
+		Budget,
+		ImportChecker,
+		__version__,
+		_module,
+		discover_modules,
+		evaluate_markers,
+		load_toml,
+		paths_to_modules
+		)
+
+if TYPE_CHECKING:
+	# 3rd party
+	from domdf_python_tools.typing import PathLike
+
+	# this package
+	from importcheck.cache import FailureHistory, ImportCache
+	from importcheck.profiling import ImportProfile
+	from importcheck.projects import Project
+	from importcheck.reporters import Reporter
 
 __all__ = ("main", )
 
@@ -63,6 +82,170 @@ def about(level: int = 1) -> None:
 	click.echo(' '.join(output))
 
 
+def _iter_stdin() -> Iterator[str]:
+	"""
+	Returns an iterator over the whitespace-separated words read from stdin, reading a line at a time.
+	"""
+
+	for line in sys.stdin:
+		yield from line.split()
+
+
+def _peek(iterable: Iterable[str]) -> Optional[Iterator[str]]:
+	"""
+	Returns an iterator over the items in ``iterable``, or :py:obj:`None` if it is empty.
+
+	Only the first item is consumed from ``iterable``.
+	"""
+
+	iterator = iter(iterable)
+
+	try:
+		first = next(iterator)
+	except StopIteration:
+		return None
+
+	return itertools.chain([first], iterator)
+
+
+def _exit_status(retv: int) -> int:
+	"""
+	Returns the exit code for the combined statuses of the checked modules.
+
+	Over-budget modules give an exit code of ``3``, rather than their status of ``2``,
+	which :mod:`click` uses for usage errors. Failed imports take precedence.
+	"""
+
+	if retv & 1:
+		return 1
+	elif retv & 2:
+		return 3
+	else:
+		return 0
+
+
+def _check_interpreters(
+		modules: Union[List[str], Callable[[Dict[str, str]], List[str]]],
+		pythons: List[str],
+		show: bool,
+		count: bool,
+		colour: bool,
+		echo: Callable[..., None],
+		) -> int:
+	"""
+	Check the modules with each of the given interpreters, and show the results as a table.
+
+	:returns: The exit code.
+	"""
+
+	# this package
+	from importcheck.interpreters import check_with_interpreters, format_matrix
+
+	try:
+		results = check_with_interpreters(modules, pythons)
+	except (OSError, subprocess.CalledProcessError) as e:
+		raise click.ClickException(f"Could not run Python interpreter: {e}")
+
+	echo(format_matrix(results, colour=colour))
+
+	failures = [(python, ret) for python, result in results.items() for ret in result.values() if ret]
+
+	if show:
+		for python, ret in failures:
+			echo()
+			echo(f"Captured output for {ret.module!r} with {python}:")
+			echo(ret.stdout.rstrip())
+
+	if count:
+		echo()
+		for python, result in results.items():
+			n_passed = sum(not ret for ret in result.values())
+			echo(f"{python}: {n_passed}/{len(result)} {_module(len(result))} imported successfully.")
+
+	if failures and not show:
+		echo()
+		echo("Tip: run with '--show' to show tracebacks for failed imports.")
+
+	return 1 if failures else 0
+
+
+def _check_archives(
+		archives: List[str],
+		jobs: Optional[int],
+		options: Dict[str, Any],
+		count: bool,
+		echo: Callable[..., None],
+		) -> int:
+	"""
+	Check the modules in each of the given archives, showing the results for each in turn.
+
+	:returns: The exit code.
+	"""
+
+	# this package
+	from importcheck.archives import check_archives
+
+	retv = 0
+
+	for idx, result in enumerate(check_archives(archives, jobs=jobs, **options)):
+		if idx:
+			echo()
+
+		echo(f"Checking modules in {result.archive}:")
+		if result.output.strip():
+			echo(result.output.rstrip())
+
+		if count:
+			echo()
+			echo(result.statistics)
+
+		retv |= result.status
+
+	if retv & 1 and not options.get("show"):
+		echo()
+		echo("Tip: run with '--show' to show tracebacks for failed imports.")
+
+	return _exit_status(retv)
+
+
+def _reject_options(mode: str, options: Dict[str, Any]) -> None:
+	"""
+	Raises a :exc:`click.UsageError` if any of the given command line options were set,
+	as they cannot be combined with ``mode``.
+
+	:param mode: The option which the others cannot be combined with, such as ``'--wheel'``.
+	:param options: Mapping of option names to the values given on the command line.
+	"""  # noqa: D400
+
+	for name, value in options.items():
+		if value is not None and value is not False:
+			raise click.UsageError(f"{name} cannot be used with {mode}.")
+
+
+def _expand_paths(patterns: Iterable[str], kind: str) -> List[str]:
+	"""
+	Expand any glob patterns in the given paths, for shells which do not.
+
+	:param patterns:
+	:param kind: The kind of file, for error messages.
+	"""
+
+	paths = []
+
+	for pattern in patterns:
+		if any(char in pattern for char in "*?["):
+			matches = sorted(glob.glob(pattern, recursive=True))
+			if not matches:
+				raise click.UsageError(f"No {kind}s match {pattern!r}")
+			paths.extend(matches)
+		elif not os.path.isfile(pattern):
+			raise click.UsageError(f"No such {kind} {pattern!r}")
+		else:
+			paths.append(pattern)
+
+	return paths
+
+
 def version_callback(
 		ctx: click.Context,
 		param: click.Option,
@@ -75,49 +258,323 @@ def version_callback(
 	ctx.exit()
 
 
-@auto_default_option(
+@click.option(
 		"-c",
 		"--config-file",
 		type=click.STRING,
+		default="pyproject.toml",
 		help="The path to the TOML configuration file to use.",
 		show_default=True,
 		)
-@colour_option()
-@flag_option(
+@click.option(
+		"--colour/--no-colour",
+		is_flag=True,
+		default=None,
+		help="Whether to use coloured output.",
+		)
+@click.option(
 		"-s",
 		"--show/--no-show",
+		is_flag=True,
 		default=None,
 		help="Whether to show stdout and stderr generated from imports.",
 		)
-@flag_option(
+@click.option(
 		"-C",
 		"--count/--no-count",
+		is_flag=True,
 		default=None,
 		help="Whether to show a count of the passed and failed imports at the end.",
 		)
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help="The number of processes to import modules in. Use 0 for one per CPU.",
+		)
+@click.option(
+		"--isolation",
+		type=click.Choice(["none", "fork", "snapshot"]),
+		default=None,
+		help="How to isolate the imports of each module from one another.",
+		)
+@click.option(
+		"--durations",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help="Show the N slowest imports at the end. Use 0 to show all imports.",
+		)
+@click.option(
+		"--memory",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help=(
+				"Measure the memory used by each import, and show the N largest at the end. "
+				"Use 0 to show all imports."
+				),
+		)
+@click.option(
+		"--fan-out",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help=(
+				"Record the modules each import pulls in, and show the N which pull in the most. "
+				"Use 0 to show all imports."
+				),
+		)
+@click.option(
+		"--profile",
+		is_flag=True,
+		default=False,
+		help="Show the time taken by each import, and the imports nested within it, at the end.",
+		)
+@click.option(
+		"--profile-output",
+		type=click.STRING,
+		default=None,
+		metavar="FILE",
+		help=(
+				"Write the import profile to FILE, "
+				"in speedscope format if it ends with '.json' and collapsed stacks otherwise."
+				),
+		)
+@click.option(
+		"--lazy-imports",
+		type=click.FLOAT,
+		default=None,
+		metavar="MS",
+		help="Find module-level imports taking at least MS milliseconds, and whether they could be deferred.",
+		)
+@click.option(
+		"--cache/--no-cache",
+		is_flag=True,
+		default=None,
+		help="Whether to skip modules which are unchanged since they last imported successfully.",
+		)
+@click.option(
+		"--force",
+		is_flag=True,
+		default=False,
+		help="Import all modules, even those which are unchanged since they last imported successfully.",
+		)
+@click.option(
+		"-p",
+		"--package",
+		type=click.STRING,
+		multiple=True,
+		metavar="NAME",
+		help="Check the package NAME and all of its submodules. May be given multiple times.",
+		)
+@click.option(
+		"--exclude",
+		type=click.STRING,
+		multiple=True,
+		metavar="GLOB",
+		help="Skip submodules matching GLOB when using --package. May be given multiple times.",
+		)
+@click.option(
+		"--static",
+		is_flag=True,
+		default=False,
+		help="Only check the modules' imports can be found, without executing any code.",
+		)
+@click.option(
+		"--dependencies/--no-dependencies",
+		is_flag=True,
+		default=None,
+		help="Check modules after those they import, skipping modules which import a module which failed.",
+		)
+@click.option(
+		"--timeout",
+		type=click.FLOAT,
+		default=None,
+		metavar="SECONDS",
+		help="Fail imports which take longer than SECONDS, showing where they were stuck.",
+		)
+@click.option(
+		"--python",
+		type=click.STRING,
+		multiple=True,
+		metavar="PATH",
+		help=(
+				"Check the modules with the Python interpreter PATH, showing the results for each. "
+				"May be given multiple times."
+				),
+		)
+@click.option(
+		"--wheel",
+		type=click.STRING,
+		multiple=True,
+		metavar="FILE",
+		help=(
+				"Check every module in the wheel or zip application FILE, importing them from the archive. "
+				"May be given multiple times."
+				),
+		)
+@click.option(
+		"--project",
+		type=click.STRING,
+		multiple=True,
+		metavar="FILE",
+		help=(
+				"Also check the modules configured in the TOML file FILE, "
+				"checking modules shared by several projects once. "
+				"May be a glob pattern such as '**/pyproject.toml', and may be given multiple times."
+				),
+		)
+@click.option(
+		"--shard",
+		type=click.STRING,
+		default=None,
+		metavar="K/N",
+		help="Only check the Kth of N shards of the modules, balanced by the durations in the --timings file.",
+		)
+@click.option(
+		"--timings",
+		type=click.STRING,
+		default=None,
+		metavar="FILE",
+		help=(
+				"Balance --shard by the durations in FILE, "
+				"and record the durations there after checking every module."
+				),
+		)
+@click.option(
+		"--merge",
+		type=click.STRING,
+		multiple=True,
+		metavar="FILE",
+		help=(
+				"Combine the --jsonl results from each shard in FILE, instead of checking modules. "
+				"May be given multiple times."
+				),
+		)
+@click.option(
+		"--failed-first/--no-failed-first",
+		is_flag=True,
+		default=None,
+		help="Check the modules which failed on recent runs before the others.",
+		)
+@click.option(
+		"-x",
+		"--exit-first",
+		is_flag=True,
+		default=False,
+		help="Stop after the first failed import.",
+		)
+@click.option(
+		"--maxfail",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help="Stop after N failed imports.",
+		)
+@click.option(
+		"--max-output",
+		type=click.INT,
+		default=None,
+		metavar="N",
+		help="Keep at most N characters of the output from importing each module, in addition to the traceback.",
+		)
+@click.option(
+		"--jsonl",
+		type=click.File('w', lazy=False),
+		default=None,
+		metavar="FILE",
+		help="Write a JSON Lines record for each module to FILE as it is checked.",
+		)
+@click.option(
+		"--junit-xml",
+		type=click.STRING,
+		default=None,
+		metavar="FILE",
+		help="Write a JUnit XML report to FILE once all modules have been checked.",
+		)
+@click.option(
+		"-w",
+		"--watch",
+		is_flag=True,
+		default=False,
+		help="Keep running, and check modules again when they or the modules they import change.",
+		)
 @click.argument("module", type=click.STRING, nargs=-1)
-@verbose_option()
-@version_option(version_callback)
-@click_command()
+@click.option(
+		"-v",
+		"--verbose",
+		count=True,
+		help="Show verbose output.",
+		)
+@click.option(
+		"--version",
+		count=True,
+		expose_value=False,
+		is_eager=True,
+		help="Show the version and exit.",
+		callback=version_callback,
+		)
+@click.command(context_settings={"help_option_names": ["-h", "--help"], "max_content_width": 120})
 def main(
 		module: Iterable[str] = (),
-		config_file: PathLike = "pyproject.toml",
-		colour: ColourTrilean = None,
+		config_file: "PathLike" = "pyproject.toml",
+		colour: Optional[bool] = None,
 		verbose: bool = False,
 		show: Optional[bool] = None,
 		count: Optional[bool] = None,
+		jobs: Optional[int] = None,
+		isolation: Optional[str] = None,
+		durations: Optional[int] = None,
+		cache: Optional[bool] = None,
+		force: bool = False,
+		package: Iterable[str] = (),
+		exclude: Iterable[str] = (),
+		static: bool = False,
+		dependencies: Optional[bool] = None,
+		memory: Optional[int] = None,
+		fan_out: Optional[int] = None,
+		profile: bool = False,
+		profile_output: Optional[str] = None,
+		lazy_imports: Optional[float] = None,
+		jsonl: Optional[IO[str]] = None,
+		junit_xml: Optional[str] = None,
+		timeout: Optional[float] = None,
+		max_output: Optional[int] = None,
+		python: Iterable[str] = (),
+		wheel: Iterable[str] = (),
+		project: Iterable[str] = (),
+		shard: Optional[str] = None,
+		timings: Optional[str] = None,
+		merge: Iterable[str] = (),
+		failed_first: Optional[bool] = None,
+		exit_first: bool = False,
+		maxfail: Optional[int] = None,
+		watch: bool = False,
 		) -> None:
 	"""
 	Check modules can be imported.
 
-	Modules can be given as the MODULE argument or in the configuration file.
+	Modules can be given as the MODULE argument, with the --package or --project options,
+	or in the configuration file.
+	With --wheel, the modules in the given archives are checked instead.
 	"""
 
+	# 3rd party
+	from consolekit.terminal_colours import resolve_color_default
+
 	echo = functools.partial(click.echo, color=resolve_color_default(colour))
 
-	if module:
+	packages: List[str] = list(package)
+
+	modules_to_check: Iterable[str]
+
+	if module or package or wheel or project or merge:
 		if module == ('-', ):
-			modules_to_check = list(filter(bool, map(str.strip, re.split("[\n ]", sys.stdin.read()))))
+			# Read lazily, so modules can be checked while the input is still being produced.
+			modules_to_check = _iter_stdin()
 		else:
 			modules_to_check = list(module)
 
@@ -137,41 +594,502 @@ def main(
 				raise e
 
 		modules_to_check = evaluate_markers(config)
+		packages = config.get("recursive", [])
+
+	projects: List["Project"] = []
+	project_files: List[str] = []
+	requested: Dict[str, List[str]] = {}
+	given_modules = modules_to_check
+
+	if project:
+		# this package
+		from importcheck.projects import load_projects, requested_by
+
+		project_files = _expand_paths(project, "configuration file")
+		projects = load_projects(project_files, exclude=exclude)
+		if not projects:
+			raise click.UsageError(
+					"None of the configuration files have an 'importcheck' or 'tool.importcheck' table."
+					)
+
+		requested = requested_by(projects)
+
+		if isinstance(modules_to_check, list):
+			modules_to_check = [*modules_to_check, *requested]
+		else:
+			modules_to_check = itertools.chain(modules_to_check, requested)
+
+	# Options which are only supported when the modules are imported by this process.
+	local_options = {
+			"--cache": cache,
+			"--force": force,
+			"--durations": durations,
+			"--memory": memory,
+			"--fan-out": fan_out,
+			"--profile": profile,
+			"--profile-output": profile_output,
+			"--lazy-imports": lazy_imports,
+			"--jsonl": jsonl,
+			"--junit-xml": junit_xml,
+			"--shard": shard,
+			"--timings": timings,
+			"--failed-first": failed_first,
+			"--exit-first": exit_first,
+			"--maxfail": maxfail,
+			"--watch": watch,
+			}
+
+	# Options which are passed to ImportChecker, which the other interpreters do not use.
+	checker_options = {
+			"--jobs": jobs,
+			"--isolation": isolation,
+			"--static": static,
+			"--dependencies": dependencies,
+			"--timeout": timeout,
+			"--max-output": max_output,
+			}
 
 	if "config" in config:
 		if show is None:
 			show = config["config"].get("show", show)
 		if count is None:
 			count = config["config"].get("count", count)
+		if jobs is None:
+			jobs = config["config"].get("jobs", jobs)
+		if isolation is None:
+			isolation = config["config"].get("isolation", isolation)
+		if cache is None:
+			cache = config["config"].get("cache", cache)
+		if dependencies is None:
+			dependencies = config["config"].get("dependencies", dependencies)
+		if timeout is None:
+			timeout = config["config"].get("timeout", timeout)
+		if max_output is None:
+			max_output = config["config"].get("max_output", max_output)
+		if failed_first is None:
+			failed_first = config["config"].get("failed_first", failed_first)
+		if not python:
+			python = config["config"].get("python", python)
+		if timings is None:
+			timings = config["config"].get("timings", timings)
 
 	if verbose == 2:
 		show = True
 
+	if exit_first and maxfail is None:
+		maxfail = 1
+
+	cache_dir = config.get("config", {}).get("cache_dir", ".importcheck_cache")
+
+	if merge:
+		sys.exit(_merge_shards(_expand_paths(merge, "results file"), timings, show or False, verbose, echo))
+
+	if wheel:
+		_reject_options("--wheel", local_options)
+	elif python:
+		_reject_options("--python", {**local_options, **checker_options})
+
 	# if / in path replace with . and remove .py* extension
-	modules_to_check = list(paths_to_modules(*modules_to_check))
+	modules: Optional[Iterable[str]]
+
+	if isinstance(modules_to_check, list):
+		modules = list(paths_to_modules(*modules_to_check))
+	else:
+		modules = itertools.chain.from_iterable(map(paths_to_modules, modules_to_check))
+
+	if packages:
+		# Submodules are checked as they are discovered.
+		submodules = discover_modules(*packages, exclude=[*config.get("exclude", []), *exclude])
+		modules = itertools.chain(modules, submodules)
+
+	shard_message: Optional[str] = None
+
+	if shard is not None:
+		# this package
+		from importcheck.sharding import Timings, parse_shard, shard_header, shard_modules
+
+		try:
+			shard_index, shard_count = parse_shard(shard)
+		except ValueError as e:
+			raise click.UsageError(str(e))
+
+		all_modules = list(modules)
+		# Without a timings file, which every machine has the same copy of, the split is by name.
+		shard_durations = Timings(timings).durations if timings is not None else {}
+		modules = shard_modules(all_modules, shard_index, shard_count, shard_durations)
+		shard_message = (
+				f"Shard {shard_index}/{shard_count}: "
+				f"checking {len(modules)} of {len(all_modules)} {_module(len(all_modules))}."
+				)
 
-	if not modules_to_check:
-		if verbose:
-			echo("No modules to check.")
+		if jsonl is not None:
+			# Written first, so that --merge can tell if this shard's results are missing or incomplete.
+			jsonl.write(json.dumps(shard_header(shard_index, shard_count, len(modules))))
+			jsonl.write('\n')
+
+	if wheel:
+		archives = _expand_paths(wheel, "archive")
+
+		about(2 if verbose else 1)
+		click.echo()
+
+		options: Dict[str, Any] = {
+				"show": show or False,
+				"colour": colour or False,
+				"isolation": None if isolation == "none" else isolation,
+				"static": static,
+				"dependencies": dependencies or False,
+				"timeout": timeout,
+				"max_output": max_output,
+				"budget": Budget.from_mapping(config.get("config", {})),
+				"module_budgets": {
+						name: Budget.from_mapping(limits)
+						for name, limits in config.get("config", {}).get("budgets", {}).items()
+						},
+				}
+
+		try:
+			# Check the options here, rather than in each archive's interpreter.
+			ImportChecker((), **options)
+		except ValueError as e:
+			raise click.UsageError(str(e))
+
+		sys.exit(_check_archives(archives, jobs, options, count=count or False, echo=echo))
+
+	if python:
+		about(2 if verbose else 1)
+		click.echo()
+
+		targets: Union[List[str], Callable[[Dict[str, str]], List[str]]]
+
+		if project:
+			given = list(paths_to_modules(*given_modules))
+			if packages:
+				given.extend(discover_modules(*packages, exclude=[*config.get("exclude", []), *exclude]))
+
+			# Evaluate each project's markers for each interpreter.
+			targets = lambda env: [  # noqa: E731
+					*given,
+					*requested_by(load_projects(project_files, exclude=exclude, environment=env)),
+					]
+		elif module or package:
+			targets = list(modules)
+		else:
+			# Evaluate the markers for each interpreter.
+			discovered = list(discover_modules(*packages, exclude=[*config.get("exclude", []), *exclude]))
+			targets = lambda env: [*paths_to_modules(*evaluate_markers(config, env)), *discovered]  # noqa: E731
+
+		sys.exit(
+				_check_interpreters(
+						targets,
+						list(python),
+						show=show or False,
+						count=count or False,
+						colour=colour or False,
+						echo=echo,
+						)
+				)
+
+	if not isinstance(modules, list):
+		modules = _peek(modules)
+
+	if not modules:
+		if verbose or shard_message:
+			echo(shard_message or "No modules to check.")
 
 		sys.exit(0)
 
+	import_cache: Optional["ImportCache"] = None
+
+	if cache:
+		# this package
+		from importcheck.cache import ImportCache
+
+		import_cache = ImportCache(cache_dir)
+		if force:
+			import_cache.clear()
+
+	reporters: List["Reporter"] = []
+
+	if jsonl is not None:
+		# this package
+		from importcheck.reporters import JSONLinesReporter
+
+		reporters.append(JSONLinesReporter(jsonl))
+
+	if junit_xml is not None:
+		# this package
+		from importcheck.reporters import JUnitXMLReporter
+
+		reporters.append(JUnitXMLReporter(junit_xml))
+
+	failure_history: Optional["FailureHistory"] = None
+
+	# The failures are recorded whenever the cache is enabled, so a later run with --failed-first can use them.
+	if cache or failed_first:
+		# this package
+		from importcheck.cache import FailureHistory
+
+		failure_history = FailureHistory(cache_dir)
+
+	import_profile: Optional["ImportProfile"] = None
+
+	if lazy_imports is not None and isolation is None:
+		# So the cost of each module's imports is measured, even if an earlier module imported them too.
+		isolation = "snapshot"
+
+	if profile or profile_output is not None or lazy_imports is not None:
+		# this package
+		from importcheck.profiling import ImportProfile
+
+		import_profile = ImportProfile()
+
+	def make_checker(modules: Iterable[str], import_cache: Optional["ImportCache"]) -> ImportChecker:
+		return ImportChecker(
+				modules,
+				show=show or False,
+				colour=colour or False,
+				jobs=1 if jobs is None else jobs,
+				isolation=None if isolation == "none" else isolation,
+				preload=config.get("config", {}).get("preload"),
+				cache=import_cache,
+				static=static,
+				dependencies=dependencies or False,
+				measure_memory=memory is not None,
+				reporters=reporters,
+				budget=Budget.from_mapping(config.get("config", {})),
+				module_budgets={
+						name: Budget.from_mapping(limits)
+						for name, limits in config.get("config", {}).get("budgets", {}).items()
+						},
+				timeout=timeout,
+				max_output=max_output,
+				fan_out=fan_out is not None,
+				profile=import_profile,
+				prioritise=failure_history.failures if failed_first and failure_history is not None else (),
+				maxfail=maxfail,
+				)
+
+	try:
+		checker = make_checker(modules, import_cache)
+	except ValueError as e:
+		raise click.UsageError(str(e))
+
 	about(2 if verbose else 1)
 	click.echo()
 
-	checker = ImportChecker(modules_to_check, show=show or False, colour=colour or False)
-	retv = functools.reduce(operator.or_, map(operator.itemgetter(1), checker.check_modules()), 0)
+	if projects:
+		shared = sum(len(requesters) > 1 for requesters in requested.values())
+		echo(
+				f"Checking {len(requested)} {_module(len(requested))} from {len(projects)} "
+				f"{'project' if len(projects) == 1 else 'projects'} ({shared} shared)."
+				)
+		echo()
 
-	if (retv and not show) or count:
+	if shard_message is not None:
+		echo(shard_message)
 		echo()
 
-	if count:
-		echo(checker.format_statistics())
+	statuses = dict(checker.check_modules())
+	retv = functools.reduce(operator.or_, statuses.values(), 0)
+
+	if failure_history is not None:
+		failure_history.update(statuses)
+		failure_history.save()
+
+	if timings is not None and shard is None and not static:
+		# Record the durations for balancing shards later.
+		# Shards do not, as their split would change if one shard finished before another started.
+		_save_timings(timings, checker.durations)
+
+	_report(
+			checker,
+			retv,
+			show=show or False,
+			count=count or False,
+			durations=durations,
+			memory=memory,
+			fan_out=fan_out,
+			profile=profile,
+			profile_output=profile_output,
+			lazy_imports=lazy_imports,
+			projects=_format_projects(projects, statuses),
+			echo=echo,
+			)
+
+	if watch:
+		# this package
+		from importcheck.watch import Watcher, forget_modules
+
+		watcher = Watcher(
+				checker.modules,
+				interval=config.get("config", {}).get("watch_interval", 0.2),
+				graph=checker.graph,
+				)
+
+		echo()
+		echo("Watching for changes. Press Ctrl+C to stop.")
+
+		try:
+			while True:
+				affected = watcher.wait()
+				forget_modules(affected)
+
+				echo()
+				echo(f"Checking {len(affected)} changed or dependent {_module(len(affected))}:")
+				# A new cache each time, as the cache keys are only computed once per instance.
+				checker = make_checker(affected, ImportCache(cache_dir) if cache else None)
+				changed_statuses = dict(checker.check_modules())
+				statuses.update(changed_statuses)
+
+				if failure_history is not None:
+					failure_history.update(changed_statuses)
+					failure_history.save()
+
+				_report(
+						checker,
+						functools.reduce(operator.or_, changed_statuses.values(), 0),
+						show=show or False,
+						count=count or False,
+						durations=durations,
+						memory=memory,
+						fan_out=fan_out,
+						profile=profile,
+						profile_output=profile_output,
+						lazy_imports=lazy_imports,
+						projects=_format_projects(projects, statuses),
+						echo=echo,
+						)
 
-	if retv and not show:
+		except KeyboardInterrupt:
+			retv = functools.reduce(operator.or_, statuses.values(), 0)
+
+	sys.exit(_exit_status(retv))
+
+
+def _merge_shards(
+		filenames: List[str],
+		timings: Optional[str],
+		show: bool,
+		verbose: bool,
+		echo: Callable[..., None],
+		) -> int:
+	"""
+	Combine the results written by each shard with ``--jsonl``, and record the modules' durations in ``timings``.
+
+	:returns: The exit code.
+	"""
+
+	# this package
+	from importcheck.sharding import format_merged_results, merge_results
+
+	try:
+		records = merge_results(filenames)
+	except (ValueError, KeyError) as e:
+		raise click.ClickException(f"Could not read results: {e}")
+
+	if timings is not None:
+		# Modules which were not imported, as a module they depend on failed, have no duration.
+		durations = {module: record["duration"] for module, record in records.items() if record["duration"]}
+		_save_timings(timings, durations)
+
+	about(2 if verbose else 1)
+	click.echo()
+
+	output, retv = format_merged_results(records, show=show)
+	echo(output)
+
+	if retv & 1 and not show:
+		echo()
 		echo("Tip: run with '--show' to show tracebacks for failed imports.")
 
-	sys.exit(retv)
+	return _exit_status(retv)
+
+
+def _save_timings(filename: str, durations: Dict[str, float]) -> None:
+	# this package
+	from importcheck.sharding import Timings
+
+	timings = Timings(filename)
+	timings.update(durations)
+	timings.save()
+
+
+def _format_projects(projects: List["Project"], statuses: Dict[str, int]) -> Optional[str]:
+	# The results for each project, if checking the modules of several projects.
+
+	if not projects:
+		return None
+
+	# this package
+	from importcheck.projects import format_projects
+
+	return format_projects(projects, statuses)
+
+
+def _report(
+		checker: ImportChecker,
+		retv: int,
+		*,
+		show: bool,
+		count: bool,
+		durations: Optional[int],
+		memory: Optional[int],
+		fan_out: Optional[int],
+		profile: bool,
+		profile_output: Optional[str],
+		lazy_imports: Optional[float],
+		projects: Optional[str] = None,
+		echo: Callable[..., None],
+		) -> None:
+	# Show the reports requested on the command line once the modules have been checked.
+
+	reports = []
+
+	if count:
+		reports.append(checker.format_statistics())
+
+	if durations is not None:
+		reports.append(checker.format_durations(durations))
+
+	if memory is not None:
+		reports.append(checker.format_memory_usage(memory))
+
+	if fan_out is not None:
+		reports.append(checker.format_fan_out(fan_out))
+
+	if profile and checker.profile is not None:
+		reports.append(checker.profile.format_tree())
+
+	if lazy_imports is not None and checker.profile is not None:
+		# this package
+		from importcheck.advisor import advise_lazy_imports, format_advice
+
+		reports.append(format_advice(advise_lazy_imports(checker.modules, checker.profile, lazy_imports / 1000)))
+
+	if projects is not None:
+		reports.append(projects)
+
+	if profile_output is not None and checker.profile is not None:
+		# 3rd party
+		from domdf_python_tools.paths import PathPlus
+
+		if profile_output.endswith(".json"):
+			PathPlus(profile_output).dump_json(checker.profile.to_speedscope())
+		else:
+			PathPlus(profile_output).write_text(checker.profile.to_collapsed())
+
+	# Over-budget modules have a status of 2, and imported without a traceback to show.
+	failed = retv & 1
+
+	if (failed and not show) or reports:
+		echo()
+
+	if reports:
+		echo("\n\n".join(reports))
+
+	if failed and not show:
+		echo("Tip: run with '--show' to show tracebacks for failed imports.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+#
+#  advisor.py
+"""
+Find expensive module-level imports which could be deferred until they are needed.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import ast
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+# this package
+from importcheck.profiling import ImportProfile
+from importcheck.static import _ImportCollector, find_module_file, find_module_spec
+
+__all__ = (
+		"ModuleLevelImport",
+		"LazyImportAdvice",
+		"find_module_level_imports",
+		"advise_lazy_imports",
+		"format_advice",
+		)
+
+
+class ModuleLevelImport(NamedTuple):
+	"""
+	An import statement which is executed when a module is imported,
+	and whether the names it binds are only used inside function bodies.
+	"""  # noqa: D400
+
+	#: The name of the module containing the import.
+	module: str
+
+	#: The line number of the import statement.
+	lineno: int
+
+	#: The name of the module the statement imports, or imports names from.
+	target: str
+
+	#: The modules which are imported by the statement,
+	#: such as ``'a'``, ``'a.b'`` and ``'a.b.c'`` for ``import a.b.c``.
+	imported: Tuple[str, ...]
+
+	#: The names the statement binds in the module.
+	names: Tuple[str, ...]
+
+	#: Whether the import could be moved into the functions which use it.
+	deferrable: bool
+
+	#: Why the import could, or could not, be deferred.
+	reason: str
+
+
+class LazyImportAdvice(NamedTuple):
+	"""
+	An expensive module-level import, with the time it was measured to take.
+	"""
+
+	#: The import statement.
+	statement: ModuleLevelImport
+
+	#: The measured time taken by the import, in seconds.
+	#: If the import is deferred, this is an estimate of the time saved when the module is imported.
+	cost: float
+
+
+def find_module_level_imports(module: str, filename: Optional[str] = None) -> List[ModuleLevelImport]:
+	"""
+	Find the import statements in ``module`` which are executed when it is imported,
+	and determine from the module's source whether each could be deferred.
+
+	An import can be deferred if the names it binds are only used inside the bodies of functions
+	(including methods, but not class bodies, decorators, default arguments or annotations,
+	which are evaluated when the module is imported), and are not re-exported in ``__all__``.
+
+	Imports guarded by ``if TYPE_CHECKING`` or ``try ... except ImportError`` are not included.
+
+	:param module: The dotted name of the module.
+	:param filename: The path to the module's source file.
+		If not given it is found with :func:`importcheck.static.find_module_file`.
+	"""  # noqa: D400
+
+	if filename is None:
+		filename = find_module_file(module)
+		if filename is None:
+			return []
+
+	try:
+		with open(filename, "rb") as fp:
+			tree = ast.parse(fp.read(), filename=filename)
+	except (OSError, SyntaxError, ValueError):
+		return []
+
+	spec = find_module_spec(module)
+	if spec is not None and spec.submodule_search_locations is not None:
+		package = module
+	else:
+		package = module.rpartition('.')[0]
+
+	collector = _ImportCollector()
+	collector.visit_body(tree.body)
+
+	usage = _UsageVisitor(postponed_annotations=_has_future_annotations(tree))
+	usage.visit(tree)
+	exported = _exported_names(tree)
+
+	statements = []
+
+	for node in collector.imports:
+		for target, imported, names in _bindings(node, package):
+			deferrable, reason = _classify(names, usage, exported)
+			statements.append(ModuleLevelImport(module, node.lineno, target, imported, names, deferrable, reason))
+
+	return statements
+
+
+def _bindings(node: ast.stmt, package: str) -> Iterable[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]:
+	# Returns the module named, the modules imported, and the names bound, for each target of the import statement.
+
+	if isinstance(node, ast.Import):
+		for alias in node.names:
+			parts = alias.name.split('.')
+			imported = tuple('.'.join(parts[:idx + 1]) for idx in range(len(parts)))
+			yield alias.name, imported, (alias.asname or parts[0], )
+
+	elif isinstance(node, ast.ImportFrom):
+		if node.level:
+			base = package.split('.') if package else []
+			base = base[:len(base) - (node.level - 1)]
+			name = '.'.join(base + ([node.module] if node.module else []))
+		else:
+			name = node.module or ''
+
+		if not name:
+			return
+
+		parts = name.split('.')
+		modules = ['.'.join(parts[:idx + 1]) for idx in range(len(parts))]
+		# Names imported from a package may be submodules.
+		modules.extend(f"{name}.{alias.name}" for alias in node.names if alias.name != '*')
+
+		yield name, tuple(modules), tuple(alias.asname or alias.name for alias in node.names)
+
+
+def _classify(names: Tuple[str, ...], usage: "_UsageVisitor", exported: Set[str]) -> Tuple[bool, str]:
+	# Returns whether an import binding ``names`` could be deferred, and why.
+
+	if '*' in names:
+		return False, "star import"
+
+	for name in names:
+		if name in exported:
+			return False, f"{name!r} is re-exported in __all__"
+
+		if name in usage.module_level:
+			return False, f"{name!r} is used at module level on line {usage.module_level[name]}"
+
+	if any(name in usage.deferred for name in names):
+		return True, "only used inside functions"
+
+	return True, "not used in the module"
+
+
+class _UsageVisitor(ast.NodeVisitor):
+	# Records where names are used: at module level (including class bodies), or only inside functions.
+
+	def __init__(self, postponed_annotations: bool = False):
+		self.postponed_annotations = postponed_annotations
+		self.module_level: Dict[str, int] = {}
+		self.deferred: Set[str] = set()
+		self._depth = 0
+
+	def visit_Name(self, node: ast.Name) -> None:  # noqa: D102
+		if isinstance(node.ctx, ast.Store):
+			return
+
+		if self._depth:
+			self.deferred.add(node.id)
+		else:
+			self.module_level.setdefault(node.id, node.lineno)
+
+	def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda]) -> None:
+		# Decorators, default values and annotations are evaluated when the function is defined.
+		for decorator in getattr(node, "decorator_list", []):
+			self.visit(decorator)
+
+		for default in [*node.args.defaults, *node.args.kw_defaults]:
+			if default is not None:
+				self.visit(default)
+
+		if not self.postponed_annotations and not isinstance(node, ast.Lambda):
+			args = [
+					*getattr(node.args, "posonlyargs", ()),  # Python 3.8+
+					*node.args.args,
+					*node.args.kwonlyargs,
+					node.args.vararg,
+					node.args.kwarg,
+					]
+			for arg in args:
+				if arg is not None and arg.annotation is not None:
+					self.visit(arg.annotation)
+			if node.returns is not None:
+				self.visit(node.returns)
+
+		self._depth += 1
+		for child in (node.body if isinstance(node.body, list) else [node.body]):
+			self.visit(child)
+		self._depth -= 1
+
+	visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visit_function
+
+	def visit_AnnAssign(self, node: ast.AnnAssign) -> None:  # noqa: D102
+		if node.value is not None:
+			self.visit(node.value)
+		self.visit(node.target)
+		if not self.postponed_annotations and not self._depth:
+			self.visit(node.annotation)
+
+
+def _has_future_annotations(tree: ast.Module) -> bool:
+	return any(
+			isinstance(node, ast.ImportFrom) and node.module == "__future__"
+			and any(alias.name == "annotations" for alias in node.names) for node in tree.body
+			)
+
+
+def _exported_names(tree: ast.Module) -> Set[str]:
+	# The string literals in any module-level assignments to ``__all__``.
+
+	exported: Set[str] = set()
+
+	for node in tree.body:
+		if isinstance(node, ast.Assign):
+			targets = node.targets
+		elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+			targets = [node.target]
+		else:
+			continue
+
+		if any(isinstance(target, ast.Name) and target.id == "__all__" for target in targets) and node.value:
+			try:
+				exported.update(ast.literal_eval(node.value))
+			except (ValueError, TypeError, SyntaxError):
+				pass
+
+	return exported
+
+
+def _import_costs(profile: ImportProfile) -> Dict[str, Dict[str, float]]:
+	# Mapping of module names to the mean time taken by each module first imported while executing them.
+
+	costs: Dict[str, Dict[str, float]] = {}
+
+	for _, node in profile.root.walk():
+		for child in node.children.values():
+			mean = child.cumulative_time / max(child.count, 1)
+			module_costs = costs.setdefault(node.name, {})
+			module_costs[child.name] = max(module_costs.get(child.name, 0.0), mean)
+
+	return costs
+
+
+def advise_lazy_imports(
+		modules: Iterable[str],
+		profile: ImportProfile,
+		min_time: float = 0.001,
+		) -> List[LazyImportAdvice]:
+	"""
+	Find the module-level imports in ``modules`` which took at least ``min_time`` seconds,
+	according to ``profile``, ordered from the most to the least expensive.
+
+	The profile should be recorded while checking the modules with ``isolation='snapshot'``,
+	so the cost of each module's imports is measured even if another module imported them first.
+	The cost of an import is the time taken by the modules first imported by the statement,
+	so it overestimates the time saved by deferring it if the same modules are also imported elsewhere.
+
+	:param modules: The modules to inspect.
+	:param profile: A profile recorded while checking the modules (see :mod:`importcheck.profiling`).
+	:param min_time: The minimum cost of imports to include, in seconds.
+	"""  # noqa: D400
+
+	costs = _import_costs(profile)
+	advice = []
+
+	for module in modules:
+		module_costs = costs.get(module)
+		if not module_costs:
+			continue
+
+		for statement in find_module_level_imports(module):
+			cost = sum(module_costs.get(name, 0.0) for name in statement.imported)
+			if cost >= min_time:
+				advice.append(LazyImportAdvice(statement, cost))
+
+	advice.sort(key=lambda item: item.cost, reverse=True)
+	return advice
+
+
+def format_advice(advice: Iterable[LazyImportAdvice]) -> str:
+	"""
+	Format the output of :func:`~.advise_lazy_imports`,
+	giving the total time which could be saved by deferring the imports which can be deferred.
+
+	:param advice:
+	"""  # noqa: D400
+
+	advice = list(advice)
+
+	if not advice:
+		return "No expensive module-level imports were found."
+
+	lines = ["Expensive module-level imports:"]
+	saving = 0.0
+
+	for statement, cost in advice:
+		verdict = "could be deferred" if statement.deferrable else "needed at import time"
+		lines.append(
+				f"{cost * 1000:7.1f} ms {statement.module}:{statement.lineno} {statement.target} "
+				f"-- {verdict} ({statement.reason})"
+				)
+
+		if statement.deferrable:
+			saving += cost
+
+	lines.append(f"Deferring these imports could save up to {saving * 1000:.1f} ms.")
+
+	return '\n'.join(lines)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+#
+#  archives.py
+"""
+Check the modules in wheels and zip applications can be imported straight from the archive.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import csv
+import io
+import json
+import os
+import posixpath
+import re
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+__all__ = ("archive_modules", "ArchiveResult", "check_archive", "check_archives")
+
+_RECORD = re.compile(r"[^/]+\.dist-info/RECORD")
+
+# Run in a new interpreter for each archive, so the modules of one archive cannot affect those of another.
+# The checker's output is redirected to stderr, and the results are written as JSON to the original stdout.
+_CHECK_SCRIPT = """\
+import json, os, sys
+
+results = os.fdopen(os.dup(1), "w")
+os.dup2(2, 1)
+
+archive, options, importcheck_path = sys.argv[1:]
+
+# With -c the current directory is on sys.path, so modules missing from the archive would be imported from it.
+sys.path[:] = [path for path in sys.path if path not in {'', os.getcwd()}]
+
+from importlib.util import find_spec
+
+if find_spec("importcheck") is None:
+	sys.path.append(importcheck_path)
+
+from importcheck import Budget, ImportChecker
+from importcheck.archives import archive_modules
+
+modules = archive_modules(archive)
+sys.path.insert(0, archive)
+
+options = json.loads(options)
+options["budget"] = Budget(*options.get("budget", ()))
+options["module_budgets"] = {name: Budget(*limits) for name, limits in options.get("module_budgets", {}).items()}
+
+checker = ImportChecker(modules, **options)
+statuses = dict(checker.check_modules())
+sys.stdout.flush()
+
+results.write(json.dumps({"statuses": statuses, "statistics": checker.format_statistics()}))
+results.flush()
+"""
+
+
+def archive_modules(filename: PathLike) -> List[str]:
+	"""
+	Returns the names of the modules in a wheel or zip application, with each package before its submodules.
+
+	The modules in a wheel are listed from the ``RECORD`` file in its ``.dist-info`` directory,
+	excluding any files installed into other locations from its ``.data`` directory.
+	For other archives, such as ``.pyz`` zip applications, every ``.py`` file is included
+	except the top-level ``__main__.py``, which runs the application.
+
+	:param filename: The path to the archive.
+	"""
+
+	with zipfile.ZipFile(filename) as archive:
+		names = archive.namelist()
+		records = [name for name in names if _RECORD.fullmatch(name)]
+
+		if records:
+			with archive.open(records[0]) as fp:
+				paths = [row[0] for row in csv.reader(io.TextIOWrapper(fp, encoding="UTF-8")) if row]
+		else:
+			paths = [name for name in names if name != "__main__.py"]
+
+	modules = set()
+
+	for path in paths:
+		module = _path_to_module(path)
+		if module is not None:
+			modules.add(module)
+
+	return sorted(modules)
+
+
+def _path_to_module(path: str) -> Optional[str]:
+	# Returns the name of the module at ``path`` within an archive, or None if it is not an importable module.
+
+	stem, ext = posixpath.splitext(path)
+	if ext != ".py":
+		return None
+
+	parts = stem.split('/')
+	if parts[0].endswith((".dist-info", ".data")):
+		return None
+
+	if parts[-1] == "__init__":
+		parts.pop()
+
+	if not parts or not all(part.isidentifier() for part in parts):
+		return None
+
+	return '.'.join(parts)
+
+
+class ArchiveResult(NamedTuple):
+	"""
+	The results of checking the modules in an archive with :func:`~.check_archive`.
+	"""
+
+	#: The path to the archive.
+	archive: str
+
+	#: Mapping of module names to their statuses,
+	#: as yielded by :meth:`ImportChecker.check_modules() <.ImportChecker.check_modules>`.
+	statuses: Dict[str, int]
+
+	#: The output from checking the modules, as printed by :class:`~.ImportChecker`.
+	output: str
+
+	#: The number of modules imported successfully,
+	#: as formatted by :meth:`ImportChecker.format_statistics() <.ImportChecker.format_statistics>`.
+	statistics: str
+
+	#: The exit code of the interpreter the modules were checked in.
+	returncode: int = 0
+
+	@property
+	def status(self) -> int:
+		"""
+		The combined status of the modules, or ``1`` if the archive could not be checked.
+		"""
+
+		if self.returncode:
+			return 1
+
+		status = 0
+		for module_status in self.statuses.values():
+			status |= module_status
+
+		return status
+
+
+def check_archive(archive: PathLike, *, python: str = sys.executable, **options: Any) -> ArchiveResult:
+	r"""
+	Check the modules in a wheel or zip application can be imported straight from the archive.
+
+	The archive is added to the start of :py:obj:`sys.path` in a new interpreter,
+	where its modules (see :func:`~.archive_modules`) are imported by :mod:`zipimport`.
+	Extension modules and data files cannot be loaded from an archive,
+	so modules which need them will fail even though they work once the wheel is installed.
+
+	:param archive: The path to the archive.
+	:param python: The path to the interpreter, which must have ``importcheck`` installed.
+	:param \*\*options: Keyword arguments for :class:`~.ImportChecker`, which must be serialisable as JSON.
+		The ``budget`` and ``module_budgets`` may be given as :class:`~.Budget` objects.
+	"""
+
+	archive = os.fspath(archive)
+
+	# this package
+	import importcheck
+
+	# So the new interpreter can import importcheck even if it is only on this process's sys.path.
+	importcheck_path = os.path.dirname(os.path.dirname(os.path.abspath(importcheck.__file__)))
+
+	process = subprocess.run(
+			[python, "-c", _CHECK_SCRIPT, os.path.abspath(archive), json.dumps(options), importcheck_path],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			)
+
+	try:
+		results = json.loads(process.stdout)
+	except ValueError:
+		# The interpreter crashed, or exited, part way through.
+		message = f"The interpreter exited unexpectedly (exit code {process.returncode}).\n"
+		return ArchiveResult(archive, {}, process.stderr + message, message.rstrip(), process.returncode or 1)
+
+	return ArchiveResult(archive, results["statuses"], process.stderr, results["statistics"], process.returncode)
+
+
+def check_archives(
+		archives: Iterable[PathLike],
+		*,
+		jobs: Optional[int] = None,
+		**options: Any,
+		) -> Iterator[ArchiveResult]:
+	r"""
+	Check the modules in several archives concurrently, each in its own interpreter.
+
+	:param archives: The paths to the archives.
+	:param jobs: The number of archives to check at once. Defaults to one per CPU.
+	:param \*\*options: Keyword arguments for :func:`~.check_archive`.
+
+	:returns: An iterator over the results for each archive, in the order the archives were given.
+	"""
+
+	archives = list(archives)
+	workers = max(min(jobs or os.cpu_count() or 1, len(archives)), 1)
+
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		yield from executor.map(lambda archive: check_archive(archive, **options), archives)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+Persistent cache of modules which were previously imported successfully.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from packaging.markers import default_environment
+
+# this package
+from importcheck.static import find_module_spec, iter_imports
+
+__all__ = ("ImportCache", "FailureHistory")
+
+_CACHE_VERSION = 1
+
+
+class ImportCache:
+	"""
+	Records the modules which were imported successfully, so they can be skipped if nothing has changed.
+
+	Each module is keyed on a hash of:
+
+	* the interpreter version and executable;
+	* the :pep:`508` marker environment, as used by :func:`~.evaluate_markers`;
+	* the contents of its source file, and those of its parent packages and the modules it imports
+	  from the same top-level package, recursively;
+	* the path, size and modification time of the files of other modules it imports.
+
+	:param directory: The directory to store the cache in.
+	"""
+
+	def __init__(self, directory: PathLike = ".importcheck_cache"):
+
+		#: The directory the cache is stored in.
+		self.directory: PathPlus = PathPlus(directory)
+
+		self._entries: Dict[str, Dict[str, Any]] = {}
+		self._file_hashes: Dict[str, str] = {}
+		self._dependency_cache: Dict[str, List[str]] = {}
+		self._keys: Dict[str, Optional[str]] = {}
+
+		self._environment = json.dumps(
+				[sys.version, sys.executable, default_environment()],
+				sort_keys=True,
+				)
+
+		if self.filename.is_file():
+			try:
+				data = self.filename.load_json()
+			except ValueError:
+				data = {}
+
+			if data.get("version") == _CACHE_VERSION:
+				self._entries = data.get("modules", {})
+
+	@property
+	def filename(self) -> PathPlus:
+		"""
+		The file the cache is stored in.
+		"""
+
+		return self.directory / f"v{_CACHE_VERSION}" / "modules.json"
+
+	def _hash_file(self, filename: str) -> str:
+		if filename not in self._file_hashes:
+			try:
+				with open(filename, "rb") as fp:
+					self._file_hashes[filename] = hashlib.sha256(fp.read()).hexdigest()
+			except OSError:
+				self._file_hashes[filename] = "unreadable"
+
+		return self._file_hashes[filename]
+
+	def _dependencies(self, module: str) -> List[str]:
+		# The modules imported by ``module``, and its parent package.
+
+		if module not in self._dependency_cache:
+			spec = find_module_spec(module)
+			dependencies = set()
+
+			if '.' in module:
+				dependencies.add(module.rpartition('.')[0])
+			if spec is not None and spec.has_location and spec.origin:
+				dependencies.update(iter_imports(module, spec.origin, submodules=True))
+
+			dependencies.discard(module)
+			self._dependency_cache[module] = sorted(dependencies)
+
+		return self._dependency_cache[module]
+
+	def key(self, module: str) -> Optional[str]:
+		"""
+		Returns the cache key for ``module``, or :py:obj:`None` if it cannot be cached.
+
+		The key is computed once per :class:`~.ImportCache` instance,
+		by :meth:`~.get` before the module is imported,
+		so changes made during the run are detected by the next one.
+
+		:param module:
+		"""
+
+		if module not in self._keys:
+			self._keys[module] = self._compute_key(module)
+
+		return self._keys[module]
+
+	def _compute_key(self, module: str) -> Optional[str]:
+		spec = find_module_spec(module)
+		if spec is None or not spec.has_location or not spec.origin:
+			return None
+
+		toplevel = module.split('.')[0]
+		parts: List[str] = []
+		seen = {module}
+		stack = [module]
+
+		while stack:
+			name = stack.pop()
+			parts.append(f"{name}={_stat_module(name, self._hash_file)}")
+
+			for dependency in self._dependencies(name):
+				if dependency in seen:
+					continue
+
+				seen.add(dependency)
+
+				if dependency.split('.')[0] == toplevel:
+					stack.append(dependency)
+				else:
+					parts.append(f"{dependency}={_stat_module(dependency)}")
+
+		parts.sort()
+		parts.insert(0, self._environment)
+		return hashlib.sha256('\n'.join(parts).encode("UTF-8")).hexdigest()
+
+	def get(self, module: str) -> Optional[float]:
+		"""
+		If ``module`` was previously imported successfully and nothing has changed since,
+		returns the time it took to import.
+
+		Otherwise returns :py:obj:`None`.
+
+		:param module:
+		"""  # noqa: D400
+
+		# The key is computed even if there is no entry, as it is needed to record the result once imported.
+		key = self.key(module)
+
+		entry = self._entries.get(module)
+		if entry is None or entry["key"] != key:
+			return None
+
+		return entry["duration"]
+
+	def set(self, module: str, duration: float) -> None:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Record that ``module`` was imported successfully.
+
+		:param module:
+		:param duration: The time taken to import the module, in seconds.
+		"""
+
+		key = self.key(module)
+		if key is None:
+			self._entries.pop(module, None)
+		else:
+			self._entries[module] = {"key": key, "duration": duration}
+
+	def discard(self, module: str) -> None:
+		"""
+		Remove ``module`` from the cache, e.g. because it could not be imported.
+
+		:param module:
+		"""
+
+		self._entries.pop(module, None)
+
+	def clear(self) -> None:
+		"""
+		Remove all modules from the cache.
+		"""
+
+		self._entries.clear()
+
+	def save(self) -> None:
+		"""
+		Write the cache to disk.
+		"""
+
+		_make_cache_directory(self.directory)
+		self.filename.parent.maybe_make(parents=True)
+		self.filename.dump_json({"version": _CACHE_VERSION, "modules": self._entries}, indent=2)
+
+
+class FailureHistory:
+	"""
+	Records the modules which failed to import on recent runs, most recent first,
+	so they can be checked before the others next time.
+
+	.. versionadded:: 0.6.0
+
+	:param directory: The directory to store the history in.
+	:param size: The maximum number of modules to remember.
+	"""  # noqa: D400
+
+	def __init__(self, directory: PathLike = ".importcheck_cache", size: int = 100):
+
+		#: The directory the history is stored in.
+		self.directory: PathPlus = PathPlus(directory)
+
+		#: The maximum number of modules to remember.
+		self.size: int = size
+
+		#: The modules which failed to import and have not been imported successfully since, most recent first.
+		self.failures: List[str] = []
+
+		if self.filename.is_file():
+			try:
+				self.failures = [str(module) for module in self.filename.load_json()][:size]
+			except (ValueError, TypeError):
+				pass
+
+	@property
+	def filename(self) -> PathPlus:
+		"""
+		The file the history is stored in.
+		"""
+
+		return self.directory / "failures.json"
+
+	def update(self, statuses: Mapping[str, int]) -> None:
+		"""
+		Update the history with the results of a run.
+
+		Modules which failed are moved to the start of the history,
+		and modules which were imported successfully (even if over budget) are removed.
+		Modules which were not checked are left where they are.
+
+		:param statuses: Mapping of module names to their statuses,
+			as yielded by :meth:`ImportChecker.check_modules() <importcheck.ImportChecker.check_modules>`.
+		"""
+
+		failed = [module for module, status in statuses.items() if status == 1]
+		remaining = [module for module in self.failures if module not in statuses]
+		self.failures = [*failed, *remaining][:self.size]
+
+	def save(self) -> None:
+		"""
+		Write the history to disk.
+		"""
+
+		_make_cache_directory(self.directory)
+		self.filename.dump_json(self.failures, indent=2)
+
+
+def _make_cache_directory(directory: PathPlus) -> None:
+	# Create the cache directory, with a .gitignore file so its contents are not committed.
+
+	directory.maybe_make(parents=True)
+
+	gitignore = directory / ".gitignore"
+	if not gitignore.is_file():
+		gitignore.write_clean("# Created by importcheck\n*")
+
+
+def _stat_module(module: str, hash_file: Optional[Callable[[str], str]] = None) -> str:
+	# Identifies the current state of the module's file, by its content if ``hash_file`` is given.
+
+	spec = find_module_spec(module)
+
+	if spec is None:
+		return "missing"
+	elif not spec.has_location or not spec.origin:
+		return spec.origin or "no-location"
+	elif hash_file is not None:
+		return f"{spec.origin}:{hash_file(spec.origin)}"
+
+	try:
+		stat = os.stat(spec.origin)
+	except OSError:
+		return f"{spec.origin}:unreadable"
+
+	return f"{spec.origin}:{stat.st_size}:{stat.st_mtime_ns}"
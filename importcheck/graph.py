@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#
+#  graph.py
+"""
+Determine the order to check modules in from the imports between them.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import collections
+import heapq
+from typing import Collection, Dict, Iterable, List, Mapping
+
+# this package
+from importcheck.static import iter_imports
+
+__all__ = ("build_import_graph", "module_dependencies", "topological_order")
+
+
+def build_import_graph(modules: Iterable[str]) -> Dict[str, List[str]]:
+	"""
+	Build the graph of imports between the given modules.
+
+	Only imports which are executed when a module is imported are considered,
+	and imports of modules which are not in ``modules`` are ignored.
+	A module's parent packages (if in ``modules``) are always counted as dependencies,
+	as they are imported first.
+	The modules are not imported.
+
+	:param modules:
+
+	:returns: A mapping of module names to the list of modules they depend on.
+	"""
+
+	modules = list(modules)
+	known = set(modules)
+
+	return {module: module_dependencies(module, known) for module in modules}
+
+
+def module_dependencies(module: str, known: Collection[str]) -> List[str]:
+	"""
+	Returns the modules in ``known`` which ``module`` depends on, as determined by :func:`~.build_import_graph`.
+
+	:param module:
+	:param known: The modules to consider.
+	"""
+
+	dependencies = set()
+
+	parent = module
+	while '.' in parent:
+		parent = parent.rpartition('.')[0]
+		dependencies.add(parent)
+
+	for imported in iter_imports(module, submodules=True, import_time=True):
+		# Importing 'a.b.c' also imports 'a' and 'a.b'.
+		parts = imported.split('.')
+		dependencies.update('.'.join(parts[:idx + 1]) for idx in range(len(parts)))
+
+	dependencies.discard(module)
+	return [name for name in sorted(dependencies) if name in known]
+
+
+def topological_order(graph: Mapping[str, Iterable[str]]) -> List[str]:
+	"""
+	Returns the modules in ``graph`` ordered so that each module comes after all the modules it depends on.
+
+	Where there is a choice the original order of the modules is kept.
+	Modules which are part of an import cycle are placed at the end, in their original order.
+
+	:param graph: A mapping of module names to the modules they depend on,
+		as returned by :func:`~.build_import_graph`.
+	"""
+
+	position = {module: idx for idx, module in enumerate(graph)}
+	remaining: Dict[str, int] = {}
+	dependents: Dict[str, List[str]] = collections.defaultdict(list)
+
+	for module, dependencies in graph.items():
+		dependencies = [name for name in dependencies if name in position]
+		remaining[module] = len(dependencies)
+		for dependency in dependencies:
+			dependents[dependency].append(module)
+
+	order: List[str] = []
+
+	# Heap of (original position, module), so the original order is kept where possible.
+	ready = [(position[module], module) for module in graph if not remaining[module]]
+	heapq.heapify(ready)
+
+	while ready:
+		_, module = heapq.heappop(ready)
+		order.append(module)
+
+		for dependent in dependents[module]:
+			remaining[dependent] -= 1
+			if not remaining[dependent]:
+				heapq.heappush(ready, (position[dependent], dependent))
+
+	if len(order) < len(graph):
+		ordered = set(order)
+		order.extend(module for module in graph if module not in ordered)
+
+	return order
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+#
+#  interpreters.py
+"""
+Check modules can be imported with several Python interpreters at once.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+# this package
+from importcheck import OK, Error
+
+__all__ = ("marker_environment", "check_with_interpreter", "check_with_interpreters", "format_matrix")
+
+# Run by the target interpreter, so must only use the standard library of any supported version of Python.
+# Mirrors ``packaging.markers.default_environment()``.
+_ENVIRONMENT_SCRIPT = """\
+import json, os, platform, sys
+
+info = sys.implementation.version
+version = "{0.major}.{0.minor}.{0.micro}".format(info)
+if info.releaselevel != "final":
+	version += info.releaselevel[0] + str(info.serial)
+
+print(json.dumps({
+		"implementation_name": sys.implementation.name,
+		"implementation_version": version,
+		"os_name": os.name,
+		"platform_machine": platform.machine(),
+		"platform_release": platform.release(),
+		"platform_system": platform.system(),
+		"platform_version": platform.version(),
+		"python_full_version": platform.python_version(),
+		"platform_python_implementation": platform.python_implementation(),
+		"python_version": ".".join(platform.python_version_tuple()[:2]),
+		"sys_platform": sys.platform,
+		}))
+"""
+
+# Imports each module named on stdin, writing a JSON record for each to the original stdout.
+# Anything else written to stdout, even by extension modules, is redirected to stderr.
+_CHECK_SCRIPT = """\
+import contextlib, importlib, io, json, os, sys, time, traceback
+
+results = os.fdopen(os.dup(1), "w")
+os.dup2(2, 1)
+
+for module in sys.stdin.read().split():
+	output = io.StringIO()
+	start = time.perf_counter()
+	with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+		try:
+			importlib.import_module(module)
+			passed = True
+		except Exception:
+			exc_type, exc, tb = sys.exc_info()
+			traceback.print_exception(exc_type, exc, tb.tb_next)
+			passed = False
+	duration = time.perf_counter() - start
+	results.write(json.dumps([module, passed, duration, output.getvalue()]) + "\\n")
+	results.flush()
+"""
+
+
+def marker_environment(python: str) -> Dict[str, str]:
+	"""
+	Returns the :pep:`508` marker environment of the given Python interpreter,
+	for evaluating the markers in the ``only_if`` table with :func:`importcheck.evaluate_markers`.
+
+	:param python: The path to the interpreter, or the name of an executable on :envvar:`PATH`.
+
+	:raises: :exc:`OSError` or :exc:`subprocess.CalledProcessError` if the interpreter could not be run.
+	"""  # noqa: D400
+
+	process = subprocess.run(
+			[python, "-c", _ENVIRONMENT_SCRIPT],
+			stdout=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	return json.loads(process.stdout)
+
+
+def check_with_interpreter(python: str, modules: Sequence[str]) -> Dict[str, Union[OK, Error]]:
+	"""
+	Check the given modules can be imported with another Python interpreter.
+
+	The modules are imported one after another in a single process,
+	which does not need ``importcheck`` (or any of its dependencies) to be installed.
+
+	:param python: The path to the interpreter, or the name of an executable on :envvar:`PATH`.
+	:param modules:
+
+	:returns: A mapping of module names to the results of checking them.
+		The output of a failed import is combined into ``stdout``.
+
+	:raises: :exc:`OSError` if the interpreter could not be run.
+	"""
+
+	process = subprocess.run(
+			[python, "-c", _CHECK_SCRIPT],
+			input='\n'.join(modules),
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			)
+
+	results: Dict[str, Union[OK, Error]] = {}
+
+	for line in process.stdout.splitlines():
+		module, passed, duration, output = json.loads(line)
+		if passed:
+			results[module] = OK(module, duration)
+		else:
+			results[module] = Error(module, output, output, duration)
+
+	for module in modules:
+		if module not in results:
+			# The interpreter crashed, or exited, part way through.
+			message = f"The interpreter exited unexpectedly (exit code {process.returncode}).\n{process.stderr}"
+			results[module] = Error(module, message, message)
+
+	return results
+
+
+def check_with_interpreters(
+		modules: Union[Sequence[str], Callable[[Dict[str, str]], Sequence[str]]],
+		pythons: Sequence[str],
+		) -> Dict[str, Dict[str, Union[OK, Error]]]:
+	"""
+	Check modules can be imported with each of the given Python interpreters, concurrently.
+
+	:param modules: The modules to check, or a callable which returns the modules to check
+		given the interpreter's marker environment (see :func:`~.marker_environment`).
+	:param pythons: The paths to the interpreters, or the names of executables on :envvar:`PATH`.
+
+	:returns: A mapping of interpreters to the results for each module checked with it.
+	"""
+
+	def check(python: str) -> Dict[str, Union[OK, Error]]:
+		if callable(modules):
+			return check_with_interpreter(python, modules(marker_environment(python)))
+		else:
+			return check_with_interpreter(python, modules)
+
+	with ThreadPoolExecutor(max_workers=max(len(pythons), 1)) as executor:
+		return dict(zip(pythons, executor.map(check, pythons)))
+
+
+def format_matrix(
+		results: Mapping[str, Mapping[str, Union[OK, Error]]],
+		modules: Optional[Sequence[str]] = None,
+		colour: bool = False,
+		) -> str:
+	"""
+	Format the results from :func:`~.check_with_interpreters` as a table,
+	with a row for each module and a column for each interpreter.
+
+	Modules which were not checked with an interpreter, for example because of their ``only_if`` markers,
+	are shown as ``-``.
+
+	:param results:
+	:param modules: The modules to include, in order.
+		By default all modules are included, in the order they were first checked.
+	:param colour: Whether to use coloured output.
+	"""  # noqa: D400
+
+	# 3rd party
+	from consolekit.terminal_colours import Back
+
+	if modules is None:
+		modules = list(dict.fromkeys(module for result in results.values() for module in result))
+
+	pythons = list(results)
+	module_width = max(map(len, ["Module", *modules]))
+	widths = [max(len(python), len("Passed")) for python in pythons]
+
+	lines = ['  '.join(["Module".ljust(module_width), *(p.ljust(w) for p, w in zip(pythons, widths))]).rstrip()]
+
+	for module in modules:
+		cells: List[str] = []
+
+		for python, width in zip(pythons, widths):
+			result = results[python].get(module)
+
+			if result is None:
+				cells.append('-'.ljust(width))
+			elif result:
+				cells.append(_colour(Back.RED, "Failed", colour) + ' ' * (width - 6))
+			else:
+				cells.append(_colour(Back.GREEN, "Passed", colour) + ' ' * (width - 6))
+
+		lines.append('  '.join([module.ljust(module_width), *cells]).rstrip())
+
+	return '\n'.join(lines)
+
+
+def _colour(style: Callable[[str], str], text: str, colour: bool) -> str:
+	return style(text) if colour else text
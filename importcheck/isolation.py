@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+#
+#  isolation.py
+"""
+Check modules in isolation from one another.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import collections
+import faulthandler
+import importlib
+import os
+import pickle
+import select
+import signal
+import sys
+import tempfile
+import time
+from types import TracebackType
+from typing import Any, Callable, Counter, Dict, Iterable, List, Optional, Sequence, Type, Union
+
+# 3rd party
+from domdf_python_tools.utils import redirect_output
+
+# this package
+from importcheck import OK, Error, LazyError, check_module
+from importcheck.static import iter_imports
+
+__all__ = ("WarmTemplate", "ForkedCheck", "ModuleSnapshot", "check_in_snapshot", "detect_shared_dependencies")
+
+
+def detect_shared_dependencies(modules: Sequence[str], min_count: int = 2) -> List[str]:
+	"""
+	Find the top-level packages imported by at least ``min_count`` of the given modules.
+
+	The modules' source code is inspected without importing them.
+	Packages which are themselves being checked are excluded.
+
+	:param modules: The modules to be checked.
+	:param min_count: The number of modules which must import a package for it to be included.
+	"""
+
+	own_packages = {module.split('.')[0] for module in modules}
+	counts: Counter[str] = collections.Counter()
+
+	for module in modules:
+		imported = {name.split('.')[0] for name in iter_imports(module)}
+		counts.update(imported - own_packages - {"__future__"})
+
+	return sorted(name for name, count in counts.items() if count >= min_count)
+
+
+class ForkedCheck:
+	"""
+	Represents a module being checked in a child process forked from a :class:`~.WarmTemplate`.
+
+	:param module: The name of the module being checked.
+	:param combine_output: If :py:obj:`True` ``stderr`` is combined with ``stdout``.
+	:param check: The function to check the module with in the child process.
+	:param timeout: The maximum time, in seconds, the check may take.
+		If it takes longer the child process is killed, and the result is an :class:`~.Error`
+		containing the stack of each of its threads.
+	"""
+
+	def __init__(
+			self,
+			module: str,
+			combine_output: bool = False,
+			check: Callable[..., Union[OK, Error, LazyError]] = check_module,
+			timeout: Optional[float] = None,
+			):
+
+		#: The name of the module being checked.
+		self.module: str = module
+
+		#: The maximum time, in seconds, the check may take.
+		self.timeout: Optional[float] = timeout
+
+		sys.stdout.flush()
+		sys.stderr.flush()
+
+		# The child's watchdog writes the stack of each thread here if the timeout expires.
+		self._stack_file = tempfile.TemporaryFile() if timeout is not None else None
+
+		read_fd, write_fd = os.pipe()
+		self._started = time.monotonic()
+		pid = os.fork()
+
+		if pid == 0:  # pragma: no cover (child)
+			try:
+				os.close(read_fd)
+
+				if timeout is not None and self._stack_file is not None:
+					faulthandler.dump_traceback_later(timeout, exit=True, file=self._stack_file)
+
+				result = check(module, combine_output=combine_output)
+				faulthandler.cancel_dump_traceback_later()
+
+				data = pickle.dumps(result)
+				with os.fdopen(write_fd, "wb") as fp:
+					fp.write(data)
+			finally:
+				os._exit(0)
+
+		os.close(write_fd)
+
+		#: The process ID of the child process.
+		self.pid: int = pid
+
+		self._read_fd = read_fd
+		self._result: Optional[Union[OK, Error]] = None
+
+	def result(self) -> Union[OK, Error]:
+		"""
+		Wait for the child process to finish and return the result of checking the module.
+		"""
+
+		if self._result is not None:
+			return self._result
+
+		killed = False
+
+		if self.timeout is not None:
+			# Should the watchdog in the child fail to fire, e.g. if signals are blocked, kill it from here.
+			deadline = self._started + self.timeout + _KILL_GRACE_PERIOD
+			ready, _, _ = select.select([self._read_fd], [], [], max(deadline - time.monotonic(), 0))
+			if not ready:
+				os.kill(self.pid, signal.SIGKILL)
+				killed = True
+
+		with os.fdopen(self._read_fd, "rb") as fp:
+			data = fp.read()
+
+		_, status = os.waitpid(self.pid, 0)
+
+		stacks = ''
+		if self._stack_file is not None:
+			self._stack_file.seek(0)
+			stacks = self._stack_file.read().decode("UTF-8", errors="replace")
+			self._stack_file.close()
+
+		if data:
+			self._result = pickle.loads(data)  # nosec: B301
+		elif killed or stacks:
+			assert self.timeout is not None
+			message = f"Importing {self.module!r} timed out after {self.timeout:g} seconds.\n"
+			if stacks:
+				message += f"\n{stacks}"
+			self._result = Error(self.module, message, message, self.timeout)
+		else:
+			# The child exited without reporting, e.g. sys.exit() or a crash in an extension module.
+			message = f"The process importing {self.module!r} exited unexpectedly ({_describe_status(status)}).\n"
+			self._result = Error(self.module, message, message)
+
+		return self._result
+
+	def cancel(self) -> None:
+		"""
+		Kill the child process if its result has not been collected, and wait for it to exit.
+
+		Afterwards :meth:`~.result` returns an :class:`~.Error`.
+		"""
+
+		if self._result is not None:
+			return
+
+		try:
+			os.kill(self.pid, signal.SIGKILL)
+		except ProcessLookupError:  # pragma: no cover
+			pass
+
+		os.close(self._read_fd)
+		os.waitpid(self.pid, 0)
+
+		if self._stack_file is not None:
+			self._stack_file.close()
+
+		message = f"Checking {self.module!r} was cancelled.\n"
+		self._result = Error(self.module, message, message)
+
+
+# The time to wait, after the timeout expires, for the child process to exit before killing it.
+_KILL_GRACE_PERIOD = 5
+
+
+def _describe_status(status: int) -> str:
+	if os.WIFSIGNALED(status):
+		return f"killed by signal {os.WTERMSIG(status)}"
+	else:
+		return f"exit code {os.WEXITSTATUS(status)}"
+
+
+class WarmTemplate:
+	"""
+	Checks each module in a child process forked from the current process,
+	after importing a set of shared dependencies in the current process.
+
+	Each check is isolated from the others,
+	but only has to pay the cost of importing the module itself and dependencies which were not preloaded.
+
+	Only available on platforms which support :func:`os.fork`.
+
+	:param preload: The modules to import before forking.
+
+	:raises OSError: If the platform does not support :func:`os.fork`.
+	"""  # noqa: D400
+
+	def __init__(self, preload: Iterable[str] = ()):
+		if not hasattr(os, "fork"):  # pragma: no cover (!Windows)
+			raise OSError("Fork-based isolation is not supported on this platform.")
+
+		#: The modules to import before forking.
+		self.preload: List[str] = list(preload)
+
+		#: The modules from :attr:`~.preload` which could not be imported.
+		self.failed: List[str] = []
+
+		self._warm = False
+		self._running: List[ForkedCheck] = []
+
+	def warm(self) -> None:
+		"""
+		Import the modules in :attr:`~.preload`, if they have not already been imported.
+
+		Modules which cannot be imported are added to :attr:`~.failed`,
+		and will be imported (and fail) in the child processes instead.
+		"""
+
+		if self._warm:
+			return
+
+		for module in self.preload:
+			with redirect_output(combine=True):
+				try:
+					importlib.import_module(module)
+				except Exception:
+					self.failed.append(module)
+
+		self._warm = True
+
+	def check(
+			self,
+			module: str,
+			combine_output: bool = False,
+			check: Callable[..., Union[OK, Error, LazyError]] = check_module,
+			timeout: Optional[float] = None,
+			) -> ForkedCheck:
+		"""
+		Start checking ``module`` in a forked child process.
+
+		:param module:
+		:param combine_output: If :py:obj:`True` ``stderr`` is combined with ``stdout``.
+		:param check: The function to check the module with in the child process.
+		:param timeout: The maximum time, in seconds, the check may take.
+		"""
+
+		self.warm()
+
+		forked = ForkedCheck(module, combine_output, check, timeout)
+		self._running = [running for running in self._running if running._result is None]
+		self._running.append(forked)
+
+		return forked
+
+	def cancel(self) -> None:
+		"""
+		Kill the child processes whose results have not been collected, such as when checking stops early.
+		"""
+
+		for forked in self._running:
+			forked.cancel()
+
+		self._running.clear()
+
+
+class ModuleSnapshot:
+	"""
+	Context manager which records the state of the import system on entry, and restores it on exit.
+
+	Modules imported within the context are removed from :py:obj:`sys.modules`,
+	along with any references to them from packages which were already imported,
+	and :py:obj:`sys.path`, :py:obj:`sys.meta_path`, :py:obj:`sys.path_hooks`
+	and :py:obj:`sys.path_importer_cache` are restored.
+	Modules which were replaced within the context are put back.
+
+	This isolates imports from one another within a single process, much more cheaply than starting a new process,
+	although changes the imported code makes to other modules (such as registering plugins) are not undone.
+	"""
+
+	def __init__(self) -> None:
+		self._modules: Dict[str, Any] = {}
+		self._path: List[str] = []
+		self._meta_path: List[Any] = []
+		self._path_hooks: List[Any] = []
+		self._path_importer_cache: Dict[str, Any] = {}
+
+	def __enter__(self) -> "ModuleSnapshot":
+		self._modules = sys.modules.copy()
+		self._path = sys.path.copy()
+		self._meta_path = sys.meta_path.copy()
+		self._path_hooks = sys.path_hooks.copy()
+		self._path_importer_cache = sys.path_importer_cache.copy()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.restore()
+
+	def restore(self) -> None:
+		"""
+		Restore the state of the import system to that when the context was entered.
+		"""
+
+		for name in [name for name in sys.modules if name not in self._modules]:
+			module = sys.modules.pop(name)
+
+			# Otherwise 'from package import module' would find the stale module without importing it again.
+			parent_name, _, child = name.rpartition('.')
+			parent = self._modules.get(parent_name)
+			if parent is not None and getattr(parent, child, None) is module:
+				delattr(parent, child)
+
+		for name, module in self._modules.items():
+			if sys.modules.get(name) is not module:
+				sys.modules[name] = module
+
+		# The lists and dicts are modified in place, as other code may hold references to them.
+		sys.path[:] = self._path
+		sys.meta_path[:] = self._meta_path
+		sys.path_hooks[:] = self._path_hooks
+		sys.path_importer_cache.clear()
+		sys.path_importer_cache.update(self._path_importer_cache)
+
+
+def check_in_snapshot(
+		check: Callable[..., Union[OK, Error, LazyError]],
+		module: str,
+		*args,
+		**kwargs,
+		) -> Union[OK, Error, LazyError]:
+	r"""
+	Check ``module`` with ``check``, then undo the changes the import made to the import system
+	with a :class:`~.ModuleSnapshot`.
+
+	Each module is therefore checked as though none of the other modules had been imported before it.
+
+	:param check: The function to check the module with, such as :func:`importcheck.check_module`.
+	:param module:
+	:param \*args: Additional positional arguments passed to ``check``.
+	:param \*\*kwargs: Keyword arguments passed to ``check``.
+	"""  # noqa: D400
+
+	with ModuleSnapshot():
+		return check(module, *args, **kwargs)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+#
+#  profiling.py
+"""
+Profile the time taken by nested imports while checking modules.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import contextlib
+import importlib.machinery
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+__all__ = ("ProfileNode", "ImportProfile")
+
+
+class ProfileNode:
+	"""
+	A module in the tree of imports recorded by an :class:`~.ImportProfile`.
+
+	The same module appears once under each distinct chain of imports which led to it being imported.
+
+	:param name: The name of the module.
+	"""
+
+	def __init__(self, name: str):
+
+		#: The name of the module.
+		self.name: str = name
+
+		#: The time spent executing the module itself, excluding the modules it imported, in seconds.
+		self.self_time: float = 0.0
+
+		#: The time taken to import the module, including the modules it imported, in seconds.
+		self.cumulative_time: float = 0.0
+
+		#: The number of times the module was imported through this chain of imports.
+		self.count: int = 0
+
+		#: Mapping of the names of the modules imported by this module to their nodes.
+		self.children: Dict[str, ProfileNode] = {}
+
+	def walk(self, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], "ProfileNode"]]:
+		"""
+		Returns an iterator over this node's descendants, depth first,
+		as 2-element tuples of the chain of module names leading to the node, and the node.
+
+		Children are ordered by decreasing cumulative time.
+
+		:param path: The chain of module names leading to this node.
+		"""  # noqa: D400
+
+		for child in sorted(self.children.values(), key=lambda node: node.cumulative_time, reverse=True):
+			child_path = (*path, child.name)
+			yield child_path, child
+			yield from child.walk(child_path)
+
+	def __repr__(self) -> str:
+		return (
+				f"<{type(self).__name__}({self.name!r}, "
+				f"self_time={self.self_time}, cumulative_time={self.cumulative_time})>"
+				)
+
+
+class ImportProfile:
+	"""
+	Records the time taken by each import, and the imports nested within it,
+	like :option:`python -X importtime <-X>`.
+
+	The times recorded for identical chains of imports are added together,
+	so a single profile can be recorded while checking many modules.
+	As with :option:`-X importtime <-X>`, only the first import of each module is timed,
+	unless it is removed from :py:obj:`sys.modules` in between.
+
+	Use :meth:`~.record` to record the imports within a ``with`` block.
+	"""  # noqa: D400
+
+	def __init__(self) -> None:
+
+		#: The root of the tree of imports. Its children are the modules imported directly while recording.
+		self.root: ProfileNode = ProfileNode("<root>")
+
+		# The nodes of the imports in progress, their start times, and the time spent in nested imports.
+		self._stack: List[List[Any]] = []
+		self._thread: Optional[int] = None
+
+	@contextlib.contextmanager
+	def record(self) -> Iterator["ImportProfile"]:
+		"""
+		Context manager to record the imports made in the current thread within the ``with`` block.
+
+		A finder is added to the start of :py:obj:`sys.meta_path`,
+		which times the loaders returned by the other finders.
+		"""
+
+		finder = _ProfilingFinder(self)
+		sys.meta_path.insert(0, finder)
+		self._thread = threading.get_ident()
+
+		try:
+			yield self
+		finally:
+			self._thread = None
+			if finder in sys.meta_path:
+				sys.meta_path.remove(finder)
+
+	def _start(self, name: str) -> None:
+		parent = self._stack[-1][0] if self._stack else self.root
+
+		if name not in parent.children:
+			parent.children[name] = ProfileNode(name)
+
+		self._stack.append([parent.children[name], time.perf_counter(), 0.0])
+
+	def _finish(self, name: str) -> None:
+		if not any(frame[0].name == name for frame in self._stack):
+			return
+
+		# Unwind to the import of ``name``, in case an import was abandoned part way through.
+		while self._stack:
+			node, start, nested = self._stack.pop()
+			elapsed = time.perf_counter() - start
+
+			node.count += 1
+			node.cumulative_time += elapsed
+			node.self_time += elapsed - nested
+
+			if self._stack:
+				self._stack[-1][2] += elapsed
+
+			if node.name == name:
+				break
+
+	@property
+	def total_time(self) -> float:
+		"""
+		The total time taken by the recorded imports, in seconds.
+		"""
+
+		return sum(node.cumulative_time for node in self.root.children.values())
+
+	def format_tree(self, min_time: float = 0.0) -> str:
+		"""
+		Format the tree of imports, with the self and cumulative time of each in milliseconds,
+		in the style of :option:`-X importtime <-X>`.
+
+		:param min_time: Imports with a cumulative time less than this, in seconds, are omitted,
+			along with the imports nested within them.
+		"""  # noqa: D400
+
+		if not self.root.children:
+			return "No imports were recorded."
+
+		lines = ["Import profile:", "self [ms] | cumulative | imported module"]
+
+		for path, node in self.root.walk():
+			if node.cumulative_time < min_time:
+				continue
+			if any(self._node(path[:idx]).cumulative_time < min_time for idx in range(1, len(path))):
+				continue
+
+			indent = "  " * (len(path) - 1)
+			times = f"{node.self_time * 1000:9.1f} | {node.cumulative_time * 1000:10.1f}"
+			lines.append(f"{times} | {indent}{node.name}")
+
+		return '\n'.join(lines)
+
+	def _node(self, path: Sequence[str]) -> ProfileNode:
+		node = self.root
+		for name in path:
+			node = node.children[name]
+		return node
+
+	def to_collapsed(self) -> str:
+		"""
+		Returns the profile in the collapsed stack format used by
+		`FlameGraph <https://github.com/brendangregg/FlameGraph>`_ and compatible tools.
+
+		Each line gives a chain of imports separated by semicolons,
+		followed by the self time of the last import in microseconds.
+		"""  # noqa: D400
+
+		lines = []
+
+		for path, node in self.root.walk():
+			lines.append(f"{';'.join(path)} {round(node.self_time * 1_000_000)}")
+
+		return '\n'.join(lines) + ('\n' if lines else '')
+
+	def to_speedscope(self, name: str = "importcheck") -> Dict[str, Any]:
+		"""
+		Returns the profile in the `speedscope <https://www.speedscope.app/>`_ file format,
+		ready to be serialised as JSON.
+
+		:param name: The name of the profile.
+		"""  # noqa: D400
+
+		# this package
+		from importcheck import __version__
+
+		frames: Dict[str, int] = {}
+		samples: List[List[int]] = []
+		weights: List[int] = []
+
+		for path, node in self.root.walk():
+			samples.append([frames.setdefault(module, len(frames)) for module in path])
+			weights.append(round(node.self_time * 1_000_000))
+
+		return {
+				"$schema": "https://www.speedscope.app/file-format-schema.json",
+				"shared": {"frames": [{"name": module} for module in frames]},
+				"profiles": [{
+						"type": "sampled",
+						"name": name,
+						"unit": "microseconds",
+						"startValue": 0,
+						"endValue": sum(weights),
+						"samples": samples,
+						"weights": weights,
+						}],
+				"name": name,
+				"activeProfileIndex": 0,
+				"exporter": f"importcheck {__version__}",
+				}
+
+
+class _ProfilingFinder:
+	# Finds specs with the other finders on sys.meta_path, and wraps their loaders to time the imports.
+
+	def __init__(self, profile: ImportProfile):
+		self.profile = profile
+
+	def find_spec(
+			self,
+			name: str,
+			path: Optional[Sequence[str]] = None,
+			target: Optional[ModuleType] = None,
+			) -> Optional[importlib.machinery.ModuleSpec]:
+
+		if threading.get_ident() != self.profile._thread:
+			return None
+
+		for finder in sys.meta_path:
+			find_spec = getattr(finder, "find_spec", None)
+			if finder is self or find_spec is None:
+				continue
+
+			spec = find_spec(name, path, target)
+			if spec is not None:
+				break
+		else:
+			return None
+
+		if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+			spec.loader = _TimedLoader(spec.loader, self.profile)
+
+		return spec
+
+	def invalidate_caches(self) -> None:
+		pass
+
+
+class _TimedLoader:
+	# Times creating and executing a module with the wrapped loader.
+	# The module is given the original loader before it is executed, so the code sees no difference.
+
+	def __init__(self, loader: Any, profile: ImportProfile):
+		self.loader = loader
+		self.profile = profile
+
+	def create_module(self, spec: importlib.machinery.ModuleSpec) -> Optional[ModuleType]:
+		self.profile._start(spec.name)
+
+		try:
+			create_module = getattr(self.loader, "create_module", None)
+			return None if create_module is None else create_module(spec)
+		except BaseException:
+			self.profile._finish(spec.name)
+			raise
+
+	def exec_module(self, module: ModuleType) -> None:
+		spec = module.__spec__
+		assert spec is not None
+
+		if spec.loader is self:
+			spec.loader = self.loader
+		if getattr(module, "__loader__", None) is self:
+			module.__loader__ = self.loader
+
+		try:
+			self.loader.exec_module(module)
+		finally:
+			self.profile._finish(spec.name)
+
+	def __getattr__(self, item: str) -> Any:
+		return getattr(self.loader, item)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+#  projects.py
+"""
+Check the modules of many projects, such as those in a monorepo, in a single run.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import os
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+# this package
+from importcheck import discover_modules, evaluate_markers, format_stats, load_toml, paths_to_modules
+
+__all__ = ("Project", "load_projects", "requested_by", "format_projects")
+
+
+class Project(NamedTuple):
+	"""
+	A project with its own ``importcheck`` configuration.
+	"""
+
+	#: The path to the project's configuration file.
+	config_file: str
+
+	#: The modules the project's configuration asks to be checked, in order.
+	modules: List[str]
+
+
+def load_projects(
+		config_files: Iterable[PathLike],
+		exclude: Iterable[str] = (),
+		environment: Optional[Dict[str, str]] = None,
+		) -> List[Project]:
+	"""
+	Load the modules to check for each project from its configuration file.
+
+	Each project's modules are those in its ``always`` list and the ``only_if`` lists whose markers are satisfied
+	(see :func:`importcheck.evaluate_markers`),
+	followed by the packages in its ``recursive`` list and their submodules.
+	Files without an ``importcheck`` table
+	(such as the ``pyproject.toml`` of a project which does not use ``importcheck``) are skipped.
+
+	:param config_files: The paths to the TOML configuration files.
+	:param exclude: Glob patterns for submodules to skip when discovering the ``recursive`` packages,
+		in addition to each project's own ``exclude`` list.
+	:param environment: The environment to evaluate the markers in,
+		such as one returned by :func:`importcheck.interpreters.marker_environment`.
+		By default the markers are evaluated for the current interpreter.
+	"""
+
+	exclude = list(exclude)
+	projects = []
+
+	for config_file in config_files:
+		try:
+			config = load_toml(config_file)
+		except KeyError:
+			continue
+
+		modules = list(paths_to_modules(*evaluate_markers(config, environment)))
+		packages = config.get("recursive", [])
+
+		if packages:
+			modules.extend(discover_modules(*packages, exclude=[*config.get("exclude", []), *exclude]))
+
+		projects.append(Project(os.fspath(config_file), list(dict.fromkeys(modules))))
+
+	return projects
+
+
+def requested_by(projects: Iterable[Project]) -> Dict[str, List[str]]:
+	"""
+	Returns a mapping of the modules requested by any of the given projects
+	to the configuration files of the projects which requested them.
+
+	Each module appears once, in the order it was first requested,
+	so modules shared by several projects are only checked once.
+
+	:param projects:
+	"""  # noqa: D400
+
+	modules: Dict[str, List[str]] = {}
+
+	for project in projects:
+		for module in project.modules:
+			modules.setdefault(module, []).append(project.config_file)
+
+	return modules
+
+
+def format_projects(projects: Iterable[Project], statuses: Mapping[str, int]) -> str:
+	"""
+	Format the results of checking the modules of several projects in a single run,
+	with the number of the project's modules imported successfully and the names of any which failed.
+
+	:param projects:
+	:param statuses: Mapping of module names to their statuses,
+		as yielded by :meth:`ImportChecker.check_modules() <.ImportChecker.check_modules>`.
+	"""  # noqa: D400
+
+	lines = ["Projects:"]
+
+	for project in projects:
+		stats = {"passed": 0, "failed": 0, "over_budget": 0}
+		failed = []
+
+		for module in project.modules:
+			status = statuses.get(module)
+
+			if status == 0:
+				stats["passed"] += 1
+			elif status == 1:
+				stats["failed"] += 1
+				failed.append(module)
+			elif status == 2:
+				stats["over_budget"] += 1
+
+		line = f"{project.config_file}: {format_stats(stats)}"
+		if failed:
+			line += f" Failed: {', '.join(failed)}"
+
+		lines.append(line)
+
+	return '\n'.join(lines)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+#
+#  reporters.py
+"""
+Machine-readable reports of the results of checking modules.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import re
+import socket
+import time
+from typing import IO, Any, Dict, Union
+from xml.etree import ElementTree
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from importcheck import OK, Error, LazyError, OverBudget
+
+__all__ = ("Reporter", "JSONLinesReporter", "JUnitXMLReporter", "result_to_dict")
+
+
+def result_to_dict(result: Union[OK, Error, LazyError, OverBudget], cached: bool = False) -> Dict[str, Any]:
+	"""
+	Convert the result of checking a module into a JSON-serialisable dictionary.
+
+	The ``status`` is one of ``'passed'``, ``'failed'`` or ``'over_budget'``.
+
+	:param result:
+	:param cached: Whether the result was taken from the :class:`~importcheck.cache.ImportCache`.
+	"""
+
+	if isinstance(result, OverBudget):
+		status = "over_budget"
+	else:
+		status = "failed" if result else "passed"
+
+	return {
+			"module": result.module,
+			"status": status,
+			"output": result.stdout if result else '',
+			"duration": result.duration,
+			"memory_peak": result.memory_peak,
+			"rss_delta": result.rss_delta,
+			"imported": None if result.imported is None else list(result.imported),
+			"cached": cached,
+			}
+
+
+_failure_messages = {
+		"failed": "Could not import {!r}",
+		"over_budget": "Importing {!r} exceeded its budget",
+		}
+
+
+class Reporter:
+	"""
+	Base class for reporters, which are notified of the result for each module
+	by :meth:`ImportChecker.check_modules() <importcheck.ImportChecker.check_modules>`.
+	"""  # noqa: D400
+
+	def report(self, result: Union[OK, Error, LazyError, OverBudget], cached: bool = False) -> None:
+		"""
+		Called with the result for each module as soon as it is available.
+
+		:param result:
+		:param cached: Whether the result was taken from the :class:`~importcheck.cache.ImportCache`.
+		"""
+
+	def finish(self) -> None:
+		"""
+		Called once all the modules have been checked.
+		"""
+
+
+class JSONLinesReporter(Reporter):
+	"""
+	Writes a `JSON Lines <https://jsonlines.org/>`_ record for each module to a file,
+	flushing it after each record so the results can be consumed as they arrive.
+
+	Each record is the output of :func:`~.result_to_dict`.
+
+	:param file: The file to write to.
+	"""  # noqa: D400
+
+	def __init__(self, file: IO[str]):
+		#: The file the records are written to.
+		self.file: IO[str] = file
+
+	def report(self, result: Union[OK, Error, LazyError, OverBudget], cached: bool = False) -> None:  # noqa: D102
+		self.file.write(json.dumps(result_to_dict(result, cached)))
+		self.file.write('\n')
+		self.file.flush()
+
+
+_ansi_escape_re = re.compile(r"\x1b(\[[0-?]*[ -/]*[@-~]|[@-Z\\-_])")
+_xml_invalid_re = re.compile(r"[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+def _xml_safe(text: str) -> str:
+	# Removes ANSI escape sequences, and any other characters which are not allowed in XML 1.0.
+	return _xml_invalid_re.sub('', _ansi_escape_re.sub('', text))
+
+
+class JUnitXMLReporter(Reporter):
+	"""
+	Writes a JUnit XML file, with a test case for each module, once all the modules have been checked.
+
+	If a module is reported more than once, such as when re-checked with :option:`--watch`,
+	the latest result replaces the earlier ones.
+
+	:param filename: The file to write to.
+	:param suite_name: The name of the test suite.
+	"""
+
+	def __init__(self, filename: PathLike, suite_name: str = "importcheck"):
+		#: The file to write to.
+		self.filename: PathPlus = PathPlus(filename)
+
+		#: The name of the test suite.
+		self.suite_name: str = suite_name
+
+		self._results: Dict[str, Dict[str, Any]] = {}
+		self._timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+	def report(self, result: Union[OK, Error, LazyError, OverBudget], cached: bool = False) -> None:  # noqa: D102
+		self._results[result.module] = result_to_dict(result, cached)
+
+	def finish(self) -> None:  # noqa: D102
+		records = list(self._results.values())
+		failures = sum(record["status"] != "passed" for record in records)
+
+		suite = ElementTree.Element(
+				"testsuite",
+				name=self.suite_name,
+				tests=str(len(records)),
+				failures=str(failures),
+				errors='0',
+				skipped='0',
+				time=f"{sum(record['duration'] for record in records):.3f}",
+				timestamp=self._timestamp,
+				hostname=socket.gethostname(),
+				)
+
+		for record in records:
+			testcase = ElementTree.SubElement(
+					suite,
+					"testcase",
+					classname=self.suite_name,
+					name=record["module"],
+					time=f"{record['duration']:.3f}",
+					)
+
+			if record["status"] != "passed":
+				failure = ElementTree.SubElement(
+						testcase,
+						"failure",
+						message=_failure_messages[record["status"]].format(record["module"]),
+						)
+				failure.text = _xml_safe(record["output"])
+
+		root = ElementTree.Element("testsuites")
+		root.append(suite)
+
+		self.filename.parent.maybe_make(parents=True)
+		ElementTree.ElementTree(root).write(self.filename, encoding="UTF-8", xml_declaration=True)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+#
+#  sharding.py
+"""
+Split the modules to check between several machines, balanced by how long they took to import before.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import heapq
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from importcheck import format_stats
+
+__all__ = ("Timings", "parse_shard", "shard_modules", "shard_header", "merge_results", "format_merged_results")
+
+_STATUSES = {"passed": 0, "failed": 1, "over_budget": 2}
+
+
+class Timings:
+	"""
+	Records how long each module took to import, so later runs can be split into shards of similar duration.
+
+	The file is meant to be committed to version control,
+	so that every machine checking a shard computes the same split.
+
+	:param filename: The JSON file to store the timings in.
+	"""
+
+	def __init__(self, filename: PathLike):
+
+		#: The file the timings are stored in.
+		self.filename: PathPlus = PathPlus(filename)
+
+		#: Mapping of module names to the time they last took to import, in seconds.
+		self.durations: Dict[str, float] = {}
+
+		if self.filename.is_file():
+			try:
+				self.durations = dict(self.filename.load_json())
+			except (ValueError, TypeError):
+				pass
+
+	def update(self, durations: Mapping[str, float]) -> None:
+		"""
+		Record the durations of the given modules, replacing any earlier durations for them.
+
+		:param durations: Mapping of module names to the time they took to import, in seconds,
+			such as :attr:`ImportChecker.durations <.ImportChecker.durations>`.
+		"""
+
+		self.durations.update(durations)
+
+	def save(self) -> None:
+		"""
+		Write the timings to disk.
+		"""
+
+		self.filename.parent.maybe_make(parents=True)
+		self.filename.dump_json(dict(sorted(self.durations.items())), indent=2)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+	r"""
+	Parse a shard given as ``K/N``, meaning the ``K``\th of ``N`` shards (counting from 1).
+
+	:param shard:
+
+	:returns: ``K`` and ``N``.
+	:raises ValueError: If the shard is not in the form ``K/N``, with ``1 <= K <= N``.
+	"""
+
+	index, _, count = shard.partition('/')
+
+	try:
+		k, n = int(index), int(count)
+	except ValueError:
+		raise ValueError(f"The shard must be given as K/N, not {shard!r}.") from None
+
+	if not 1 <= k <= n:
+		raise ValueError(f"The shard K/N must have 1 <= K <= N, not {shard!r}.")
+
+	return k, n
+
+
+def shard_modules(
+		modules: Iterable[str],
+		index: int,
+		count: int,
+		durations: Optional[Mapping[str, float]] = None,
+		) -> List[str]:
+	r"""
+	Returns the modules in the ``index``\th of ``count`` shards (counting from 1).
+
+	The modules are assigned, longest first, to whichever shard has the shortest total duration so far,
+	using the given historical durations. Modules without a duration are assumed to take the mean of the known
+	durations. If no durations are known, the modules are sorted by name and dealt out to the shards in turn.
+	The split depends only on the modules and durations, so every machine given the same inputs
+	computes the same shards, and each module is in exactly one of them.
+
+	:param modules:
+	:param index: The shard to return.
+	:param count: The number of shards.
+	:param durations: Mapping of module names to the time they took to import, in seconds,
+		as recorded by :class:`~.Timings`.
+
+	:returns: The modules in the shard, in the order they were given.
+	"""
+
+	modules = list(dict.fromkeys(modules))
+	durations = durations or {}
+
+	known = [durations[module] for module in modules if module in durations]
+	default = sum(known) / len(known) if known else 1.0
+
+	def estimate(module: str) -> float:
+		return durations.get(module, default)
+
+	# Heap of (total duration, shard index), so ties go to the lowest shard.
+	totals = [(0.0, shard) for shard in range(count)]
+	assigned: Dict[str, int] = {}
+
+	for module in sorted(modules, key=lambda name: (-estimate(name), name)):
+		total, shard = heapq.heappop(totals)
+		assigned[module] = shard
+		heapq.heappush(totals, (total + estimate(module), shard))
+
+	return [module for module in modules if assigned[module] == index - 1]
+
+
+def shard_header(index: int, count: int, size: int) -> Dict[str, int]:
+	r"""
+	Returns the record written at the start of the JSON Lines results for the ``index``\th of ``count`` shards,
+	which :func:`~.merge_results` uses to check the results from every shard are present and complete.
+
+	:param index: The shard (counting from 1).
+	:param count: The number of shards.
+	:param size: The number of modules in the shard.
+	"""  # noqa: D400
+
+	return {"shard": index, "shards": count, "modules": size}
+
+
+def merge_results(filenames: Iterable[PathLike]) -> Dict[str, Dict[str, Any]]:
+	"""
+	Combine the JSON Lines records written by :class:`~importcheck.reporters.JSONLinesReporter`
+	on each shard into a mapping of module names to their records.
+
+	Each file must start with the record from :func:`~.shard_header`.
+
+	:param filenames:
+
+	:raises ValueError: If the results from any of the shards are missing or incomplete,
+		or a module appears in them more than once.
+	"""  # noqa: D400
+
+	records: Dict[str, Dict[str, Any]] = {}
+	shards: Dict[int, str] = {}
+	count = None
+
+	for filename in map(str, filenames):
+		lines = [json.loads(line) for line in PathPlus(filename).read_lines() if line.strip()]
+
+		if not lines or "shard" not in lines[0]:
+			raise ValueError(f"{filename!r} was not written with --shard.")
+
+		header, *results = lines
+
+		if count is None:
+			count = header["shards"]
+		elif header["shards"] != count:
+			raise ValueError(f"{filename!r} is from a run with {header['shards']} shards, not {count}.")
+
+		shard = f"{header['shard']}/{header['shards']}"
+
+		if header["shard"] in shards:
+			raise ValueError(f"Shard {shard} is in both {shards[header['shard']]!r} and {filename!r}.")
+		shards[header["shard"]] = filename
+
+		if len(results) != header["modules"]:
+			raise ValueError(
+					f"{filename!r} is incomplete, with results for {len(results)} "
+					f"of the {header['modules']} modules in shard {shard}."
+					)
+
+		for record in results:
+			if record["module"] in records:
+				raise ValueError(f"{record['module']!r} appears more than once in the results.")
+			records[record["module"]] = record
+
+	if count is not None:
+		missing = [f"{index}/{count}" for index in range(1, count + 1) if index not in shards]
+		if missing:
+			raise ValueError(f"The results are missing for shard {', '.join(missing)}.")
+
+	return records
+
+
+def format_merged_results(records: Mapping[str, Mapping[str, Any]], show: bool = False) -> Tuple[str, int]:
+	"""
+	Format the records returned by :func:`~.merge_results`,
+	listing the modules which failed or were over budget followed by the number imported successfully.
+
+	:param records:
+	:param show: Whether to include the captured output of failed imports.
+
+	:returns: The formatted results, and the statuses of the modules combined with bitwise OR,
+		in the same way as for a single run.
+	"""  # noqa: D400
+
+	stats = {"passed": 0, "failed": 0, "over_budget": 0}
+	retv = 0
+	lines = []
+
+	for module, record in records.items():
+		status = record["status"]
+		stats[status] += 1
+		retv |= _STATUSES[status]
+
+		if status == "failed":
+			lines.append(f"Failed: {module}")
+			if show and record.get("output"):
+				lines.append(record["output"].rstrip())
+		elif status == "over_budget":
+			lines.append(f"Over budget: {module}")
+
+	if lines:
+		lines.append('')
+
+	lines.append(format_stats(stats))
+
+	return '\n'.join(lines), retv
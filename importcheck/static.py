@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+#
+#  static.py
+"""
+Inspect the source code of modules without importing them.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import ast
+import importlib.machinery
+import operator
+import os
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+if TYPE_CHECKING:
+	# this package
+	from importcheck import OK, Error
+
+__all__ = ("find_module_spec", "find_module_file", "iter_imports", "check_module_static")
+
+
+def find_module_spec(module: str) -> Optional[importlib.machinery.ModuleSpec]:
+	"""
+	Find the spec for ``module`` without importing it or any of its parent packages.
+
+	Unlike :func:`importlib.util.find_spec` no code is executed,
+	as the finders on :py:obj:`sys.meta_path` are queried directly for each component of the dotted name.
+
+	:param module: The dotted name of the module.
+
+	:returns: The module's spec, or :py:obj:`None` if it could not be found.
+	"""
+
+	if module in sys.modules and getattr(sys.modules[module], "__spec__", None) is not None:
+		return sys.modules[module].__spec__
+
+	search_path: Optional[List[str]] = None
+	spec: Optional[importlib.machinery.ModuleSpec] = None
+	parts = module.split('.')
+
+	for idx in range(len(parts)):
+		if idx and search_path is None:
+			# The parent is not a package.
+			return None
+
+		name = '.'.join(parts[:idx + 1])
+
+		for finder in sys.meta_path:
+			find_spec = getattr(finder, "find_spec", None)
+			if find_spec is None:  # pragma: no cover
+				continue
+
+			try:
+				spec = find_spec(name, search_path)
+			except (ImportError, ValueError):  # pragma: no cover
+				spec = None
+
+			if spec is not None:
+				break
+		else:
+			return None
+
+		assert spec is not None
+		search_path = spec.submodule_search_locations
+
+	return spec
+
+
+def find_module_file(module: str) -> Optional[str]:
+	"""
+	Returns the path to the source file for ``module``, without importing it.
+
+	:param module: The dotted name of the module.
+
+	:returns: The filename, or :py:obj:`None` if the module could not be found or does not have a source file.
+	"""
+
+	spec = find_module_spec(module)
+
+	if spec is None or not spec.has_location or not spec.origin:
+		return None
+
+	if not spec.origin.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES)):
+		return None
+
+	return spec.origin
+
+
+def iter_imports(
+		module: str,
+		filename: Optional[str] = None,
+		submodules: bool = False,
+		import_time: bool = False,
+		) -> Iterator[str]:
+	"""
+	Returns an iterator over the absolute names of the modules imported by ``module``.
+
+	Relative imports are resolved against the name of the module.
+
+	:param module: The dotted name of the module.
+	:param filename: The path to the module's source file.
+		If not given it is found with :func:`~.find_module_file`.
+	:param submodules: For ``from X import Y`` statements, whether to also return ``X.Y`` if it is a module.
+		By default only ``X`` is returned.
+	:param import_time: If :py:obj:`True` only imports which may be executed when the module is imported
+		are included, as determined by :func:`~.check_module_static`.
+		Otherwise imports anywhere in the source are included, such as in function bodies.
+	"""
+
+	if filename is None:
+		filename = find_module_file(module)
+		if filename is None:
+			return
+
+	try:
+		with open(filename, "rb") as fp:
+			tree = ast.parse(fp.read(), filename=filename)
+	except (OSError, SyntaxError, ValueError):
+		return
+
+	if filename.rsplit('.', 1)[0].endswith("__init__"):
+		package = module
+	else:
+		package = module.rpartition('.')[0]
+
+	nodes: Iterable[ast.AST]
+
+	if import_time:
+		collector = _ImportCollector()
+		collector.visit_body(tree.body)
+		nodes = collector.imports
+	else:
+		nodes = ast.walk(tree)
+
+	for node in nodes:
+		if isinstance(node, ast.Import):
+			for alias in node.names:
+				yield alias.name
+
+		elif isinstance(node, ast.ImportFrom):
+			if node.level:
+				base = package.split('.') if package else []
+				if node.level > 1:
+					base = base[:-(node.level - 1)]
+				name = '.'.join(base + ([node.module] if node.module else []))
+			else:
+				name = node.module or ''
+
+			if not name:
+				continue
+
+			yield name
+
+			if submodules:
+				for alias in node.names:
+					if alias.name != '*' and find_module_spec(f"{name}.{alias.name}") is not None:
+						yield f"{name}.{alias.name}"
+
+
+class _ImportCollector:
+	"""
+	Collects the import statements in a module which may be executed at import time.
+
+	Imports are skipped if they are guarded by ``try ... except ImportError``, ``if TYPE_CHECKING``,
+	or a condition on :py:obj:`sys.version_info`, :py:obj:`sys.platform` or :py:obj:`os.name`
+	which is false for the current interpreter.
+	"""  # noqa: D400
+
+	def __init__(self) -> None:
+		self.imports: List[Union[ast.Import, ast.ImportFrom]] = []
+
+	def visit_body(self, body: List[ast.stmt]) -> None:
+		for node in body:
+			self.visit(node)
+
+	def visit(self, node: ast.stmt) -> None:
+		if isinstance(node, (ast.Import, ast.ImportFrom)):
+			self.imports.append(node)
+
+		elif isinstance(node, ast.Try):
+			# The handlers are only executed if something goes wrong, so are not checked.
+			if not any(_handles_import_error(handler) for handler in node.handlers):
+				self.visit_body(node.body)
+				self.visit_body(node.orelse)
+			self.visit_body(node.finalbody)
+
+		elif isinstance(node, ast.If):
+			condition = _evaluate_condition(node.test)
+			if condition is not False:
+				self.visit_body(node.body)
+			if condition is not True:
+				self.visit_body(node.orelse)
+
+		elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+			# Not executed at import time.
+			return
+
+		else:
+			for field in ("body", "orelse", "finalbody"):
+				self.visit_body(getattr(node, field, None) or [])
+
+
+def _handles_import_error(handler: ast.ExceptHandler) -> bool:
+	if handler.type is None:
+		return True
+
+	types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+	names = {getattr(t, "id", None) or getattr(t, "attr", None) for t in types}
+	return bool(names & {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"})
+
+
+def _dotted_name(node: ast.expr) -> str:
+	if isinstance(node, ast.Name):
+		return node.id
+	elif isinstance(node, ast.Attribute):
+		return f"{_dotted_name(node.value)}.{node.attr}"
+	else:
+		return ''
+
+
+_UNKNOWN = object()
+
+_OPERATORS = {
+		ast.Lt: operator.lt,
+		ast.LtE: operator.le,
+		ast.Gt: operator.gt,
+		ast.GtE: operator.ge,
+		ast.Eq: operator.eq,
+		ast.NotEq: operator.ne,
+		ast.In: lambda a, b: a in b,
+		ast.NotIn: lambda a, b: a not in b,
+		}
+
+
+def _evaluate_operand(node: ast.expr) -> Any:
+	# Returns the value of a literal, or of an attribute of the interpreter which is known statically,
+	# otherwise _UNKNOWN.
+
+	name = _dotted_name(node)
+	if name in {"sys.version_info", "version_info"}:
+		return sys.version_info
+	elif name.startswith("sys.version_info."):
+		return getattr(sys.version_info, name.rpartition('.')[2], _UNKNOWN)
+	elif name in {"sys.platform", "platform"}:
+		return sys.platform
+	elif name == "os.name":
+		return os.name
+
+	if isinstance(node, ast.Subscript):
+		value = _evaluate_operand(node.value)
+		if value is _UNKNOWN:
+			return _UNKNOWN
+		try:
+			return value[_evaluate_slice(node.slice)]
+		except (ValueError, TypeError, SyntaxError, IndexError, KeyError):
+			return _UNKNOWN
+
+	if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and not node.keywords:
+		# e.g. sys.platform.startswith("win")
+		value = _evaluate_operand(node.func.value)
+		args = [_evaluate_operand(arg) for arg in node.args]
+		if isinstance(value, str) and node.func.attr in {"startswith", "endswith"} and _UNKNOWN not in args:
+			try:
+				return getattr(value, node.func.attr)(*args)
+			except TypeError:
+				return _UNKNOWN
+		return _UNKNOWN
+
+	try:
+		return ast.literal_eval(node)
+	except (ValueError, TypeError, SyntaxError):
+		return _UNKNOWN
+
+
+def _evaluate_slice(node: Any) -> Any:
+	if isinstance(node, ast.Slice):
+		parts = (node.lower, node.upper, node.step)
+		return slice(*(None if part is None else ast.literal_eval(part) for part in parts))
+	elif sys.version_info < (3, 9) and isinstance(node, ast.Index):  # pragma: no cover (py39+)
+		return ast.literal_eval(node.value)
+	else:
+		return ast.literal_eval(node)
+
+
+def _evaluate_condition(test: ast.expr) -> Optional[bool]:
+	# Returns the value of simple conditions which are known statically, otherwise None.
+
+	if _dotted_name(test) in {"TYPE_CHECKING", "typing.TYPE_CHECKING"}:
+		return False
+
+	if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+		value = _evaluate_condition(test.operand)
+		return None if value is None else not value
+
+	if isinstance(test, ast.BoolOp):
+		values = [_evaluate_condition(operand) for operand in test.values]
+		if isinstance(test.op, ast.And):
+			if False in values:
+				return False
+			elif all(values):
+				return True
+		else:
+			if True in values:
+				return True
+			elif all(value is False for value in values):
+				return False
+		return None
+
+	if isinstance(test, ast.Compare):
+		operands = [_evaluate_operand(node) for node in (test.left, *test.comparators)]
+		if _UNKNOWN in operands:
+			return None
+
+		result = True
+		for op_type, left, right in zip(test.ops, operands, operands[1:]):
+			op = _OPERATORS.get(type(op_type))
+			if op is None:
+				return None
+			try:
+				result = result and bool(op(left, right))
+			except TypeError:
+				return None
+		return result
+
+	value = _evaluate_operand(test)
+	return None if value is _UNKNOWN else bool(value)
+
+
+def check_module_static(module: str, combine_output: bool = False) -> "Union[OK, Error]":
+	"""
+	Check that ``module`` and the modules it imports can be found, without executing any code.
+
+	The module's source is parsed, and the targets of its ``import`` and ``from ... import`` statements
+	are located with :func:`~.find_module_spec`.
+	For ``from package import name`` the name must also be either a submodule of the package
+	or bound in the package's ``__init__``.
+	Imports which are guarded by ``try ... except ImportError``, ``if TYPE_CHECKING``,
+	or by version or platform checks which are false for the current interpreter are skipped.
+
+	This is much faster than :func:`importcheck.check_module`, but cannot detect errors
+	which only occur when the code is executed.
+
+	:param module:
+	:param combine_output: If :py:obj:`True` the output is also included in ``stdout``.
+		Otherwise ``stdout`` is empty.
+
+	:returns: An :class:`~.OK` or :class:`~.Error` object, in the same form as :func:`importcheck.check_module`.
+	"""
+
+	# this package
+	from importcheck import OK, Error
+
+	start = time.perf_counter()
+	output = _check_module_static(module)
+	duration = time.perf_counter() - start
+
+	if output:
+		return Error(module, output if combine_output else '', output, duration)
+	else:
+		return OK(module, duration)
+
+
+def _check_module_static(module: str) -> str:
+	# Returns the error message, or an empty string if the imports were all resolved.
+
+	spec = find_module_spec(module)
+
+	if spec is None:
+		return f"ModuleNotFoundError: No module named {module!r}\n"
+
+	filename = find_module_file(module)
+	if filename is None:
+		# Builtin, extension, or namespace module; there is nothing to parse.
+		return ''
+
+	try:
+		with open(filename, "rb") as fp:
+			source = fp.read()
+		tree = ast.parse(source, filename=filename)
+	except SyntaxError as e:
+		return ''.join(traceback.format_exception_only(type(e), e))
+	except (OSError, ValueError) as e:
+		return f"{type(e).__name__}: {e}\n"
+
+	if spec.submodule_search_locations is not None:
+		package = module
+	else:
+		package = module.rpartition('.')[0]
+
+	collector = _ImportCollector()
+	collector.visit_body(tree.body)
+	lines = source.decode("UTF-8", errors="replace").splitlines()
+	errors = []
+	bound_names: Dict[str, Optional[Set[str]]] = {}
+
+	for node in collector.imports:
+		missing: List[str] = []
+
+		if isinstance(node, ast.Import):
+			missing.extend(alias.name for alias in node.names if find_module_spec(alias.name) is None)
+
+		elif node.level:
+			base = package.split('.') if package else []
+			if node.level > len(base):
+				errors.append(_format_static_error(
+						filename, node, lines, "ImportError: attempted relative import beyond top-level package"
+						))
+				continue
+
+			base = base[:len(base) - (node.level - 1)]
+			name = '.'.join(base + ([node.module] if node.module else []))
+
+			if find_module_spec(name) is None:
+				missing.append(name)
+			else:
+				errors.extend(_check_imported_names(name, node, filename, lines, bound_names))
+
+		elif node.module is not None:
+			if find_module_spec(node.module) is None:
+				missing.append(node.module)
+			else:
+				errors.extend(_check_imported_names(node.module, node, filename, lines, bound_names))
+
+		for name in missing:
+			errors.append(_format_static_error(
+					filename, node, lines, f"ModuleNotFoundError: No module named {name!r}"
+					))
+
+	return ''.join(errors)
+
+
+def _check_imported_names(
+		package: str,
+		node: ast.ImportFrom,
+		filename: str,
+		lines: List[str],
+		bound_names: Dict[str, Optional[Set[str]]],
+		) -> Iterator[str]:
+	# For ``from package import name``, yields an error for each name which is
+	# neither a submodule of the package nor bound in its ``__init__``.
+	# Only packages are checked, as the names in other modules may come from extension modules or star imports.
+
+	spec = find_module_spec(package)
+	if spec is None or spec.submodule_search_locations is None:
+		return
+
+	init_file = find_module_file(package)
+	if init_file is None and spec.origin is not None and spec.has_location:
+		# e.g. a compiled __init__; its names cannot be determined.
+		return
+
+	if package not in bound_names:
+		bound_names[package] = _module_level_names(init_file) if init_file is not None else set()
+
+	names = bound_names[package]
+	if names is None:
+		return
+
+	for alias in node.names:
+		if alias.name == '*' or alias.name in names or find_module_spec(f"{package}.{alias.name}") is not None:
+			continue
+
+		location = init_file or "unknown location"
+		message = f"ImportError: cannot import name {alias.name!r} from {package!r} ({location})"
+		yield _format_static_error(filename, node, lines, message)
+
+
+def _module_level_names(filename: str) -> Optional[Set[str]]:
+	# Returns the names bound at the top level of the module,
+	# or None if they cannot be determined statically (star imports, module __getattr__, or changes to __path__).
+
+	try:
+		with open(filename, "rb") as fp:
+			tree = ast.parse(fp.read(), filename=filename)
+	except (OSError, SyntaxError, ValueError):
+		return None
+
+	names: Set[str] = set()
+	todo: List[ast.AST] = list(tree.body)
+
+	while todo:
+		node = todo.pop()
+
+		if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+			# The bodies are not executed at import time, or have their own scope.
+			names.add(node.name)
+			continue
+		elif isinstance(node, ast.Lambda):
+			continue
+		elif isinstance(node, (ast.Import, ast.ImportFrom)):
+			for alias in node.names:
+				if alias.name == '*':
+					return None
+				names.add(alias.asname or alias.name.partition('.')[0])
+		elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+			names.add(node.id)
+
+		todo.extend(ast.iter_child_nodes(node))
+
+	if names & {"__getattr__", "__path__"}:
+		return None
+
+	return names
+
+
+def _format_static_error(
+		filename: str,
+		node: ast.stmt,
+		lines: List[str],
+		message: str,
+		) -> str:
+
+	buf = [f'  File "{filename}", line {node.lineno}, in <module>\n']
+	if 0 < node.lineno <= len(lines):
+		buf.append(f"    {lines[node.lineno - 1].strip()}\n")
+	buf.append(f"{message}\n")
+	return ''.join(buf)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+#
+#  watch.py
+"""
+Watch modules' source files, and determine which modules to check again when they change.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import collections
+import importlib
+import importlib.util
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# this package
+from importcheck.graph import build_import_graph, module_dependencies, topological_order
+from importcheck.static import find_module_file
+
+__all__ = ("Watcher", "forget_modules")
+
+
+class Watcher:
+	"""
+	Watches the source files of modules for changes.
+
+	The files are polled for changes to their modification time or size,
+	which needs no dependencies and works on every platform and filesystem.
+	Polling even tens of thousands of files takes a few milliseconds.
+
+	:param modules: The modules to watch.
+	:param interval: The time, in seconds, to wait between polls.
+	:param graph: The graph of imports between the modules,
+		as returned by :func:`importcheck.graph.build_import_graph`.
+		If not given it is built from the modules' source code.
+	"""
+
+	def __init__(
+			self,
+			modules: Iterable[str],
+			*,
+			interval: float = 0.2,
+			graph: Optional[Mapping[str, List[str]]] = None,
+			):
+
+		#: The modules being watched.
+		self.modules: List[str] = list(modules)
+
+		#: The time, in seconds, to wait between polls.
+		self.interval: float = interval
+
+		#: The graph of imports between the modules, which is updated as their source files change.
+		self.graph: Dict[str, List[str]] = dict(graph) if graph is not None else build_import_graph(self.modules)
+
+		self._known: Set[str] = set(self.modules)
+		self._files: Dict[str, str] = {}
+
+		for module in self.modules:
+			filename = find_module_file(module)
+			if filename is not None:
+				self._files[module] = filename
+
+		self._stats = {module: _stat(filename) for module, filename in self._files.items()}
+
+	def poll(self) -> List[str]:
+		"""
+		Returns the modules whose source files have changed since the last poll,
+		or since the :class:`~.Watcher` was created.
+		"""  # noqa: D400
+
+		changed = []
+
+		for module, filename in self._files.items():
+			stat = _stat(filename)
+			if stat != self._stats[module]:
+				self._stats[module] = stat
+				changed.append(module)
+
+		for module in changed:
+			# The module's imports may have changed too.
+			self.graph[module] = module_dependencies(module, self._known)
+			_discard_bytecode(self._files[module])
+
+		return changed
+
+	def dependents(self, modules: Iterable[str]) -> List[str]:
+		"""
+		Returns the given modules, and the watched modules which depend on them directly or indirectly.
+
+		Each module comes after the modules it depends on, so a change which breaks a module is reported
+		for that module before those which import it. Otherwise the order the modules are being watched in is kept.
+
+		:param modules:
+		"""  # noqa: D400
+
+		reverse: Dict[str, List[str]] = collections.defaultdict(list)
+		for module, dependencies in self.graph.items():
+			for dependency in dependencies:
+				reverse[dependency].append(module)
+
+		affected = set(modules)
+		stack = list(affected)
+
+		while stack:
+			for dependent in reverse[stack.pop()]:
+				if dependent not in affected:
+					affected.add(dependent)
+					stack.append(dependent)
+
+		graph = {module: self.graph.get(module, []) for module in self.modules if module in affected}
+		return topological_order(graph)
+
+	def wait(self) -> List[str]:
+		"""
+		Wait until any of the source files change,
+		and return the modules which changed along with the modules which depend on them.
+
+		Changes made in quick succession, such as by an editor saving several files at once,
+		are returned together.
+		"""  # noqa: D400
+
+		while True:
+			changed = self.poll()
+
+			if changed:
+				time.sleep(min(self.interval, 0.05))
+				changed.extend(self.poll())
+				return self.dependents(changed)
+
+			time.sleep(self.interval)
+
+
+def forget_modules(modules: Iterable[str]) -> None:
+	"""
+	Remove the given modules from :py:obj:`sys.modules`, and from the packages which contain them,
+	so they are executed again when next imported.
+
+	:param modules:
+	"""
+
+	for name in modules:
+		module = sys.modules.pop(name, None)
+
+		# Otherwise 'from package import module' would find the stale module without importing it again.
+		parent_name, _, child = name.rpartition('.')
+		parent = sys.modules.get(parent_name)
+		if module is not None and parent is not None and getattr(parent, child, None) is module:
+			delattr(parent, child)
+
+	importlib.invalidate_caches()
+
+
+def _stat(filename: str) -> Optional[Tuple[int, int]]:
+	try:
+		stat = os.stat(filename)
+	except OSError:
+		return None
+
+	return stat.st_mtime_ns, stat.st_size
+
+
+def _discard_bytecode(filename: str) -> None:
+	# Bytecode records the source's modification time to the second,
+	# so would not be invalidated by an edit which leaves the file the same size within the same second.
+
+	try:
+		os.unlink(importlib.util.cache_from_source(filename))
+	except (OSError, NotImplementedError, ValueError):
+		pass
@@ -1,3 +1,8 @@
+# stdlib
+import importlib
+import sys
+from typing import Callable, Iterator, List, Mapping, Sequence, Union
+
 # 3rd party
 import pytest
 from domdf_python_tools.paths import PathPlus
@@ -5,6 +10,56 @@ from domdf_python_tools.paths import PathPlus
 pytest_plugins = ("coincidence", )
 
 
+@pytest.fixture()
+def make_package(tmp_pathplus: PathPlus) -> Iterator[Callable[..., PathPlus]]:
+	"""
+	Returns a function which creates a package in a temporary directory,
+	and adds the directory to :py:obj:`sys.path`.
+
+	The function takes the name of the package, a mapping of filenames within the package to their contents
+	(as a string or a list of lines), and optionally the subdirectory of the temporary directory to create it in.
+
+	Once the test finishes the directories are removed from :py:obj:`sys.path`,
+	and the packages and their submodules from :py:obj:`sys.modules`.
+	"""
+
+	names: List[str] = []
+	paths: List[str] = []
+
+	def make(name: str, files: Mapping[str, Union[str, Sequence[str]]], directory: str = '') -> PathPlus:
+		root = tmp_pathplus / directory if directory else tmp_pathplus
+		package = root / name
+		package.maybe_make(parents=True)
+
+		for filename, content in files.items():
+			(package / filename).parent.maybe_make(parents=True)
+			if isinstance(content, str):
+				(package / filename).write_text(content)
+			else:
+				(package / filename).write_lines(content)
+
+		names.append(name)
+		if str(root) not in paths:
+			paths.append(str(root))
+			sys.path.insert(0, str(root))
+
+		importlib.invalidate_caches()
+		return package
+
+	yield make
+
+	for module in list(sys.modules):
+		if any(module == name or module.startswith(f"{name}.") for name in names):
+			del sys.modules[module]
+
+	for path in paths:
+		while path in sys.path:
+			sys.path.remove(path)
+		sys.path_importer_cache.pop(path, None)
+
+	importlib.invalidate_caches()
+
+
 @pytest.fixture()
 def demo_environment(tmp_pathplus: PathPlus) -> PathPlus:
 
@@ -0,0 +1,168 @@
+# stdlib
+import sys
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import ImportChecker
+from importcheck.advisor import (
+		LazyImportAdvice,
+		ModuleLevelImport,
+		advise_lazy_imports,
+		find_module_level_imports,
+		format_advice
+		)
+from importcheck.profiling import ImportProfile, ProfileNode
+
+SOURCE = '''\
+from __future__ import print_function
+import json
+import os.path
+import collections as col
+from typing import TYPE_CHECKING, List
+from . import sibling
+from .sibling import helper
+from decimal import *
+from fractions import Fraction
+
+if TYPE_CHECKING:
+	import numbers
+
+try:
+	import i_dont_exist
+except ImportError:
+	i_dont_exist = None
+
+__all__ = ["helper"]
+
+
+def function(value: List[int] = (), fraction: Fraction = None) -> None:
+	return json.dumps(value), os.path.join('a', 'b'), sibling
+
+
+class Thing:
+	counter = col.Counter()
+
+	def method(self):
+		import re
+		return re
+'''
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_advisor_pkg",
+			{"__init__.py": '', "sibling.py": ["def helper(): pass"], "mod.py": SOURCE},
+			)
+
+
+def test_find_module_level_imports(demo_package: PathPlus) -> None:
+	statements = {statement.target: statement for statement in find_module_level_imports("demo_advisor_pkg.mod")}
+
+	assert list(statements) == [
+			"__future__",
+			"json",
+			"os.path",
+			"collections",
+			"typing",
+			"demo_advisor_pkg",
+			"demo_advisor_pkg.sibling",
+			"decimal",
+			"fractions",
+			]
+
+	assert statements["json"] == ModuleLevelImport(
+			"demo_advisor_pkg.mod",
+			2,
+			"json",
+			("json", ),
+			("json", ),
+			True,
+			"only used inside functions",
+			)
+	assert statements["os.path"].imported == ("os", "os.path")
+	assert statements["os.path"].names == ("os", )
+	assert statements["os.path"].deferrable
+
+	assert statements["collections"].names == ("col", )
+	assert statements["collections"].reason == "'col' is used at module level on line 27"
+
+	assert statements["typing"].reason == "'TYPE_CHECKING' is used at module level on line 11"
+
+	# Annotations are evaluated when the function is defined.
+	assert statements["fractions"].reason == "'Fraction' is used at module level on line 22"
+
+	assert statements["demo_advisor_pkg"].imported == ("demo_advisor_pkg", "demo_advisor_pkg.sibling")
+	assert statements["demo_advisor_pkg"].deferrable
+	assert statements["demo_advisor_pkg.sibling"].reason == "'helper' is re-exported in __all__"
+	assert statements["decimal"].reason == "star import"
+
+	assert statements["__future__"].reason == "not used in the module"
+
+	assert find_module_level_imports("i_dont_exist") == []
+
+
+def _node(name: str, cumulative_time: float, count: int = 1, *children: ProfileNode) -> ProfileNode:
+	node = ProfileNode(name)
+	node.cumulative_time = cumulative_time
+	node.count = count
+	node.children = {child.name: child for child in children}
+	return node
+
+
+def test_advise_lazy_imports(demo_package: PathPlus) -> None:
+	profile = ImportProfile()
+	profile.root.children["demo_advisor_pkg.mod"] = _node(
+			"demo_advisor_pkg.mod",
+			0.2,
+			2,
+			_node("json", 0.02, 2),
+			_node("os", 0.001),
+			_node("collections", 0.05),
+			_node("demo_advisor_pkg.sibling", 0.0001),
+			)
+
+	advice = advise_lazy_imports(["demo_advisor_pkg.mod", "demo_advisor_pkg"], profile, min_time=0.005)
+
+	assert [(item.statement.target, item.cost) for item in advice] == [("collections", 0.05), ("json", 0.01)]
+
+	assert format_advice(advice) == (
+			"Expensive module-level imports:\n"
+			"   50.0 ms demo_advisor_pkg.mod:4 collections -- needed at import time "
+			"('col' is used at module level on line 27)\n"
+			"   10.0 ms demo_advisor_pkg.mod:2 json -- could be deferred (only used inside functions)\n"
+			"Deferring these imports could save up to 10.0 ms."
+			)
+
+	assert format_advice([]) == "No expensive module-level imports were found."
+
+
+def test_advise_lazy_imports_measured(demo_package: PathPlus) -> None:
+	(demo_package / "slow.py").write_lines(["import time", "time.sleep(0.02)"])
+	(demo_package / "user.py").write_lines([
+			"import demo_advisor_pkg.slow",
+			"def f():",
+			"	return demo_advisor_pkg.slow",
+			])
+
+	profile = ImportProfile()
+
+	try:
+		modules = ["demo_advisor_pkg.slow", "demo_advisor_pkg.user"]
+		checker = ImportChecker(modules, isolation="snapshot", profile=profile)
+		list(checker.check_modules())
+	finally:
+		sys.modules.pop("demo_advisor_pkg.slow", None)
+		sys.modules.pop("demo_advisor_pkg.user", None)
+
+	advice = advise_lazy_imports(checker.modules, profile, min_time=0.01)
+	assert len(advice) == 1
+	assert isinstance(advice[0], LazyImportAdvice)
+	assert advice[0].statement.module == "demo_advisor_pkg.user"
+	assert advice[0].statement.target == "demo_advisor_pkg.slow"
+	assert advice[0].statement.deferrable
+	assert advice[0].cost >= 0.02
@@ -0,0 +1,133 @@
+# stdlib
+import zipfile
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import Budget
+from importcheck.archives import ArchiveResult, archive_modules, check_archive, check_archives
+
+
+def make_wheel(directory: PathPlus, name: str, files: dict) -> PathPlus:
+	filename = directory / f"{name}-1.0-py3-none-any.whl"
+	record = f"{name}-1.0.dist-info/RECORD"
+
+	with zipfile.ZipFile(filename, 'w') as archive:
+		for path, content in files.items():
+			archive.writestr(path, content)
+		archive.writestr(record, ''.join(f"{path},,\n" for path in [*files, record]))
+
+	return filename
+
+
+def test_archive_modules(tmp_pathplus: PathPlus) -> None:
+	wheel = make_wheel(
+			tmp_pathplus,
+			"demo_archive",
+			{
+					"demo_archive/__init__.py": '',
+					"demo_archive/sub/__init__.py": '',
+					"demo_archive/sub/mod.py": '',
+					"demo_archive/__main__.py": '',
+					"demo_archive/_speedups.cpython-39-x86_64-linux-gnu.so": '',
+					"demo_archive/data.json": '',
+					"demo_archive/not-a-module.py": '',
+					"demo_archive.py": '',
+					"demo_archive-1.0.data/scripts/tool.py": '',
+					"demo_archive-1.0.dist-info/METADATA": '',
+					},
+			)
+
+	with zipfile.ZipFile(wheel, 'a') as archive:
+		# Not listed in RECORD.
+		archive.writestr("demo_archive/unlisted.py", '')
+
+	assert archive_modules(wheel) == [
+			"demo_archive",
+			"demo_archive.__main__",
+			"demo_archive.sub",
+			"demo_archive.sub.mod",
+			]
+
+	with zipfile.ZipFile(tmp_pathplus / "app.pyz", 'w') as archive:
+		archive.writestr("__main__.py", "import app")
+		archive.writestr("app/__init__.py", '')
+		archive.writestr("app/cli.py", '')
+		archive.writestr("helper.py", '')
+
+	assert archive_modules(tmp_pathplus / "app.pyz") == ["app", "app.cli", "helper"]
+
+
+def test_check_archive(tmp_pathplus: PathPlus) -> None:
+	wheel = make_wheel(
+			tmp_pathplus,
+			"demo_archive_check",
+			{
+					"demo_archive_check/__init__.py": "assert '.whl' in __file__",
+					"demo_archive_check/bad.py": "print('hello')\nraise ValueError('oops')",
+					},
+			)
+
+	result = check_archive(wheel, show=True)
+	assert result.archive == str(wheel)
+	assert result.statuses == {"demo_archive_check": 0, "demo_archive_check.bad": 1}
+	assert result.statistics == "1/2 modules imported successfully."
+	assert result.returncode == 0
+	assert result.status == 1
+
+	assert "Checking 'demo_archive_check'" in result.output
+	assert "hello" in result.output
+	assert "ValueError: oops" in result.output
+
+	result = check_archive(wheel, python="false")
+	assert result.statuses == {}
+	assert result.output == "The interpreter exited unexpectedly (exit code 1).\n"
+	assert result.status == 1
+
+
+def test_check_archives(tmp_pathplus: PathPlus) -> None:
+	archives = [
+			make_wheel(tmp_pathplus, f"demo_archives_{idx}", {f"demo_archives_{idx}.py": "import demo_archives_0"})
+			for idx in range(3)
+			]
+
+	results = list(check_archives(archives, jobs=2))
+
+	assert [result.archive for result in results] == list(map(str, archives))
+	assert [result.statuses for result in results] == [
+			{"demo_archives_0": 0},
+			{"demo_archives_1": 1},
+			{"demo_archives_2": 1},
+			]
+
+	assert ArchiveResult("foo.whl", {}, '', "No modules to check.").status == 0
+	assert ArchiveResult("foo.whl", {"foo": 2}, '', '').status == 2
+
+
+def test_check_archive_not_from_cwd(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	wheel = make_wheel(
+			tmp_pathplus,
+			"demo_archive_cwd",
+			{"demo_archive_cwd/__init__.py": "import demo_archive_cwd_helper"},
+			)
+
+	# In the source checkout, but missing from the wheel.
+	(tmp_pathplus / "demo_archive_cwd_helper.py").write_clean("X = 1")
+	monkeypatch.chdir(tmp_pathplus)
+
+	result = check_archive(wheel, show=True)
+	assert result.statuses == {"demo_archive_cwd": 1}
+	assert "No module named 'demo_archive_cwd_helper'" in result.output
+
+
+def test_check_archive_budgets(tmp_pathplus: PathPlus) -> None:
+	wheel = make_wheel(
+			tmp_pathplus,
+			"demo_archive_budget",
+			{"demo_archive_budget/__init__.py": '', "demo_archive_budget/slow.py": "import time\ntime.sleep(0.1)"},
+			)
+
+	result = check_archive(wheel, module_budgets={"*.slow": Budget(max_import_ms=1)})
+	assert result.statuses == {"demo_archive_budget": 0, "demo_archive_budget.slow": 2}
+	assert result.status == 2
@@ -0,0 +1,117 @@
+# stdlib
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import ImportChecker
+from importcheck.cache import FailureHistory, ImportCache
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_cache_pkg",
+			{
+					"__init__.py": '',
+					"a.py": ["import json", "from . import b"],
+					"b.py": ["import collections"],
+					"c.py": ["x = 1"],
+					},
+			directory="src",
+			)
+
+
+def test_cache_key(demo_package: PathPlus, tmp_pathplus: PathPlus) -> None:
+	cache = ImportCache(tmp_pathplus / "cache")
+	key_a, key_b, key_c = (cache.key(f"demo_cache_pkg.{name}") for name in "abc")
+	assert len({key_a, key_b, key_c}) == 3
+	assert cache.key("i_dont_exist") is None
+	assert cache.key("sys") is None
+
+	# Changes to a module imported by 'a' change the key for 'a' but not for 'c'.
+	(demo_package / "b.py").write_lines(["import collections", "y = 2"])
+	cache = ImportCache(tmp_pathplus / "cache")
+	assert cache.key("demo_cache_pkg.a") != key_a
+	assert cache.key("demo_cache_pkg.b") != key_b
+	assert cache.key("demo_cache_pkg.c") == key_c
+
+
+def test_cache_roundtrip(demo_package: PathPlus, tmp_pathplus: PathPlus) -> None:
+	cache = ImportCache(tmp_pathplus / "cache")
+	assert cache.get("demo_cache_pkg.a") is None
+
+	cache.set("demo_cache_pkg.a", 0.5)
+	cache.set("demo_cache_pkg.c", 0.25)
+	cache.set("i_dont_exist", 0.25)
+	cache.save()
+
+	assert (tmp_pathplus / "cache" / ".gitignore").is_file()
+
+	cache = ImportCache(tmp_pathplus / "cache")
+	assert cache.get("demo_cache_pkg.a") == 0.5
+	assert cache.get("demo_cache_pkg.c") == 0.25
+	assert cache.get("i_dont_exist") is None
+
+	cache.discard("demo_cache_pkg.a")
+	assert cache.get("demo_cache_pkg.a") is None
+
+	(demo_package / "c.py").write_lines(["x = 2"])
+	assert ImportCache(tmp_pathplus / "cache").get("demo_cache_pkg.c") is None
+
+	cache.clear()
+	cache.save()
+	assert ImportCache(tmp_pathplus / "cache").get("demo_cache_pkg.c") is None
+
+
+def test_cache_changed_during_run(demo_package: PathPlus, tmp_pathplus: PathPlus) -> None:
+	cache = ImportCache(tmp_pathplus / "cache")
+	assert cache.get("demo_cache_pkg.c") is None
+
+	# Edited while the module is being imported.
+	(demo_package / "c.py").write_lines(["x = 2"])
+
+	cache.set("demo_cache_pkg.c", 0.25)
+	cache.save()
+
+	assert ImportCache(tmp_pathplus / "cache").get("demo_cache_pkg.c") is None
+
+
+def test_importchecker_cache(demo_package: PathPlus, tmp_pathplus: PathPlus) -> None:
+	modules = ["demo_cache_pkg.a", "demo_cache_pkg.c", "i_dont_exist"]
+
+	checker = ImportChecker(modules, cache=ImportCache(tmp_pathplus / "cache"))
+	assert list(checker.check_modules()) == [("demo_cache_pkg.a", 0), ("demo_cache_pkg.c", 0), ("i_dont_exist", 1)]
+	assert not checker._from_cache
+
+	(demo_package / "c.py").write_lines(["x = 2"])
+
+	checker = ImportChecker(modules, cache=ImportCache(tmp_pathplus / "cache"))
+	assert list(checker.check_modules()) == [("demo_cache_pkg.a", 0), ("demo_cache_pkg.c", 0), ("i_dont_exist", 1)]
+	assert checker._from_cache == {"demo_cache_pkg.a"}
+	assert checker.stats == {"passed": 2, "failed": 1, "over_budget": 0}
+
+
+def test_failure_history(tmp_pathplus: PathPlus) -> None:
+	history = FailureHistory(tmp_pathplus / "cache", size=3)
+	assert history.failures == []
+
+	history.update({"a": 1, "b": 0, "c": 1})
+	assert history.failures == ["a", "c"]
+
+	# Modules which pass are removed, new failures go first, and unchecked modules keep their place.
+	history.update({"a": 0, "d": 1, "e": 2})
+	assert history.failures == ["d", "c"]
+
+	history.update({"f": 1, "g": 1})
+	assert history.failures == ["f", "g", "d"]
+
+	history.save()
+	assert (tmp_pathplus / "cache" / ".gitignore").is_file()
+	assert FailureHistory(tmp_pathplus / "cache").failures == ["f", "g", "d"]
+	assert FailureHistory(tmp_pathplus / "cache", size=1).failures == ['f']
+
+	history.filename.write_text("not json")
+	assert FailureHistory(tmp_pathplus / "cache").failures == []
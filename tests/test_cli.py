@@ -1,7 +1,11 @@
 # stdlib
+import json
+import os
 import platform
 import re
-from typing import Tuple
+import sys
+import zipfile
+from typing import Iterator, List, Tuple
 
 # 3rd party
 import click
@@ -20,7 +24,7 @@ from consolekit.testing import CliRunner, Result
 from domdf_python_tools.paths import PathPlus, in_directory
 
 # this package
-from importcheck.__main__ import __version__, main
+from importcheck.__main__ import __version__, _iter_stdin, main
 
 
 def fix_stdout(stdout: str) -> str:
@@ -196,6 +200,266 @@ def test_cli_count_modules_as_args(
 	assert result.exit_code == 0
 
 
+@pytest.mark.usefixtures("errored_environment")
+def test_cli_jobs(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--count", "--no-colour", "--jobs", '2'])
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 1
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+@pytest.mark.usefixtures("errored_environment")
+def test_cli_isolation_fork(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--count", "--no-colour", "--isolation", "fork"])
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 1
+
+
+def test_cli_durations(tmp_pathplus: PathPlus) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=["collections", "importlib", "functools", "--count", "--no-colour", "--durations", '2'],
+				)
+
+	assert not result.stderr
+	assert result.exit_code == 0
+
+	lines = result.stdout.splitlines()
+	assert lines[-5:-3] == ["All 3 modules imported successfully.", '']
+	assert lines[-3] == "Slowest 2 imports:"
+	for line in lines[-2:]:
+		assert re.match(r"^\d+\.\d{3}s (collections|importlib|functools)$", line)
+
+
+def test_cli_cache(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		monkeypatch,
+		) -> None:
+
+	(tmp_pathplus / "demo_cli_cache.py").write_clean("x = 1")
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		args = ["demo_cli_cache.py", "collections", "--cache", "--no-colour"]
+		runner.invoke(main, args=args)
+		result: Result = runner.invoke(main, args=args)
+
+		assert (tmp_pathplus / ".importcheck_cache").is_dir()
+
+		forced: Result = runner.invoke(main, args=[*args, "--force"])
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 0
+	assert "(cached)" not in forced.stdout
+
+
+def test_cli_package(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		monkeypatch,
+		) -> None:
+
+	package = tmp_pathplus / "demo_cli_pkg"
+	(package / "tests").maybe_make(parents=True)
+	(package / "__init__.py").touch()
+	(package / "module.py").touch()
+	(package / "broken.py").write_clean("import i_dont_exist")
+	(package / "tests" / "__init__.py").touch()
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[tool.importcheck]",
+			'recursive = [ "demo_cli_pkg",]',
+			'exclude = [ "*.tests",]',
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--no-colour", "--count"])
+		assert runner.invoke(main, args=["--no-colour", "-p", "demo_cli_pkg", "--exclude", "*.b*"]).exit_code == 0
+		assert runner.invoke(main, args=["--no-colour", "-p", "demo_cli_pkg", "--exclude", "demo*"]).exit_code == 0
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 1
+
+
+@pytest.mark.usefixtures("errored_environment")
+def test_cli_static(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--static", "--show", "--no-colour"])
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 1
+
+
+def test_cli_dependencies(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		monkeypatch,
+		) -> None:
+
+	package = tmp_pathplus / "demo_cli_deps"
+	package.maybe_make()
+	(package / "__init__.py").touch()
+	(package / "_compat.py").write_clean("raise ValueError('broken')")
+	(package / "api.py").write_clean("from ._compat import thing")
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=["demo_cli_deps.api", "demo_cli_deps._compat", "--dependencies", "--no-colour", "--count"],
+				)
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+	assert result.exit_code == 1
+
+
+def test_cli_memory(tmp_pathplus: PathPlus) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["collections", "i_dont_exist", "--no-colour", "--memory", '1'])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	lines = result.stdout.splitlines()
+	assert re.match(r"^Checking 'collections'\.+Passed \(peak .+\)$", lines[2])
+	assert re.match(r"^Checking 'i_dont_exist'\.+Failed \(peak .+\)$", lines[3])
+	assert lines[-3] == "Largest 1 import by peak memory:"
+	assert re.match(r"^peak .+ (collections|i_dont_exist)$", lines[-2])
+
+
+def test_cli_budgets(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[tool.importcheck]",
+			'always = ["collections", "importlib"]',
+			"[tool.importcheck.config]",
+			"max_import_ms = 0",
+			"[tool.importcheck.config.budgets]",
+			'importlib = { max_import_ms = 10000 }',
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--count", "--no-colour"])
+
+	assert not result.stderr
+	assert result.exit_code == 3
+
+	lines = result.stdout.splitlines()
+	assert re.match(r"^Checking 'collections'\.+Over budget \(took .+ ms \(limit 0 ms\)\)$", lines[2])
+	assert re.match(r"^Checking 'importlib'\.+Passed$", lines[3])
+	assert lines[-1] == "1/2 modules imported successfully, 1 over budget."
+	assert "Tip" not in result.stdout
+
+
+def test_cli_max_output(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_noisy_cli.py").write_lines(["print('x' * 1000)", "raise ValueError('oops')"])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=["demo_noisy_cli", "--no-colour", "--show", "--max-output", "20"],
+				)
+
+	assert not result.stderr
+	assert result.exit_code == 1
+	assert 'x' * 20 + "\n[981 characters of output truncated]" in result.stdout
+	assert "ValueError: oops" in result.stdout
+
+
+def test_cli_python(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[tool.importcheck]",
+			'always = ["collections"]',
+			"[tool.importcheck.only_if]",
+			"\"python_version == '2.7'\" = [\"i_dont_exist\"]",
+			"\"python_version >= '3'\" = [\"i_dont_exist_either\"]",
+			# Only applies when the modules are imported by importcheck itself.
+			"[tool.importcheck.config]",
+			"cache = true",
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--no-colour", "--count", "--python", sys.executable])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	lines = fix_stdout(result.stdout).splitlines()
+	assert lines[2].split() == ["Module", sys.executable]
+	assert lines[3].split() == ["collections", "Passed"]
+	assert lines[4].split() == ["i_dont_exist_either", "Failed"]
+	assert lines[6] == f"{sys.executable}: 1/2 modules imported successfully."
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--python", "i-am-not-a-python", "collections"])
+
+	assert result.exit_code == 1
+	assert result.stderr.startswith("Error: Could not run Python interpreter:")
+
+
+def test_cli_reporters(tmp_pathplus: PathPlus) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=[
+						"collections",
+						"i_dont_exist",
+						"--no-colour",
+						"--jsonl",
+						"out.jsonl",
+						"--junit-xml",
+						"out.xml",
+						],
+				)
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	records = [json.loads(line) for line in (tmp_pathplus / "out.jsonl").read_lines() if line]
+	assert [(r["module"], r["status"]) for r in records] == [("collections", "passed"), ("i_dont_exist", "failed")]
+	assert (tmp_pathplus / "out.xml").read_text().count("<testcase") == 2
+
+
 @pytest.mark.skipif(click.__version__.split('.')[0] != '7', reason="Output differs on Click 8")
 def test_cli_help(
 		tmp_pathplus: PathPlus,
@@ -283,6 +547,45 @@ def test_cli_stdin(
 	assert result.exit_code == 0
 
 
+def test_cli_stdin_multiline(
+		tmp_pathplus: PathPlus,
+		advanced_file_regression: AdvancedFileRegressionFixture,
+		monkeypatch,
+		) -> None:
+
+	(tmp_pathplus / "demo_stdin_pkg").maybe_make()
+	(tmp_pathplus / "demo_stdin_pkg" / "__init__.py").touch()
+	(tmp_pathplus / "demo_stdin_pkg" / "module.py").touch()
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=['-', "--no-colour", "--count"],
+				input="collections importlib\n\n  functools  \ndemo_stdin_pkg/module.py\n",
+				)
+
+	assert not result.stderr
+	advanced_file_regression.check(fix_stdout(result.stdout))
+
+
+def test_iter_stdin(monkeypatch) -> None:
+	consumed = []
+
+	def lines() -> Iterator[str]:
+		for line in ["collections importlib\n", '\n', "  functools\tjson \n"]:
+			consumed.append(line)
+			yield line
+
+	monkeypatch.setattr(sys, "stdin", lines())
+
+	words = _iter_stdin()
+	assert next(words) == "collections"
+	assert len(consumed) == 1
+	assert list(words) == ["importlib", "functools", "json"]
+
+
 def test_cli_version(tmp_pathplus: PathPlus) -> None:
 
 	with in_directory(tmp_pathplus):
@@ -292,3 +595,401 @@ def test_cli_version(tmp_pathplus: PathPlus) -> None:
 	assert not result.stderr
 	assert fix_stdout(result.stdout) == "importcheck version 0.0.0"
 	assert result.exit_code == 0
+
+
+def test_cli_watch(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	# this package
+	from importcheck.watch import Watcher
+
+	(tmp_pathplus / "demo_watch_cli_a.py").write_lines(["import demo_watch_cli_b"])
+	(tmp_pathplus / "demo_watch_cli_b.py").write_lines(["X = 1"])
+	(tmp_pathplus / "demo_watch_cli_c.py").write_lines(["X = 1"])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	changes = iter([["demo_watch_cli_a", "demo_watch_cli_b"]])
+
+	def wait(self: Watcher) -> List[str]:
+		try:
+			affected = next(changes)
+		except StopIteration:
+			raise KeyboardInterrupt
+
+		(tmp_pathplus / "demo_watch_cli_b.py").write_lines(["raise ValueError('oops')"])
+		return affected
+
+	monkeypatch.setattr(Watcher, "wait", wait)
+
+	modules = ["demo_watch_cli_a", "demo_watch_cli_b", "demo_watch_cli_c"]
+
+	try:
+		with in_directory(tmp_pathplus):
+			runner = CliRunner(mix_stderr=False)
+			result: Result = runner.invoke(main, args=[*modules, "--no-colour", "--watch"])
+	finally:
+		for module in modules:
+			sys.modules.pop(module, None)
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Checking 'demo_watch_cli_a'....Passed",
+			"Checking 'demo_watch_cli_b'....Passed",
+			"Checking 'demo_watch_cli_c'....Passed",
+			'',
+			"Watching for changes. Press Ctrl+C to stop.",
+			'',
+			"Checking 2 changed or dependent modules:",
+			"Checking 'demo_watch_cli_a'....Failed",
+			"Checking 'demo_watch_cli_b'....Failed",
+			'',
+			"Tip: run with '--show' to show tracebacks for failed imports.",
+			]
+
+
+def test_cli_profile(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_profile_cli.py").write_lines(["import demo_profile_cli_dep"])
+	(tmp_pathplus / "demo_profile_cli_dep.py").touch()
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	try:
+		with in_directory(tmp_pathplus):
+			runner = CliRunner(mix_stderr=False)
+			result: Result = runner.invoke(
+					main,
+					args=["demo_profile_cli", "--no-colour", "--profile", "--profile-output", "profile.json"],
+					)
+	finally:
+		sys.modules.pop("demo_profile_cli", None)
+		sys.modules.pop("demo_profile_cli_dep", None)
+
+	assert not result.stderr
+	assert result.exit_code == 0
+
+	lines = fix_stdout(result.stdout).splitlines()
+	assert lines[4:6] == ["Import profile:", "self [ms] | cumulative | imported module"]
+	assert lines[6].endswith("| demo_profile_cli")
+	assert lines[7].endswith("|   demo_profile_cli_dep")
+
+	speedscope = (tmp_pathplus / "profile.json").load_json()
+	assert speedscope["shared"]["frames"] == [{"name": "demo_profile_cli"}, {"name": "demo_profile_cli_dep"}]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["collections", "--profile", "--jobs", "2"])
+
+	assert result.exit_code == 2
+	assert "Profiling requires modules to be imported in the current process" in result.stderr
+
+
+def test_cli_wheel(tmp_pathplus: PathPlus) -> None:
+	for name, content in [("demo_wheel_cli_a", "X = 1"), ("demo_wheel_cli_b", "raise ValueError('oops')")]:
+		with zipfile.ZipFile(tmp_pathplus / f"{name}-1.0-py3-none-any.whl", 'w') as archive:
+			archive.writestr(f"{name}.py", content)
+			archive.writestr(f"{name}-1.0.dist-info/RECORD", f"{name}.py,,\n{name}-1.0.dist-info/RECORD,,\n")
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--no-colour", "--count", "--wheel", "*.whl"])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Checking modules in demo_wheel_cli_a-1.0-py3-none-any.whl:",
+			"Checking 'demo_wheel_cli_a'....Passed",
+			'',
+			"1 module imported successfully.",
+			'',
+			"Checking modules in demo_wheel_cli_b-1.0-py3-none-any.whl:",
+			"Checking 'demo_wheel_cli_b'....Failed",
+			'',
+			"0/1 module imported successfully.",
+			'',
+			"Tip: run with '--show' to show tracebacks for failed imports.",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--wheel", "i_dont_exist.whl"])
+
+	assert result.exit_code == 2
+	assert "No such archive 'i_dont_exist.whl'" in result.stderr
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--wheel", "dist/*.whl"])
+
+	assert result.exit_code == 2
+	assert "No archives match 'dist/*.whl'" in result.stderr
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[tool.importcheck.config.budgets]",
+			'demo_wheel_cli_a = { max_import_ms = 0 }',
+			])
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--wheel", "demo_wheel_cli_a-1.0-py3-none-any.whl"])
+
+	assert result.exit_code == 3
+	assert re.match(
+			r"^Checking 'demo_wheel_cli_a'\.+Over budget \(took .+ ms \(limit 0 ms\)\)$",
+			result.stdout.splitlines()[3],
+			)
+
+
+@pytest.mark.parametrize(
+		"args, message",
+		[
+				(["--wheel", "dist/*.whl", "--jsonl", "out.jsonl"], "--jsonl cannot be used with --wheel."),
+				(["--wheel", "dist/*.whl", "--cache"], "--cache cannot be used with --wheel."),
+				(["--wheel", "dist/*.whl", "--durations", '0'], "--durations cannot be used with --wheel."),
+				(["--python", sys.executable, "--jsonl", "out.jsonl"], "--jsonl cannot be used with --python."),
+				(["--python", sys.executable, "--cache"], "--cache cannot be used with --python."),
+				(["--python", sys.executable, "--durations", '5'], "--durations cannot be used with --python."),
+				(["--python", sys.executable, "--isolation", "fork"], "--isolation cannot be used with --python."),
+				],
+		)
+def test_cli_unsupported_options(tmp_pathplus: PathPlus, args: List[str], message: str) -> None:
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--no-colour", *args, "collections"])
+
+	assert result.exit_code == 2
+	assert result.stderr.splitlines()[-1] == f"Error: {message}"
+
+
+def test_cli_project(tmp_pathplus: PathPlus) -> None:
+	for name, modules in [("a", '"collections", "importlib"'), ("b", '"importlib", "i_dont_exist"')]:
+		(tmp_pathplus / name).mkdir()
+		(tmp_pathplus / name / "pyproject.toml").write_lines(["[tool.importcheck]", f"always = [{modules}]"])
+
+	(tmp_pathplus / "pyproject.toml").write_lines(["[tool.importcheck]", 'always = ["functools"]'])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=["--no-colour", "--project", "*/pyproject.toml"])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Checking 3 modules from 2 projects (1 shared).",
+			'',
+			"Checking 'collections'.....Passed",
+			"Checking 'importlib'.......Passed",
+			"Checking 'i_dont_exist'....Failed",
+			'',
+			"Projects:",
+			"a/pyproject.toml: All 2 modules imported successfully.",
+			"b/pyproject.toml: 1/2 modules imported successfully. Failed: i_dont_exist",
+			"Tip: run with '--show' to show tracebacks for failed imports.",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--project", "pyproject.toml", "--project", "c/*.toml"])
+
+	assert result.exit_code == 2
+	assert "No configuration files match 'c/*.toml'" in result.stderr
+
+	(tmp_pathplus / "c").mkdir()
+	(tmp_pathplus / "c" / "pyproject.toml").write_lines(["[tool.black]"])
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--project", "c/pyproject.toml"])
+
+	assert result.exit_code == 2
+	assert "None of the configuration files have an 'importcheck' or 'tool.importcheck' table." in result.stderr
+
+
+def test_cli_project_python(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "a").mkdir()
+	(tmp_pathplus / "a" / "pyproject.toml").write_lines([
+			"[tool.importcheck]",
+			'always = ["collections"]',
+			"[tool.importcheck.only_if]",
+			"\"python_version == '2.7'\" = [\"i_dont_exist\"]",
+			"\"python_version >= '3'\" = [\"i_dont_exist_either\"]",
+			])
+
+	# this package
+	from importcheck import interpreters
+
+	# The markers are evaluated for the interpreter the modules are checked with, not the current one.
+	marker_environment = interpreters.marker_environment
+	monkeypatch.setattr(
+			interpreters,
+			"marker_environment",
+			lambda python: {**marker_environment(python), "python_version": "2.7"},
+			)
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				main,
+				args=["--no-colour", "--project", "a/pyproject.toml", "--python", sys.executable],
+				)
+
+	assert not result.stderr
+	assert result.exit_code == 1
+
+	lines = fix_stdout(result.stdout).splitlines()
+	assert lines[2].split() == ["Module", sys.executable]
+	assert [line.split() for line in lines[3:5]] == [["collections", "Passed"], ["i_dont_exist", "Failed"]]
+	assert lines[5:] == ['', "Tip: run with '--show' to show tracebacks for failed imports."]
+
+
+def test_cli_shard(tmp_pathplus: PathPlus) -> None:
+	modules = ["collections", "i_dont_exist", "functools", "importlib"]
+	(tmp_pathplus / "timings.json").dump_json({"collections": 1.0, "functools": 0.5})
+
+	runner = CliRunner(mix_stderr=False)
+	shards = []
+
+	for index in (1, 2):
+		with in_directory(tmp_pathplus):
+			result: Result = runner.invoke(
+					main,
+					args=[
+							*modules,
+							"--no-colour",
+							"--shard",
+							f"{index}/2",
+							"--timings",
+							"timings.json",
+							"--jsonl",
+							f"shard-{index}.jsonl",
+							],
+					)
+
+		assert not result.stderr
+		shards.append(fix_stdout(result.stdout).splitlines()[2:])
+
+	assert shards == [
+			[
+					"Shard 1/2: checking 2 of 4 modules.",
+					'',
+					"Checking 'collections'....Passed",
+					"Checking 'functools'......Passed",
+					],
+			[
+					"Shard 2/2: checking 2 of 4 modules.",
+					'',
+					"Checking 'i_dont_exist'....Failed",
+					"Checking 'importlib'.......Passed",
+					'',
+					"Tip: run with '--show' to show tracebacks for failed imports.",
+					],
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--merge", "shard-*.jsonl", "--timings", "timings.json"])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Failed: i_dont_exist",
+			'',
+			"3/4 modules imported successfully.",
+			'',
+			"Tip: run with '--show' to show tracebacks for failed imports.",
+			]
+
+	timings = (tmp_pathplus / "timings.json").load_json()
+	assert sorted(timings) == sorted(modules)
+	assert not (tmp_pathplus / ".importcheck_cache").exists()
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["--no-colour", "--merge", "shard-1.jsonl"])
+
+	assert result.exit_code == 1
+	assert result.stderr == "Error: Could not read results: The results are missing for shard 2/2.\n"
+
+	# Without timings the modules are split by name.
+	for index, expected in [(1, ["collections", "i_dont_exist"]), (2, ["functools", "importlib"])]:
+		with in_directory(tmp_pathplus):
+			result = runner.invoke(main, args=[*modules, "--no-colour", "--shard", f"{index}/2"])
+
+		assert [line.split("'")[1] for line in fix_stdout(result.stdout).splitlines()[4:6]] == expected
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["collections", "--shard", "3/2"])
+
+	assert result.exit_code == 2
+	assert "The shard K/N must have 1 <= K <= N, not '3/2'." in result.stderr
+
+
+def test_cli_failed_first(tmp_pathplus: PathPlus) -> None:
+	modules = ["collections", "i_dont_exist", "importlib", "i_dont_exist_either"]
+	runner = CliRunner(mix_stderr=False)
+
+	with in_directory(tmp_pathplus):
+		result: Result = runner.invoke(main, args=[*modules, "--no-colour", "--failed-first"])
+
+	assert result.exit_code == 1
+	failures = (tmp_pathplus / ".importcheck_cache" / "failures.json").load_json()
+	assert failures == ["i_dont_exist", "i_dont_exist_either"]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=[*modules, "--no-colour", "--failed-first", "-x"])
+
+	assert not result.stderr
+	assert result.exit_code == 1
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Checking 'i_dont_exist'...........Failed",
+			"Stopping after 1 failed import.",
+			'',
+			"Tip: run with '--show' to show tracebacks for failed imports.",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=[*modules[::2], "--no-colour", "--maxfail", "2"])
+
+	assert result.exit_code == 0
+	assert fix_stdout(result.stdout).splitlines()[2:] == [
+			"Checking 'collections'....Passed",
+			"Checking 'importlib'......Passed",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=[*modules, "--maxfail", "0"])
+
+	assert result.exit_code == 2
+	assert "maxfail must be at least 1." in result.stderr
+
+
+def test_cli_cache_records_failures(tmp_pathplus: PathPlus) -> None:
+	modules = ["collections", "i_dont_exist"]
+	runner = CliRunner(mix_stderr=False)
+
+	with in_directory(tmp_pathplus):
+		result: Result = runner.invoke(main, args=[*modules, "--no-colour", "--cache"])
+
+	assert result.exit_code == 1
+	assert (tmp_pathplus / ".importcheck_cache" / "failures.json").load_json() == ["i_dont_exist"]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=[*modules, "--no-colour", "--failed-first", "-x"])
+
+	assert result.exit_code == 1
+	assert fix_stdout(result.stdout).splitlines()[2:4] == [
+			"Checking 'i_dont_exist'....Failed",
+			"Stopping after 1 failed import.",
+			]
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=[*modules, "--no-colour", "--no-cache"])
+
+	assert result.exit_code == 1
+	assert (tmp_pathplus / ".importcheck_cache" / "failures.json").load_json() == ["i_dont_exist"]
+
+
+@pytest.mark.parametrize("args", [["--isolation", "fork"], ["--timeout", '1']])
+@pytest.mark.parametrize("target", [["collections"], ["--wheel", "demo-1.0-py3-none-any.whl"]])
+def test_cli_no_fork(tmp_pathplus: PathPlus, monkeypatch, args: List[str], target: List[str]) -> None:
+	monkeypatch.delattr(os, "fork", raising=False)
+	(tmp_pathplus / "demo-1.0-py3-none-any.whl").write_bytes(b'')
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(main, args=[*target, *args])
+
+	assert result.exit_code == 2
+	assert "not supported on this platform." in result.stderr
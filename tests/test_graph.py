@@ -0,0 +1,96 @@
+# stdlib
+import sys
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import ImportChecker
+from importcheck.graph import build_import_graph, topological_order
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_graph_pkg",
+			{
+					"__init__.py": '',
+					"_compat.py": ["import i_dont_exist"],
+					"core.py": [
+							"open(__file__ + '.imported', 'w').close()",
+							"from demo_graph_pkg import _compat",
+							"import json",
+							],
+					"api.py": ["from .core import thing", "def f():", "	from . import lazy"],
+					"lazy.py": ["x = 1"],
+					"cycle_a.py": ["from . import cycle_b"],
+					"cycle_b.py": ["from . import cycle_a"],
+					},
+			)
+
+
+modules = [
+		"demo_graph_pkg.api",
+		"demo_graph_pkg.cycle_a",
+		"demo_graph_pkg.lazy",
+		"demo_graph_pkg.core",
+		"demo_graph_pkg",
+		"demo_graph_pkg.cycle_b",
+		"demo_graph_pkg._compat",
+		]
+
+
+def test_build_import_graph(demo_package: PathPlus) -> None:
+	assert build_import_graph(modules) == {
+			"demo_graph_pkg.api": ["demo_graph_pkg", "demo_graph_pkg.core"],
+			"demo_graph_pkg.cycle_a": ["demo_graph_pkg", "demo_graph_pkg.cycle_b"],
+			"demo_graph_pkg.lazy": ["demo_graph_pkg"],
+			"demo_graph_pkg.core": ["demo_graph_pkg", "demo_graph_pkg._compat"],
+			"demo_graph_pkg": [],
+			"demo_graph_pkg.cycle_b": ["demo_graph_pkg", "demo_graph_pkg.cycle_a"],
+			"demo_graph_pkg._compat": ["demo_graph_pkg"],
+			}
+	assert "demo_graph_pkg" not in sys.modules
+
+
+def test_topological_order() -> None:
+	graph = {"c": ["a"], "b": [], "a": ["b", "elsewhere"], "x": ["y"], "y": ["x"], "d": []}
+	assert topological_order(graph) == ["b", "a", "c", "d", "x", "y"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_importchecker_dependencies(demo_package: PathPlus, jobs: int) -> None:
+	checker = ImportChecker(modules, dependencies=True, show=True, jobs=jobs)
+	results = dict(checker.check_modules())
+
+	assert checker.modules == [
+			"demo_graph_pkg",
+			"demo_graph_pkg.lazy",
+			"demo_graph_pkg._compat",
+			"demo_graph_pkg.core",
+			"demo_graph_pkg.api",
+			"demo_graph_pkg.cycle_a",
+			"demo_graph_pkg.cycle_b",
+			]
+	assert results == {
+			"demo_graph_pkg": 0,
+			"demo_graph_pkg.lazy": 0,
+			"demo_graph_pkg._compat": 1,
+			"demo_graph_pkg.core": 1,
+			"demo_graph_pkg.api": 1,
+			"demo_graph_pkg.cycle_a": 0,
+			"demo_graph_pkg.cycle_b": 0,
+			}
+	assert checker._failed == {
+			"demo_graph_pkg._compat": "demo_graph_pkg._compat",
+			"demo_graph_pkg.core": "demo_graph_pkg._compat",
+			"demo_graph_pkg.api": "demo_graph_pkg._compat",
+			}
+	assert "demo_graph_pkg.core" not in sys.modules
+	# Not even in a worker process.
+	assert not (demo_package / "core.py.imported").exists()
+
+	# The modules which were not imported have no duration.
+	assert sorted(checker.durations) == sorted(set(modules) - {"demo_graph_pkg.core", "demo_graph_pkg.api"})
@@ -1,15 +1,18 @@
 # stdlib
 
 # stdlib
-from typing import Iterable
+import subprocess
+import sys
+from typing import Iterable, Iterator
 
 # 3rd party
 import pytest
 from coincidence.regressions import AdvancedDataRegressionFixture, AdvancedFileRegressionFixture
 from coincidence.selectors import min_version, only_version
+from domdf_python_tools.paths import PathPlus
 
 # this package
-from importcheck import ImportChecker
+from importcheck import OK, Budget, ImportChecker, OverBudget, format_stats
 
 
 @pytest.mark.parametrize(
@@ -61,3 +64,263 @@ def test_importchecker_errors_show(
 
 	advanced_data_regression.check(dict(checker.check_modules()))
 	advanced_file_regression.check(checker.format_statistics())
+
+
+@pytest.mark.parametrize("jobs", [2, 0])
+def test_importchecker_jobs(jobs: int) -> None:
+	modules = ["collections", "i_dont_exist", "importlib", "this-is&invalid", "functools"]
+
+	serial = ImportChecker(modules)
+	parallel = ImportChecker(modules, jobs=jobs)
+
+	assert list(parallel.check_modules()) == list(serial.check_modules())
+	assert parallel.stats == serial.stats == {"passed": 3, "failed": 2, "over_budget": 0}
+	assert parallel.jobs >= 1
+
+
+def test_importchecker_jobs_crash(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_pool_crash.py").write_lines(["import os", "os._exit(3)"])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	modules = ["collections", "demo_pool_crash", "importlib", "functools", "i_dont_exist", "json"]
+	checker = ImportChecker(modules, jobs=2)
+
+	assert list(checker.check_modules()) == [
+			("collections", 0),
+			("demo_pool_crash", 1),
+			("importlib", 0),
+			("functools", 0),
+			("i_dont_exist", 1),
+			("json", 0),
+			]
+	assert checker.stats == {"passed": 4, "failed": 2, "over_budget": 0}
+
+
+def test_importchecker_durations() -> None:
+	checker = ImportChecker(["collections", "i_dont_exist", "importlib"])
+	assert checker.format_durations() == "No modules were imported."
+
+	list(checker.check_modules())
+
+	assert list(checker.durations) == ["collections", "i_dont_exist", "importlib"]
+	assert all(duration >= 0 for duration in checker.durations.values())
+
+	checker.durations = {"collections": 0.25, "i_dont_exist": 0.5, "importlib": 0.125}
+	assert checker.format_durations(2) == "Slowest 2 imports:\n0.500s i_dont_exist\n0.250s collections"
+	assert checker.format_durations(1) == "Slowest 1 import:\n0.500s i_dont_exist"
+	assert checker.format_durations() == (
+			"Import durations:\n0.500s i_dont_exist\n0.250s collections\n0.125s importlib"
+			)
+
+
+def test_importchecker_lazy() -> None:
+	consumed = []
+
+	def modules() -> Iterator[str]:
+		for name in ["collections", "i_dont_exist", "importlib"]:
+			consumed.append(name)
+			yield name
+
+	checker = ImportChecker(modules())
+	assert checker.modules == []
+	assert not consumed
+
+	results = checker.check_modules()
+	assert next(results) == ("collections", 0)
+	assert consumed == ["collections"]
+	assert list(results) == [("i_dont_exist", 1), ("importlib", 0)]
+	assert checker.modules == ["collections", "i_dont_exist", "importlib"]
+
+	checker = ImportChecker(iter([]))
+	assert list(checker.check_modules()) == []
+	assert checker.format_statistics() == "No modules to check."
+
+
+def test_importchecker_memory() -> None:
+	checker = ImportChecker(["collections", "i_dont_exist"], measure_memory=True)
+	assert checker.format_memory_usage() == "No memory usage was measured."
+
+	list(checker.check_modules())
+
+	assert list(checker.memory_usage) == ["collections", "i_dont_exist"]
+	assert all(peak >= 0 for peak, rss_delta in checker.memory_usage.values())
+
+	checker.memory_usage = {"collections": (2048, None), "i_dont_exist": (3 * 1024 * 1024, -4096)}
+	assert checker.format_memory_usage(1) == (
+			"Largest 1 import by peak memory:\npeak 3.0 MiB, RSS -4.0 KiB i_dont_exist"
+			)
+	assert checker.format_memory_usage() == (
+			"Import memory usage:\npeak 3.0 MiB, RSS -4.0 KiB i_dont_exist\npeak 2.0 KiB collections"
+			)
+
+	checker = ImportChecker(["collections"])
+	list(checker.check_modules())
+	assert checker.memory_usage == {}
+
+
+def test_importchecker_fan_out() -> None:
+	checker = ImportChecker(["collections", "i_dont_exist"], fan_out=True, isolation="snapshot")
+	assert checker.format_fan_out() == "No imported modules were recorded."
+
+	list(checker.check_modules())
+
+	assert list(checker.imported) == ["collections", "i_dont_exist"]
+	assert checker.imported["i_dont_exist"] == ()
+
+	checker.imported = {
+			"foo": ("foo.bar", "numpy", "numpy.core", "pandas"),
+			"foo.baz": ("json", ),
+			"i_dont_exist": (),
+			}
+	checker.durations = {"foo": 1.5, "foo.baz": 0.25, "i_dont_exist": 0.125}
+
+	assert checker.format_fan_out(2) == (
+			"Largest 2 imports by fan-out:\n4 modules, 1.500s foo (numpy, pandas)\n1 module, 0.250s foo.baz (json)"
+			)
+	assert checker.format_fan_out() == (
+			"Import fan-out:\n"
+			"4 modules, 1.500s foo (numpy, pandas)\n"
+			"1 module, 0.250s foo.baz (json)\n"
+			"0 modules, 0.125s i_dont_exist"
+			)
+
+	checker = ImportChecker(["collections"])
+	list(checker.check_modules())
+	assert checker.imported == {}
+
+
+def test_importchecker_prioritise() -> None:
+	modules = ["collections", "i_dont_exist", "importlib", "functools"]
+
+	checker = ImportChecker(iter(modules), prioritise=["functools", "not_checked", "i_dont_exist", "functools"])
+	assert list(checker.check_modules()) == [
+			("functools", 0),
+			("i_dont_exist", 1),
+			("collections", 0),
+			("importlib", 0),
+			]
+	assert checker.modules == ["functools", "i_dont_exist", "collections", "importlib"]
+
+	checker = ImportChecker(modules, prioritise=["importlib.util", "importlib"], dependencies=True)
+	assert [module for module, status in checker.check_modules()] == [
+			"importlib",
+			"collections",
+			"i_dont_exist",
+			"functools",
+			]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_importchecker_maxfail(capsys, jobs: int) -> None:
+	modules = ["collections", "i_dont_exist", "importlib", "i_dont_exist_either", "functools", "nor_do_i"]
+
+	checker = ImportChecker(modules, maxfail=2, jobs=jobs)
+	assert list(checker.check_modules()) == [
+			("collections", 0),
+			("i_dont_exist", 1),
+			("importlib", 0),
+			("i_dont_exist_either", 1),
+			]
+	assert checker.stats == {"passed": 2, "failed": 2, "over_budget": 0}
+	assert capsys.readouterr().out.endswith("Failed\nStopping after 2 failed imports.\n")
+
+	checker = ImportChecker(modules, maxfail=3)
+	assert len(list(checker.check_modules())) == 6
+
+	with pytest.raises(ValueError, match="maxfail must be at least 1."):
+		ImportChecker(modules, maxfail=0)
+
+
+def test_budget() -> None:
+	budget = Budget(max_import_ms=100, max_import_mb=1)
+
+	assert budget.check(OK("foo", 0.05, 1024)) == OK("foo", 0.05, 1024)
+	assert budget.check(OK("foo", 0.25, 2 * 1024 * 1024, 0)) == OverBudget(
+			"foo",
+			("took 250.0 ms (limit 100 ms)", "allocated 2.0 MiB (limit 1 MiB)"),
+			0.25,
+			2 * 1024 * 1024,
+			0,
+			)
+
+	# Memory is only enforced if it was measured.
+	assert budget.check(OK("foo", 0.05)) == OK("foo", 0.05)
+
+	assert budget.update(Budget(max_import_ms=500)) == Budget(500, 1)
+	assert Budget.from_mapping({"max_import_ms": 20, "show": True}) == Budget(20, None)
+
+
+def test_importchecker_budget() -> None:
+	checker = ImportChecker(
+			["collections", "i_dont_exist", "importlib", "importlib.util"],
+			budget=Budget(max_import_ms=0),
+			module_budgets={"importlib*": Budget(max_import_ms=10_000), "importlib.util": Budget(max_import_ms=0)},
+			)
+	assert not checker.measure_memory
+
+	assert checker.budget_for("collections") == Budget(0)
+	assert checker.budget_for("importlib") == Budget(10_000)
+	assert checker.budget_for("importlib.util") == Budget(0)
+
+	assert list(checker.check_modules()) == [
+			("collections", 2),
+			("i_dont_exist", 1),
+			("importlib", 0),
+			("importlib.util", 2),
+			]
+	assert checker.stats == {"passed": 1, "failed": 1, "over_budget": 2}
+	assert checker.format_statistics() == "1/4 modules imported successfully, 2 over budget."
+
+	assert ImportChecker(["collections"], module_budgets={"foo": Budget(max_import_mb=5)}).measure_memory
+
+
+def test_import_time() -> None:
+	# The third-party dependencies take much longer to import than importcheck itself.
+	code = "import sys; before = set(sys.modules); import importcheck; print(*set(sys.modules) - before)"
+	process = subprocess.run(
+			[sys.executable, "-c", code],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	lazy = {"click", "consolekit", "dom_toml", "domdf_python_tools", "packaging", "concurrent"}
+	if sys.version_info >= (3, 8):
+		lazy.add("typing_extensions")
+
+	imported = {name.split('.')[0] for name in process.stdout.split()}
+	assert not imported & lazy
+
+
+def test_version_import_time() -> None:
+	# Importing consolekit takes longer than everything else ``importcheck --version`` needs,
+	# so the command line options must not need it.
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", "-m", "importcheck", "--version"],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	assert process.stdout.startswith("importcheck version ")
+
+	imported = set()
+	for line in process.stderr.splitlines():
+		fields = line.split('|')
+		if len(fields) == 3 and fields[1].strip().isdigit():
+			imported.add(fields[2].strip().split('.')[0])
+
+	assert "importcheck" in imported
+	assert not imported & {"consolekit", "mistletoe"}
+
+
+def test_format_stats() -> None:
+	assert format_stats({"passed": 0, "failed": 0}) == "No modules to check."
+	assert format_stats({"passed": 1, "failed": 0}) == "1 module imported successfully."
+	assert format_stats({"passed": 2, "failed": 0, "over_budget": 0}) == "All 2 modules imported successfully."
+	assert format_stats({"passed": 1, "failed": 1}) == "1/2 modules imported successfully."
+	assert format_stats({"passed": 1, "failed": 0, "over_budget": 1}) == (
+			"1/2 modules imported successfully, 1 over budget."
+			)
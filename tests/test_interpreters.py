@@ -0,0 +1,87 @@
+# stdlib
+import platform
+import sys
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus, in_directory
+from packaging.markers import default_environment
+
+# this package
+from importcheck import OK, Error, evaluate_markers
+from importcheck.interpreters import (
+		check_with_interpreter,
+		check_with_interpreters,
+		format_matrix,
+		marker_environment
+		)
+
+
+def test_marker_environment() -> None:
+	environment = marker_environment(sys.executable)
+	assert environment == default_environment()
+
+	config = {
+			"only_if": {
+					"python_version == '2.7'": ["old"],
+					f"python_version == '{environment['python_version']}'": ["new"],
+					},
+			}
+	assert evaluate_markers(config, environment) == ["new"]
+	assert evaluate_markers(config, {"python_version": "2.7"}) == ["old"]
+
+
+def test_check_with_interpreter(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "demo_interpreter_bad.py").write_lines(["print('hello')", "raise ValueError('oops')"])
+	(tmp_pathplus / "demo_interpreter_prints.py").write_lines(["import os", "os.write(1, b'direct')"])
+
+	with in_directory(tmp_pathplus):
+		results = check_with_interpreter(
+				sys.executable,
+				["collections", "demo_interpreter_bad", "demo_interpreter_prints", "i_dont_exist"],
+				)
+
+	assert list(results) == ["collections", "demo_interpreter_bad", "demo_interpreter_prints", "i_dont_exist"]
+	assert isinstance(results["collections"], OK)
+	assert isinstance(results["demo_interpreter_prints"], OK)
+
+	error = results["demo_interpreter_bad"]
+	assert isinstance(error, Error)
+	assert error.stdout.startswith("hello\nTraceback (most recent call last):\n")
+	assert error.stdout.endswith("ValueError: oops\n")
+	assert "<string>" not in error.stdout
+
+	assert "No module named 'i_dont_exist'" in results["i_dont_exist"].stdout
+
+
+def test_check_with_interpreters() -> None:
+	def modules(environment):
+		assert environment["python_full_version"] == platform.python_version()
+		return ["collections", "i_dont_exist"]
+
+	results = check_with_interpreters(modules, [sys.executable])
+	assert list(results) == [sys.executable]
+	assert not results[sys.executable]["collections"]
+	assert results[sys.executable]["i_dont_exist"]
+
+	with pytest.raises(OSError):
+		check_with_interpreters(["collections"], ["i-am-not-a-python"])
+
+
+def test_format_matrix() -> None:
+	results = {
+			"python3.8": {"collections": OK("collections"), "foo": Error("foo", '', '')},
+			"pypy3": {"collections": OK("collections"), "bar": OK("bar")},
+			}
+
+	assert format_matrix(results) == '\n'.join([
+			"Module       python3.8  pypy3",
+			"collections  Passed     Passed",
+			"foo          Failed     -",
+			"bar          -          Passed",
+			])
+
+	assert format_matrix(results, modules=["bar"]) == '\n'.join([
+			"Module  python3.8  pypy3",
+			"bar     -          Passed",
+			])
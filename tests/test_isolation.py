@@ -0,0 +1,202 @@
+# stdlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+# 3rd party
+import pytest
+from coincidence.selectors import not_windows
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import OK, Error, ImportChecker, check_module
+from importcheck.isolation import ModuleSnapshot, WarmTemplate, check_in_snapshot, detect_shared_dependencies
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_fork_pkg",
+			{
+					"__init__.py": '',
+					"a.py": ["import json", "import demo_fork_pkg.b"],
+					"b.py": ["import json", "import xml.dom"],
+					"bad.py": ["import json", "raise ValueError('oops')"],
+					"exits.py": ["import sys", "sys.exit(3)"],
+					"hangs.py": [
+							"import threading",
+							"def wait_forever():",
+							"	threading.Event().wait()",
+							"wait_forever()",
+							],
+					"writes_pid.py": [
+							"import os, threading",
+							"with open(__file__ + '.pid', 'w') as fp:",
+							"	fp.write(str(os.getpid()))",
+							"threading.Event().wait()",
+							],
+					},
+			)
+
+
+def test_detect_shared_dependencies(demo_package: PathPlus) -> None:
+	modules = ["demo_fork_pkg.a", "demo_fork_pkg.b", "demo_fork_pkg.bad", "demo_fork_pkg.exits"]
+	assert detect_shared_dependencies(modules) == ["json"]
+	assert detect_shared_dependencies(modules, min_count=1) == ["json", "sys", "xml"]
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+def test_warm_template(demo_package: PathPlus) -> None:
+	template = WarmTemplate(["json", "i_dont_exist"])
+	template.warm()
+	assert template.failed == ["i_dont_exist"]
+
+	ret = template.check("demo_fork_pkg.a").result()
+	assert isinstance(ret, OK)
+	assert ret.module == "demo_fork_pkg.a"
+	assert ret.duration > 0
+	assert "demo_fork_pkg.a" not in sys.modules
+
+	ret = template.check("demo_fork_pkg.bad", combine_output=True).result()
+	assert isinstance(ret, Error)
+	assert "ValueError: oops" in ret.stdout
+
+	ret = template.check("demo_fork_pkg.exits").result()
+	assert isinstance(ret, Error)
+	assert "exited unexpectedly (exit code 0)" in ret.stderr
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+def test_forked_check_timeout(demo_package: PathPlus) -> None:
+	template = WarmTemplate()
+
+	ret = template.check("demo_fork_pkg.hangs", timeout=0.5).result()
+	assert isinstance(ret, Error)
+	assert ret.duration == 0.5
+	assert ret.stderr.startswith("Importing 'demo_fork_pkg.hangs' timed out after 0.5 seconds.\n")
+	assert "in wait_forever" in ret.stderr
+	assert "hangs.py" in ret.stderr
+
+	ret = template.check("demo_fork_pkg.b", timeout=10).result()
+	assert isinstance(ret, OK)
+
+	ret = template.check("demo_fork_pkg.exits", timeout=10).result()
+	assert "exited unexpectedly (exit code 0)" in ret.stderr
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_importchecker_fork(demo_package: PathPlus, jobs: int) -> None:
+	modules = ["demo_fork_pkg.a", "demo_fork_pkg.bad", "demo_fork_pkg.b", "demo_fork_pkg.exits"]
+	checker = ImportChecker(modules, isolation="fork", jobs=jobs)
+
+	assert list(checker.check_modules()) == [
+			("demo_fork_pkg.a", 0),
+			("demo_fork_pkg.bad", 1),
+			("demo_fork_pkg.b", 0),
+			("demo_fork_pkg.exits", 1),
+			]
+	assert checker.preload == ["json"]
+	assert "demo_fork_pkg.b" not in sys.modules
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+def test_importchecker_timeout(demo_package: PathPlus) -> None:
+	modules = ["demo_fork_pkg.a", "demo_fork_pkg.hangs", "demo_fork_pkg.b"]
+	checker = ImportChecker(modules, timeout=0.5, jobs=2)
+
+	assert list(checker.check_modules()) == [
+			("demo_fork_pkg.a", 0),
+			("demo_fork_pkg.hangs", 1),
+			("demo_fork_pkg.b", 0),
+			]
+	assert "demo_fork_pkg.a" not in sys.modules
+
+	# Modules are not preloaded unless fork-based isolation was requested.
+	assert checker.preload is None
+
+
+@not_windows("Fork-based isolation is not supported on Windows")
+@pytest.mark.parametrize("options", [{"isolation": "fork"}, {"timeout": 60}])
+def test_importchecker_maxfail_kills_children(demo_package: PathPlus, options: Dict[str, Any]) -> None:
+	checker = ImportChecker(["demo_fork_pkg.bad", "demo_fork_pkg.writes_pid"], jobs=2, maxfail=1, **options)
+	results = checker.check_modules()
+	assert next(results) == ("demo_fork_pkg.bad", 1)
+
+	# Wait until the next module is being imported in its child process.
+	pid_file = demo_package / "writes_pid.py.pid"
+	deadline = time.monotonic() + 10
+	while not (pid_file.is_file() and pid_file.read_text()):
+		assert time.monotonic() < deadline
+		time.sleep(0.01)
+
+	assert list(results) == []
+
+	# The child was killed, and has been waited for so no zombie remains.
+	with pytest.raises(ProcessLookupError):
+		os.kill(int(pid_file.read_text()), 0)
+
+
+def test_module_snapshot(demo_package: PathPlus) -> None:
+	path = sys.path.copy()
+
+	with ModuleSnapshot():
+		import demo_fork_pkg.a  # type: ignore[import]  # noqa: F401
+		sys.path.append("/i/dont/exist")
+
+	assert "demo_fork_pkg" not in sys.modules
+	assert "demo_fork_pkg.b" not in sys.modules
+	assert sys.path == path
+
+	import demo_fork_pkg  # type: ignore[import]
+
+	try:
+		with ModuleSnapshot():
+			import demo_fork_pkg.b  # noqa: F401
+
+		# The reference from the package, which was imported before, is also removed.
+		assert not hasattr(demo_fork_pkg, 'b')
+		assert "demo_fork_pkg.b" not in sys.modules
+	finally:
+		del sys.modules["demo_fork_pkg"]
+
+
+def test_check_in_snapshot(demo_package: PathPlus) -> None:
+	ret = check_in_snapshot(check_module, "demo_fork_pkg.a")
+	assert isinstance(ret, OK)
+	assert "demo_fork_pkg.a" not in sys.modules
+
+	# The partially initialised package is removed too.
+	ret = check_in_snapshot(check_module, "demo_fork_pkg.bad", combine_output=True)
+	assert isinstance(ret, Error)
+	assert "ValueError: oops" in ret.stdout
+	assert "demo_fork_pkg" not in sys.modules
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_importchecker_snapshot(demo_package: PathPlus, jobs: int) -> None:
+	(demo_package / "needs_a.py").write_lines(["import demo_fork_pkg", "demo_fork_pkg.a"])
+	modules = ["demo_fork_pkg.a", "demo_fork_pkg.needs_a", "demo_fork_pkg.bad"]
+
+	assert list(ImportChecker(modules, isolation="snapshot", jobs=jobs).check_modules()) == [
+			("demo_fork_pkg.a", 0),
+			("demo_fork_pkg.needs_a", 1),
+			("demo_fork_pkg.bad", 1),
+			]
+	assert "demo_fork_pkg.a" not in sys.modules
+
+
+def test_importchecker_bad_isolation() -> None:
+	with pytest.raises(ValueError, match="Unknown isolation mode 'thread'"):
+		ImportChecker([], isolation="thread")
+
+	with pytest.raises(ValueError, match="The timeout must be greater than zero."):
+		ImportChecker([], timeout=0)
+
+
+def test_warm_template_no_fork(monkeypatch) -> None:
+	monkeypatch.delattr(os, "fork", raising=False)
+
+	with pytest.raises(OSError, match="Fork-based isolation is not supported on this platform."):
+		WarmTemplate()
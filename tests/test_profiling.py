@@ -0,0 +1,116 @@
+# stdlib
+import importlib.machinery
+import json
+import sys
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import ImportChecker
+from importcheck.profiling import ImportProfile
+
+MODULES = ["demo_profile_pkg", "demo_profile_pkg.a", "demo_profile_pkg.b", "demo_profile_pkg.c"]
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_profile_pkg",
+			{
+					"__init__.py": '',
+					"a.py": ["import demo_profile_pkg.b", "import demo_profile_pkg.c"],
+					"b.py": ["import demo_profile_pkg.c"],
+					"c.py": ["import time", "time.sleep(0.01)"],
+					},
+			)
+
+
+def test_import_profile(demo_package: PathPlus) -> None:
+	profile = ImportProfile()
+	assert profile.format_tree() == "No imports were recorded."
+
+	with profile.record():
+		import demo_profile_pkg.a  # type: ignore[import]  # noqa: F401
+
+	assert not any(type(finder).__name__ == "_ProfilingFinder" for finder in sys.meta_path)
+
+	# The module is given its original loader.
+	assert isinstance(sys.modules["demo_profile_pkg.a"].__loader__, importlib.machinery.SourceFileLoader)
+	assert isinstance(sys.modules["demo_profile_pkg.a"].__spec__.loader, importlib.machinery.SourceFileLoader)
+
+	assert [path for path, node in profile.root.walk()] == [
+			("demo_profile_pkg.a", ),
+			("demo_profile_pkg.a", "demo_profile_pkg.b"),
+			("demo_profile_pkg.a", "demo_profile_pkg.b", "demo_profile_pkg.c"),
+			("demo_profile_pkg", ),
+			]
+
+	a = profile.root.children["demo_profile_pkg.a"]
+	c = a.children["demo_profile_pkg.b"].children["demo_profile_pkg.c"]
+	assert c.self_time >= 0.01
+	assert a.cumulative_time >= c.cumulative_time
+	assert a.self_time < a.cumulative_time - c.self_time
+	assert profile.total_time == a.cumulative_time + profile.root.children["demo_profile_pkg"].cumulative_time
+
+	lines = profile.format_tree().splitlines()
+	assert lines[:2] == ["Import profile:", "self [ms] | cumulative | imported module"]
+	assert [line.split('|')[2].rstrip() for line in lines[2:]] == [
+			" demo_profile_pkg.a",
+			"   demo_profile_pkg.b",
+			"     demo_profile_pkg.c",
+			" demo_profile_pkg",
+			]
+	assert len(profile.format_tree(min_time=0.005).splitlines()) == 5
+
+	collapsed = profile.to_collapsed().splitlines()
+	assert [line.rsplit(' ', 1)[0] for line in collapsed] == [
+			"demo_profile_pkg.a",
+			"demo_profile_pkg.a;demo_profile_pkg.b",
+			"demo_profile_pkg.a;demo_profile_pkg.b;demo_profile_pkg.c",
+			"demo_profile_pkg",
+			]
+	assert int(collapsed[2].rsplit(' ', 1)[1]) >= 10_000
+
+	speedscope = json.loads(json.dumps(profile.to_speedscope()))
+	assert speedscope["shared"]["frames"] == [
+			{"name": "demo_profile_pkg.a"},
+			{"name": "demo_profile_pkg.b"},
+			{"name": "demo_profile_pkg.c"},
+			{"name": "demo_profile_pkg"},
+			]
+	assert speedscope["profiles"][0]["samples"] == [[0], [0, 1], [0, 1, 2], [3]]
+	assert speedscope["profiles"][0]["unit"] == "microseconds"
+
+
+def test_import_profile_failure(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_profile_bad.py").write_lines(["import json", "raise ValueError('oops')"])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	profile = ImportProfile()
+
+	try:
+		with profile.record(), pytest.raises(ValueError, match="oops"):
+			import demo_profile_bad  # type: ignore[import]  # noqa: F401
+	finally:
+		sys.modules.pop("demo_profile_bad", None)
+
+	assert profile.root.children["demo_profile_bad"].count == 1
+	assert not profile._stack
+
+
+def test_importchecker_profile(demo_package: PathPlus) -> None:
+	profile = ImportProfile()
+	checker = ImportChecker(MODULES, isolation="snapshot", profile=profile)
+
+	assert [status for module, status in checker.check_modules()] == [0, 0, 0, 0]
+
+	# With snapshot isolation each module is imported afresh, and the times for the same imports are combined.
+	assert profile.root.children["demo_profile_pkg"].count == 4
+	assert profile.root.children["demo_profile_pkg.c"].count == 1
+	assert profile.root.children["demo_profile_pkg.a"].children["demo_profile_pkg.b"].count == 1
+
+	with pytest.raises(ValueError, match="Profiling requires modules to be imported in the current process"):
+		ImportChecker(MODULES, jobs=2, profile=profile)
@@ -0,0 +1,87 @@
+# stdlib
+import sys
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from importcheck.projects import Project, format_projects, load_projects, requested_by
+
+
+def test_load_projects(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "a").mkdir()
+	(tmp_pathplus / "a" / "pyproject.toml").write_lines([
+			"[tool.importcheck]",
+			'always = ["collections", "demo_projects"]',
+			'recursive = ["demo_projects"]',
+			'exclude = ["*.tests"]',
+			])
+
+	(tmp_pathplus / "b").mkdir()
+	(tmp_pathplus / "b" / "importcheck.toml").write_lines([
+			"[importcheck]",
+			'always = ["importlib", "collections"]',
+			"[importcheck.only_if]",
+			"\"python_version == '2.7'\" = [\"old\"]",
+			f"\"python_version >= '{sys.version_info.major}'\" = [\"new\"]",
+			])
+
+	(tmp_pathplus / "c").mkdir()
+	(tmp_pathplus / "c" / "pyproject.toml").write_lines(["[tool.black]", "line-length = 120"])
+
+	package = tmp_pathplus / "demo_projects"
+	(package / "tests").mkdir(parents=True)
+	(package / "__init__.py").touch()
+	(package / "util.py").touch()
+	(package / "other.py").touch()
+	(package / "tests" / "__init__.py").touch()
+
+	config_files = ["a/pyproject.toml", "b/importcheck.toml", "c/pyproject.toml"]
+
+	try:
+		with in_directory(tmp_pathplus):
+			sys.path.insert(0, str(tmp_pathplus))
+			projects = load_projects(config_files, exclude=["demo_projects.other"])
+	finally:
+		sys.path.remove(str(tmp_pathplus))
+
+	assert projects == [
+			Project("a/pyproject.toml", ["collections", "demo_projects", "demo_projects.util"]),
+			Project("b/importcheck.toml", ["importlib", "collections", "new"]),
+			]
+
+	with in_directory(tmp_pathplus):
+		environment = {"python_version": "2.7"}
+		assert load_projects(["b/importcheck.toml"], environment=environment) == [
+				Project("b/importcheck.toml", ["importlib", "collections", "old"]),
+				]
+
+
+def test_requested_by() -> None:
+	projects = [
+			Project("a/pyproject.toml", ["collections", "shared"]),
+			Project("b/pyproject.toml", ["shared", "importlib"]),
+			Project("c/pyproject.toml", []),
+			]
+
+	assert requested_by(projects) == {
+			"collections": ["a/pyproject.toml"],
+			"shared": ["a/pyproject.toml", "b/pyproject.toml"],
+			"importlib": ["b/pyproject.toml"],
+			}
+
+
+def test_format_projects() -> None:
+	projects = [
+			Project("a/pyproject.toml", ["collections", "shared"]),
+			Project("b/pyproject.toml", ["shared", "broken", "slow", "also_broken"]),
+			Project("c/pyproject.toml", []),
+			]
+	statuses = {"collections": 0, "shared": 0, "broken": 1, "slow": 2, "also_broken": 1}
+
+	assert format_projects(projects, statuses) == '\n'.join([
+			"Projects:",
+			"a/pyproject.toml: All 2 modules imported successfully.",
+			"b/pyproject.toml: 1/4 modules imported successfully, 1 over budget. Failed: broken, also_broken",
+			"c/pyproject.toml: No modules to check.",
+			])
@@ -0,0 +1,97 @@
+# stdlib
+import io
+import json
+from xml.etree import ElementTree
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import OK, Error, ImportChecker, OverBudget
+from importcheck.reporters import JSONLinesReporter, JUnitXMLReporter, result_to_dict
+
+
+def test_result_to_dict() -> None:
+	assert result_to_dict(OK("collections", 0.5)) == {
+			"module": "collections",
+			"status": "passed",
+			"output": '',
+			"duration": 0.5,
+			"memory_peak": None,
+			"rss_delta": None,
+			"imported": None,
+			"cached": False,
+			}
+
+	error = Error("foo", "Traceback\n", "Traceback\n", 0.25, 1024, 2048, ("foo.bar", ))
+	record = result_to_dict(error, cached=False)
+	assert record["status"] == "failed"
+	assert record["output"] == "Traceback\n"
+	assert record["memory_peak"] == 1024
+	assert record["rss_delta"] == 2048
+	assert record["imported"] == ["foo.bar"]
+
+	record = result_to_dict(OverBudget("bar", ("took 5.0 ms (limit 1 ms)", ), 0.005))
+	assert record["status"] == "over_budget"
+	assert record["output"] == "Over budget: took 5.0 ms (limit 1 ms)\n"
+
+
+class FlushCounter(io.StringIO):
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.lines_at_flush = []
+
+	def flush(self) -> None:
+		self.lines_at_flush.append(self.getvalue().count('\n'))
+		super().flush()
+
+
+def test_jsonl_reporter() -> None:
+	file = FlushCounter()
+	checker = ImportChecker(["collections", "i_dont_exist"], reporters=[JSONLinesReporter(file)])
+
+	results = []
+	for module, status in checker.check_modules():
+		# Each record is written before the result is yielded.
+		results.append(json.loads(file.getvalue().splitlines()[-1]))
+		assert results[-1]["module"] == module
+
+	assert [r["status"] for r in results] == ["passed", "failed"]
+	assert "No module named 'i_dont_exist'" in results[1]["output"]
+	assert results[0]["duration"] > 0
+	assert file.lines_at_flush == [1, 2]
+
+
+def test_junit_xml_reporter(tmp_pathplus: PathPlus) -> None:
+	filename = tmp_pathplus / "reports" / "importcheck.xml"
+	checker = ImportChecker(["collections", "i_dont_exist"], reporters=[JUnitXMLReporter(filename)])
+	list(checker.check_modules())
+
+	root = ElementTree.parse(filename).getroot()
+	assert root.tag == "testsuites"
+
+	suite = root.find("testsuite")
+	assert suite is not None
+	assert suite.get("tests") == '2'
+	assert suite.get("failures") == '1'
+
+	cases = suite.findall("testcase")
+	assert [case.get("name") for case in cases] == ["collections", "i_dont_exist"]
+	assert cases[0].find("failure") is None
+
+	failure = cases[1].find("failure")
+	assert failure is not None
+	assert failure.get("message") == "Could not import 'i_dont_exist'"
+	assert "No module named 'i_dont_exist'" in (failure.text or '')
+
+
+def test_junit_xml_reporter_control_characters(tmp_pathplus: PathPlus) -> None:
+	filename = tmp_pathplus / "importcheck.xml"
+	reporter = JUnitXMLReporter(filename)
+	reporter.report(Error("coloured", "\x1b[31mValueError\x1b[0m: bad\x00 \x07value\n", ''))
+	reporter.finish()
+
+	failure = ElementTree.parse(filename).getroot().find("testsuite/testcase/failure")
+	assert failure is not None
+	assert failure.text == "ValueError: bad value\n"
@@ -0,0 +1,127 @@
+# stdlib
+import json
+from typing import Optional
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck.sharding import (
+		Timings,
+		format_merged_results,
+		merge_results,
+		parse_shard,
+		shard_header,
+		shard_modules
+		)
+
+
+def test_timings(tmp_pathplus: PathPlus) -> None:
+	filename = tmp_pathplus / "ci" / "timings.json"
+	timings = Timings(filename)
+	assert timings.durations == {}
+
+	timings.update({"foo": 0.5, "bar": 0.25})
+	timings.update({"foo": 0.125})
+	timings.save()
+
+	assert timings.filename == filename
+	assert Timings(filename).durations == {"bar": 0.25, "foo": 0.125}
+
+	filename.write_text("not json")
+	assert Timings(filename).durations == {}
+
+
+def test_parse_shard() -> None:
+	assert parse_shard("1/1") == (1, 1)
+	assert parse_shard("3/4") == (3, 4)
+
+	with pytest.raises(ValueError, match="The shard must be given as K/N, not '3'."):
+		parse_shard('3')
+
+	with pytest.raises(ValueError, match="The shard K/N must have 1 <= K <= N, not '0/4'."):
+		parse_shard("0/4")
+
+	with pytest.raises(ValueError, match="The shard K/N must have 1 <= K <= N, not '5/4'."):
+		parse_shard("5/4")
+
+
+def test_shard_modules() -> None:
+	modules = [f"mod{idx}" for idx in range(10)]
+
+	# Without durations the shards are balanced by the number of modules.
+	shards = [shard_modules(modules, index, 3) for index in (1, 2, 3)]
+	assert sorted(sum(shards, [])) == sorted(modules)
+	assert sorted(map(len, shards)) == [3, 3, 4]
+	assert all(shard == sorted(shard, key=modules.index) for shard in shards)
+
+	durations = {f"mod{idx}": 0.5 for idx in range(1, 10)}
+	durations["mod0"] = 4.5
+	shards = [shard_modules(modules, index, 2, durations) for index in (1, 2)]
+	assert shards == [["mod0"], modules[1:]]
+
+	# The split does not depend on the order the modules are given in.
+	assert shard_modules(reversed(modules), 1, 2, durations) == ["mod0"]
+
+	# Modules without a duration are assumed to take the mean of the known durations (3.0 seconds).
+	durations = {"mod0": 5.0, "mod1": 1.0}
+	assert shard_modules(modules[:4], 1, 2, durations) == ["mod0", "mod1"]
+	assert shard_modules(modules[:4], 2, 2, durations) == ["mod2", "mod3"]
+
+	assert shard_modules(modules, 1, 1) == modules
+	assert shard_modules([], 1, 2) == []
+
+
+def test_merge_results(tmp_pathplus: PathPlus) -> None:
+
+	def record(module: str, status: str, output: str = '') -> str:
+		return json.dumps({"module": module, "status": status, "output": output, "duration": 0.5, "cached": False})
+
+	def write_shard(name: str, index: int, count: int, *records: str, size: Optional[int] = None) -> PathPlus:
+		filename = tmp_pathplus / name
+		header = shard_header(index, count, len(records) if size is None else size)
+		filename.write_lines([json.dumps(header), *records])
+		return filename
+
+	shard_1 = write_shard("shard-1.jsonl", 1, 3, record("foo", "passed"), record("bar", "failed", "Oops\n"))
+	shard_2 = write_shard("shard-2.jsonl", 2, 3, record("baz", "over_budget"), '', size=1)
+	shard_3 = write_shard("shard-3.jsonl", 3, 3)
+
+	records = merge_results([shard_1, shard_2, shard_3])
+	assert list(records) == ["foo", "bar", "baz"]
+	assert records["bar"]["status"] == "failed"
+
+	assert format_merged_results(records) == (
+			"Failed: bar\nOver budget: baz\n\n1/3 modules imported successfully, 1 over budget.",
+			3,
+			)
+	assert format_merged_results(records, show=True)[0].startswith("Failed: bar\nOops\nOver budget: baz\n")
+
+	with pytest.raises(ValueError, match=r"The results are missing for shard 2/3\.$"):
+		merge_results([shard_1, shard_3])
+
+	with pytest.raises(ValueError, match=r"Shard 1/3 is in both '.*shard-1.jsonl' and '.*again.jsonl'\.$"):
+		merge_results([shard_1, write_shard("again.jsonl", 1, 3), shard_2, shard_3])
+
+	with pytest.raises(ValueError, match=r"'.*other.jsonl' is from a run with 2 shards, not 3\.$"):
+		merge_results([shard_1, write_shard("other.jsonl", 2, 2), shard_3])
+
+	with pytest.raises(ValueError, match=r"'foo' appears more than once in the results\.$"):
+		merge_results([shard_1, write_shard("dup.jsonl", 2, 3, record("foo", "passed")), shard_3])
+
+	shard_2 = write_shard("short.jsonl", 2, 3, record("baz", "passed"), size=2)
+	message = r"short.jsonl' is incomplete, with results for 1 of the 2 modules in shard 2/3"
+	with pytest.raises(ValueError, match=message):
+		merge_results([shard_1, shard_2, shard_3])
+
+	(tmp_pathplus / "plain.jsonl").write_lines([record("spam", "failed", "Error\n")])
+	with pytest.raises(ValueError, match=r"'.*plain.jsonl' was not written with --shard\.$"):
+		merge_results([tmp_pathplus / "plain.jsonl"])
+
+	records = merge_results([write_shard("only.jsonl", 1, 1, record("spam", "failed", "Error\n"))])
+	assert format_merged_results(records, show=True) == (
+			"Failed: spam\nError\n\n0/1 module imported successfully.",
+			1,
+			)
+	assert format_merged_results({}) == ("No modules to check.", 0)
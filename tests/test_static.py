@@ -0,0 +1,169 @@
+# stdlib
+import sys
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import OK, Error, ImportChecker
+from importcheck.static import check_module_static, find_module_file, find_module_spec, iter_imports
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_static_pkg",
+			{
+					"__init__.py": [
+							"import os",
+							"from . import sub",
+							"raise RuntimeError('must not be imported')",
+							],
+					"sub.py": [
+							"import collections.abc",
+							"from .other import thing",
+							"from .. import elsewhere",
+							"def f():",
+							"	from typing import List",
+							],
+					"other.py": '',
+					},
+			)
+
+
+def test_find_module_spec(demo_package: PathPlus) -> None:
+	spec = find_module_spec("demo_static_pkg.sub")
+	assert spec is not None
+	assert spec.name == "demo_static_pkg.sub"
+	assert "demo_static_pkg" not in sys.modules
+
+	assert find_module_spec("demo_static_pkg.missing") is None
+	assert find_module_spec("demo_static_pkg.sub.not_a_package") is None
+	assert find_module_spec("i_dont_exist") is None
+
+
+def test_find_module_file(demo_package: PathPlus) -> None:
+	assert find_module_file("demo_static_pkg") == str(demo_package / "__init__.py")
+	assert find_module_file("demo_static_pkg.sub") == str(demo_package / "sub.py")
+	assert find_module_file("sys") is None
+	assert find_module_file("i_dont_exist") is None
+
+
+def test_iter_imports(demo_package: PathPlus) -> None:
+	assert list(iter_imports("demo_static_pkg")) == ["os", "demo_static_pkg"]
+	assert sorted(iter_imports("demo_static_pkg.sub")) == [
+			"collections.abc",
+			"demo_static_pkg.other",
+			"typing",
+			]
+	assert list(iter_imports("i_dont_exist")) == []
+	assert "demo_static_pkg" not in sys.modules
+
+	imports = list(iter_imports("demo_static_pkg", submodules=True))
+	assert imports == ["os", "demo_static_pkg", "demo_static_pkg.sub"]
+
+
+@pytest.fixture()
+def static_package(tmp_pathplus: PathPlus, monkeypatch) -> PathPlus:
+	package = tmp_pathplus / "demo_resolve_pkg"
+	package.maybe_make()
+	(package / "__init__.py").write_lines([
+			"from .good import function as bound_in_init",
+			"if sys.platform == 'win32':",
+			"	also_bound = 1",
+			"raise RuntimeError('must not be imported')",
+			])
+	(package / "good.py").write_lines([
+			"import os, collections.abc",
+			"from . import bad",
+			"from .bad import anything",
+			"from typing import TYPE_CHECKING",
+			"try:",
+			"	import i_dont_exist",
+			"except ImportError:",
+			"	i_dont_exist = None",
+			"if TYPE_CHECKING:",
+			"	import i_dont_exist_either",
+			"if sys.version_info < (3, 0):",
+			"	import i_dont_exist_on_py3",
+			"if sys.version_info[0] == 2 or sys.version_info[:2] < (3, 0):",
+			"	import i_dont_exist_on_py3_either",
+			"if os.name == 'java' and sys.platform.startswith('java'):",
+			"	import i_dont_exist_on_cpython",
+			"elif sys.version_info.major >= 3:",
+			"	from . import good",
+			"else:",
+			"	import i_dont_exist_either_way",
+			"from . import bound_in_init, also_bound",
+			"def function():",
+			"	import only_when_called",
+			])
+	(package / "bad.py").write_lines([
+			"import os",
+			"import i_dont_exist",
+			"class Foo:",
+			"	from .missing import thing",
+			"from ... import beyond",
+			"from . import good, not_a_submodule",
+			"from demo_resolve_pkg import function",
+			])
+	(package / "syntax.py").write_lines(["def ("])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+	return package
+
+
+def test_check_module_static(static_package: PathPlus) -> None:
+	ret = check_module_static("demo_resolve_pkg.good")
+	assert isinstance(ret, OK)
+	assert ret.module == "demo_resolve_pkg.good"
+
+	ret = check_module_static("demo_resolve_pkg.bad")
+	assert isinstance(ret, Error)
+	assert ret.stdout == ''
+	filename = static_package / "bad.py"
+	assert ret.stderr == (
+			f'  File "{filename}", line 2, in <module>\n'
+			"    import i_dont_exist\n"
+			"ModuleNotFoundError: No module named 'i_dont_exist'\n"
+			f'  File "{filename}", line 4, in <module>\n'
+			"    from .missing import thing\n"
+			"ModuleNotFoundError: No module named 'demo_resolve_pkg.missing'\n"
+			f'  File "{filename}", line 5, in <module>\n'
+			"    from ... import beyond\n"
+			"ImportError: attempted relative import beyond top-level package\n"
+			f'  File "{filename}", line 6, in <module>\n'
+			"    from . import good, not_a_submodule\n"
+			"ImportError: cannot import name 'not_a_submodule' from 'demo_resolve_pkg' "
+			f"({static_package / '__init__.py'})\n"
+			f'  File "{filename}", line 7, in <module>\n'
+			"    from demo_resolve_pkg import function\n"
+			"ImportError: cannot import name 'function' from 'demo_resolve_pkg' "
+			f"({static_package / '__init__.py'})\n"
+			)
+
+	ret = check_module_static("demo_resolve_pkg.syntax", combine_output=True)
+	assert isinstance(ret, Error)
+	assert "SyntaxError" in ret.stdout
+
+	ret = check_module_static("demo_resolve_pkg.missing")
+	assert isinstance(ret, Error)
+	assert ret.stderr == "ModuleNotFoundError: No module named 'demo_resolve_pkg.missing'\n"
+
+	assert isinstance(check_module_static("sys"), OK)
+	assert "demo_resolve_pkg" not in sys.modules
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_importchecker_static(static_package: PathPlus, jobs: int) -> None:
+	modules = ["demo_resolve_pkg", "demo_resolve_pkg.good", "demo_resolve_pkg.bad", "i_dont_exist"]
+	checker = ImportChecker(modules, static=True, jobs=jobs)
+
+	assert list(checker.check_modules()) == [
+			("demo_resolve_pkg", 0),
+			("demo_resolve_pkg.good", 0),
+			("demo_resolve_pkg.bad", 1),
+			("i_dont_exist", 1),
+			]
+	assert "demo_resolve_pkg" not in sys.modules
@@ -1,4 +1,5 @@
 # stdlib
+import pickle
 import sys
 from typing import List
 
@@ -9,7 +10,16 @@ from coincidence.regressions import AdvancedDataRegressionFixture
 from domdf_python_tools.paths import PathPlus, in_directory
 
 # this package
-from importcheck import load_toml, paths_to_modules, redirect_output
+from importcheck import (
+		OK,
+		Error,
+		LazyError,
+		check_module,
+		discover_modules,
+		load_toml,
+		paths_to_modules,
+		redirect_output
+		)
 
 
 def test_redirect_output() -> None:
@@ -110,3 +120,144 @@ def test_paths_to_modules(tmp_pathplus: PathPlus) -> None:
 	assert list(paths_to_modules(*(m.relative_to(tmp_pathplus) for m in modules))) == expected
 
 	assert list(paths_to_modules("collections")) == ["collections"]
+
+
+def test_check_module_duration() -> None:
+	ret = check_module("collections")
+	assert isinstance(ret, OK)
+	assert ret.duration >= 0
+	assert OK("collections").duration == 0.0
+
+	ret = check_module("i_dont_exist")
+	assert isinstance(ret, Error)
+	assert ret.duration >= 0
+	assert ret.memory_peak is None
+	assert ret.rss_delta is None
+
+
+def test_check_module_memory(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_memory_module.py").write_clean("table = [str(i) for i in range(100_000)]")
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	try:
+		ret = check_module("demo_memory_module", measure_memory=True)
+	finally:
+		sys.modules.pop("demo_memory_module", None)
+
+	assert isinstance(ret, OK)
+	assert ret.memory_peak is not None
+	assert ret.memory_peak > 1_000_000
+
+
+def test_check_module_lazy(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_lazy_module.py").write_lines([
+			"import sys",
+			"print('to stdout')",
+			"print('to stderr', file=sys.stderr)",
+			"import i_dont_exist",
+			])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	for combine_output in (False, True):
+		lazy = check_module("demo_lazy_module", combine_output, lazy=True)
+		assert isinstance(lazy, LazyError)
+		assert lazy
+		assert repr(lazy) == "<LazyError(module='demo_lazy_module', exception=ModuleNotFoundError)>"
+		assert lazy._traceback is None
+
+		eager = check_module("demo_lazy_module", combine_output)
+		assert isinstance(eager, Error)
+		assert lazy.stdout == eager.stdout
+		assert lazy.stderr == eager.stderr
+		assert "ModuleNotFoundError: No module named 'i_dont_exist'" in lazy.stderr
+
+		unpickled = pickle.loads(pickle.dumps(lazy))
+		assert isinstance(unpickled, Error)
+		assert unpickled == lazy.to_error()
+
+	assert isinstance(check_module("collections", lazy=True), OK)
+
+
+def test_check_module_max_output(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "demo_noisy_module.py").write_lines([
+			"print('x' * 1000)",
+			"raise ValueError('oops')",
+			])
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	ret = check_module("demo_noisy_module", combine_output=True, max_output=10)
+	assert ret.stdout.startswith("xxxxxxxxxx\n[991 characters of output truncated]\nTraceback")
+	assert ret.stdout.endswith("ValueError: oops\n\n")
+
+	ret = check_module("demo_noisy_module", combine_output=True, max_output=0)
+	assert ret.stdout.startswith("\n[1001 characters of output truncated]\nTraceback")
+
+
+def test_check_module_record_imports(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	package = tmp_pathplus / "demo_fan_out_pkg"
+	package.maybe_make()
+	(package / "__init__.py").touch()
+	(package / "heavy.py").write_lines(["import demo_fan_out_pkg.helper"])
+	(package / "helper.py").touch()
+	(package / "broken.py").write_lines(["import demo_fan_out_pkg.other", "raise ValueError('oops')"])
+	(package / "other.py").touch()
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	try:
+		ret = check_module("demo_fan_out_pkg.heavy", record_imports=True)
+		assert isinstance(ret, OK)
+		assert ret.imported == ("demo_fan_out_pkg", "demo_fan_out_pkg.helper")
+
+		# Modules which were already imported are not included.
+		assert check_module("demo_fan_out_pkg.helper", record_imports=True).imported == ()
+
+		ret = check_module("demo_fan_out_pkg.broken", record_imports=True, lazy=True)
+		assert isinstance(ret, LazyError)
+		assert ret.imported == ("demo_fan_out_pkg.other", )
+		assert ret.to_error().imported == ("demo_fan_out_pkg.other", )
+
+		assert check_module("demo_fan_out_pkg.other").imported is None
+
+	finally:
+		for module in list(sys.modules):
+			if module.startswith("demo_fan_out_pkg"):
+				del sys.modules[module]
+
+
+def test_discover_modules(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	package = tmp_pathplus / "demo_discover_pkg"
+
+	for filename in [
+			"__init__.py",
+			"a.py",
+			"sub/__init__.py",
+			"sub/b.py",
+			"sub/deeper/__init__.py",
+			"sub/deeper/c.py",
+			"tests/__init__.py",
+			"tests/test_a.py",
+			"z.py",
+			]:
+		(package / filename).parent.maybe_make(parents=True)
+		(package / filename).write_text("raise ImportError('must not be imported')")
+
+	monkeypatch.syspath_prepend(str(tmp_pathplus))
+
+	assert list(discover_modules("demo_discover_pkg", exclude=["*.tests"])) == [
+			"demo_discover_pkg",
+			"demo_discover_pkg.a",
+			"demo_discover_pkg.sub",
+			"demo_discover_pkg.z",
+			"demo_discover_pkg.sub.b",
+			"demo_discover_pkg.sub.deeper",
+			"demo_discover_pkg.sub.deeper.c",
+			]
+	assert "demo_discover_pkg" not in sys.modules
+
+	assert list(discover_modules("demo_discover_pkg.sub.deeper", "i_dont_exist")) == [
+			"demo_discover_pkg.sub.deeper",
+			"demo_discover_pkg.sub.deeper.c",
+			"i_dont_exist",
+			]
+	assert list(discover_modules("demo_discover_pkg.a")) == ["demo_discover_pkg.a"]
+	assert list(discover_modules("demo_discover_pkg", exclude=["demo_*"])) == []
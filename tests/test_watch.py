@@ -0,0 +1,120 @@
+# stdlib
+import importlib.util
+import os
+import sys
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from importcheck import ImportChecker
+from importcheck.watch import Watcher, forget_modules
+
+
+@pytest.fixture()
+def demo_package(make_package: Callable[..., PathPlus]) -> PathPlus:
+	return make_package(
+			"demo_watch_pkg",
+			{
+					"__init__.py": '',
+					"a.py": ["from demo_watch_pkg import b"],
+					"b.py": ["import demo_watch_pkg.c"],
+					"c.py": ["X = 1"],
+					"d.py": ["import json"],
+					},
+			)
+
+
+def _touch(filename: PathPlus, content: str) -> None:
+	stat = os.stat(filename)
+	filename.write_clean(content)
+	# Ensure the modification time changes, even on filesystems with coarse timestamps.
+	os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+MODULES = ["demo_watch_pkg", "demo_watch_pkg.a", "demo_watch_pkg.b", "demo_watch_pkg.c", "demo_watch_pkg.d"]
+
+
+def test_watcher(demo_package: PathPlus) -> None:
+	watcher = Watcher(MODULES)
+	assert watcher.poll() == []
+
+	# Each module comes after those it imports.
+	assert watcher.dependents(["demo_watch_pkg.c"]) == ["demo_watch_pkg.c", "demo_watch_pkg.b", "demo_watch_pkg.a"]
+	assert watcher.dependents(["demo_watch_pkg.d"]) == ["demo_watch_pkg.d"]
+	assert watcher.dependents(["demo_watch_pkg"]) == [
+			"demo_watch_pkg",
+			"demo_watch_pkg.c",
+			"demo_watch_pkg.b",
+			"demo_watch_pkg.a",
+			"demo_watch_pkg.d",
+			]
+
+	_touch(demo_package / "d.py", "import demo_watch_pkg.c\n")
+	assert watcher.poll() == ["demo_watch_pkg.d"]
+	assert watcher.poll() == []
+
+	# The graph is updated with the new imports.
+	assert watcher.graph["demo_watch_pkg.d"] == ["demo_watch_pkg", "demo_watch_pkg.c"]
+	assert watcher.dependents(["demo_watch_pkg.c"]) == [
+			"demo_watch_pkg.c",
+			"demo_watch_pkg.b",
+			"demo_watch_pkg.a",
+			"demo_watch_pkg.d",
+			]
+
+	_touch(demo_package / "c.py", "X = 2\n")
+	assert watcher.wait() == ["demo_watch_pkg.c", "demo_watch_pkg.b", "demo_watch_pkg.a", "demo_watch_pkg.d"]
+
+	(demo_package / "b.py").unlink()
+	assert watcher.poll() == ["demo_watch_pkg.b"]
+
+
+def test_watcher_discards_bytecode(demo_package: PathPlus) -> None:
+	watcher = Watcher(MODULES)
+
+	try:
+		import demo_watch_pkg.c  # type: ignore[import]  # noqa: F401
+	finally:
+		forget_modules(MODULES)
+
+	bytecode = importlib.util.cache_from_source(str(demo_package / "c.py"))
+
+	if not sys.dont_write_bytecode:
+		assert os.path.isfile(bytecode)
+
+	_touch(demo_package / "c.py", "X = 2\n")
+	assert watcher.poll() == ["demo_watch_pkg.c"]
+	assert not os.path.isfile(bytecode)
+
+
+def test_forget_modules(demo_package: PathPlus) -> None:
+	try:
+		import demo_watch_pkg.c  # type: ignore[import]  # noqa: F401
+		assert "demo_watch_pkg.c" in sys.modules
+
+		forget_modules(["demo_watch_pkg.c"])
+		assert "demo_watch_pkg.c" not in sys.modules
+		assert not hasattr(sys.modules["demo_watch_pkg"], 'c')
+	finally:
+		forget_modules(MODULES)
+
+	assert not any(module in sys.modules for module in MODULES)
+
+
+def test_changed_dependency_breaks_dependent(demo_package: PathPlus) -> None:
+	watcher = Watcher(MODULES)
+
+	try:
+		assert list(ImportChecker(MODULES).check_modules()) == [(module, 0) for module in MODULES]
+
+		_touch(demo_package / "b.py", "raise ValueError('broken')\n")
+		affected = watcher.wait()
+		assert affected == ["demo_watch_pkg.b", "demo_watch_pkg.a"]
+
+		forget_modules(affected)
+		assert list(ImportChecker(affected).check_modules()) == [("demo_watch_pkg.b", 1), ("demo_watch_pkg.a", 1)]
+	finally:
+		forget_modules(MODULES)